@@ -0,0 +1,932 @@
+# Benchmarks of the parser and the analysis (run from the repository root with "python -m benchmarks.benchmark")
+from sys import getsizeof
+from tempfile import TemporaryDirectory
+from tracemalloc import get_traced_memory, start as start_tracing, stop as stop_tracing
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import (
+    SPDF_GRAMMAR, SPDF_GRAMMAR_CONFLICTS, SPDF_GRAMMAR_ELIDE, SPDF_GRAMMAR_FLATTEN, SPDF_GRAMMAR_INDEX, SPDF_GRAMMAR_INSERT, SPDF_GRAMMAR_MODES_CONFLICTS,
+    SPDF_GRAMMAR_SYNC, SPDF_LANGUAGE_PATTERNS
+)
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis, bytes_lexicon_store, bytes_lexicon_stream, lexicon_analysis
+from spdf_analyser.analysis.validation.references import references_analysis
+from spdf_analyser.analysis.validation.syntax import SPDF_PARALLEL_MIN_PROCESSES, incremental_syntax_analysis, parallel_syntax_analysis, syntax_analysis
+from spdf_analyser.io import LineIndex, available_cpus, calc_line_column
+from spdf_analyser.parser.cache import TableCache
+from spdf_analyser.parser.classes.ordered_set import OrderedSet
+from spdf_analyser.parser.classes.syntax_node import NodeIndex, SyntaxNode
+from spdf_analyser.parser.classes.token import Token
+from spdf_analyser.parser.handlers import ReduceHandler, ShiftHandler, discard_values, keep_token
+from spdf_analyser.parser.parser import LR1Parser
+from spdf_analyser.parser.push_parser import PushParser
+from spdf_analyser.parser.table.action_table import ActionTable
+from spdf_analyser.parser.table.automaton_table import AutomatonTable, PARSER_MODE
+from spdf_analyser.parser.table.compiled_table import CompiledTable
+from spdf_analyser.parser.table.first_table import FirstTable
+from spdf_analyser.parser.table.follow_table import FollowTable
+from spdf_analyser.parser.table.rules_table import RulesTable
+
+
+def synthetic_grammar(size: int) -> Tuple[Tuple[str, str]]:
+    # Grammar with a list of "size" kinds of items (the amount of states grows linearly with the size)
+    rules = [
+        ("START", "ITEMS"),
+        ("ITEMS", "ITEMS ITEM"),
+        ("ITEMS", ""),
+    ]
+    for i in range(size):
+        rules.extend([
+            ("ITEM", f"OPEN{i} VALUE{i} CLOSE{i}"),
+            (f"VALUE{i}", "V"),
+            (f"VALUE{i}", f"OPEN VALUE{i} CLOSE"),
+            (f"VALUE{i}", f"VALUE{i} SEP V"),
+        ])
+    return tuple(rules)
+
+
+def stream_document(objects: int, stream_size: int, has_length: bool = True) -> bytes:
+    # Document with "objects" content streams of about "stream_size" bytes each (with or without their /Length)
+    line = b"BT /F1 12 Tf 100 700 Td (Lorem ipsum dolor sit amet) Tj ET\n"
+    data = line * max(1, stream_size // len(line))
+    length = f"/Length {len(data) - 1}" if has_length else "/Filter /None" # The last newline is the EOL before "endstream"
+    body = b"".join(
+        f"{i} 0 obj\n<< {length} >>\nstream\n".encode("ascii") + data + b"endstream\nendobj\n\n"
+        for i in range(1, objects + 1)
+    )
+    return b"%SPDF-1.0\n\n" + body + f"xref\n0 {objects + 1}\n0000000000 65535 f\ntrailer\n<< /Size {objects + 1} >>\nstartxref\n0\n%%EOF".encode("ascii")
+
+
+def stream_tokens(tokens: Iterable[Token], scale: int, body_start: int = 1, body_end_category: str = "KEYWORD__XREF") -> Generator[Token, Any, None]:
+    # Same tokens as scale_tokens but generated one by one (the scaled document is never materialized)
+    tokens = tuple(tokens)
+    body_end = next((i for i, token in enumerate(tokens) if token.category == body_end_category), len(tokens))
+    yield from tokens[:body_start]
+    for _ in range(scale):
+        yield from tokens[body_start:body_end]
+    yield from tokens[body_end:]
+
+
+def scale_tokens(tokens: Iterable[Token], scale: int, body_start: int = 1, body_end_category: str = "KEYWORD__XREF") -> Tuple[Token]:
+    # Repeat the body of a document (tokens between the header and the first "body_end_category" token) "scale" times
+    tokens = tuple(tokens)
+    body_end = next((i for i, token in enumerate(tokens) if token.category == body_end_category), len(tokens))
+    return (*tokens[:body_start], *(tokens[body_start:body_end] * scale), *tokens[body_end:])
+
+
+def scale_content(content: str, scale: int, body_end: str = "xref") -> str:
+    # Repeat the body of a document (lines between the header line and the first line starting with "body_end") "scale" times
+    lines = content.split("\n")
+    end = next((i for i, line in enumerate(lines) if line.startswith(body_end)), len(lines))
+    return "\n".join((*lines[:1], *(lines[1:end] * scale), *lines[end:]))
+
+
+def lines_lexicon_analysis(content: str, patterns: Dict[str, Pattern[str]], stream_category: str = "STREAM_BLOCK") -> Tuple[Token]:
+    # Previous lexer of the analysis (splits the content into lines first), the reference of the single pass lexer
+    # Combine tokens patterns into one regex
+    tokens_regex = compile("|".join(f"(?P<{cat}>{pat.pattern})" for cat, pat in patterns.items()))
+    
+    # Split content into lines (except for stream blocks)
+    stream_blocks: List[Match[str]] = [x for x in finditer(patterns[stream_category], content)] # All stream block matches in the content
+    current_block: int = 0 # Index to track which stream block is being processed
+    lines: List[List[int, str]] = [[0, ""]] # List to store lines of content
+    pos: int = 0 # Current position in the content
+    jump_lines: int = 1 # How many lines add to counter when adding new line
+    while pos < len(content):
+        # If a stream block starts at the current position, append it as is
+        if stream_blocks and current_block < len(stream_blocks) and stream_blocks[current_block].start() <= pos:
+            matched_string = content[pos:stream_blocks[current_block].end()]
+            lines[-1][1] += matched_string # Add entire stream block
+            pos = stream_blocks[current_block].end()
+            jump_lines += matched_string.count("\n")
+            current_block += 1 # Next stream block
+            continue
+
+        # Newline found
+        elif content[pos] == "\n":
+            lines.append([lines[-1][0] + jump_lines, ""])
+            pos += 1
+            jump_lines = 1
+            continue
+
+        # Otherwise, add the character to the current line
+        lines[-1][1] += content[pos]
+        pos += 1
+    
+    tokens = [] # Tokens already validated
+    
+    # Process each line
+    for i, line in lines:
+        pos = 0 # Current start match position in line (i.e. column)
+        
+        while pos < len(line):
+            # Skip whitespace
+            if line[pos].isspace():
+                pos += 1
+                continue
+                
+            # Try to match a token at current position
+            match = tokens_regex.match(line, pos)
+
+            if not match or not pos == match.start():
+                # If no match found or start position is not the same, undefined lexicon found
+                end_lexicon = line[pos:].find(" ")
+                if end_lexicon < 0:
+                    end_lexicon = len(line)
+                else:
+                    end_lexicon += pos
+                tokens.append(Token(None, line[pos:end_lexicon], i, pos))
+                pos = end_lexicon
+                continue
+
+            # Get the matched token and its category
+            for cat in [k for k, _ in patterns.items()]:  # Respect priority order
+                token = match.group(cat)
+                if token is not None:
+                    tokens.append(Token(cat, token, i, pos))
+                    pos = match.end()
+                    break
+
+    return tuple(tokens)
+
+
+def modes_report(
+        productions_rules: Iterable[Tuple[str, str]],
+        start_symbol: Optional[str] = None,
+        modes: Iterable[PARSER_MODE] = tuple(PARSER_MODE),
+        expected_conflicts: Dict[str, int] = dict()
+    ) -> str:
+    # Build the parser tables with each construction mode and compare their sizes and build times (with the expected conflicts of each mode)
+    productions_rules = tuple(productions_rules)
+
+    rows = []
+    for mode in modes:
+        start = time_ns()
+        parser = LR1Parser(productions_rules, start_symbol, mode=mode, expected_conflicts=expected_conflicts.get(mode.name, 0))
+        elapsed = time_ns() - start
+
+        rows.append((
+            mode.name,
+            len(parser.automaton_table.table),
+            len(parser.action_table.table),
+            len(parser.action_table.conflicts),
+            f"{elapsed / 1_000_000:.1f}",
+        ))
+
+    return tabulate(rows, headers=("Mode", "States", "Entries", "Conflicts", "Build (ms)"), tablefmt="grid")
+
+
+def cache_report(productions_rules: Iterable[Tuple[str, str]], start_symbol: Optional[str] = None, repeat: int = 5, expected_conflicts: int = 0) -> str:
+    # Build the parser tables without cache, with an empty cache (cold start) and with the stored tables (warm start)
+    productions_rules = tuple(productions_rules)
+
+    rows = []
+    with TemporaryDirectory() as directory:
+        for name, cache, is_cold in (("No cache", None, False), ("Cold start", TableCache(Path(directory)), True), ("Warm start", TableCache(Path(directory)), False)):
+            elapsed = []
+            for _ in range(repeat):
+                cache.clear() if is_cold else ...
+                start = time_ns()
+                LR1Parser(productions_rules, start_symbol, cache=cache, expected_conflicts=expected_conflicts)
+                elapsed.append(time_ns() - start)
+            rows.append((name, f"{min(elapsed) / 1_000_000:.1f}", *(cache.statistics.values() if cache else ("-", ) * 3)))
+
+    return tabulate(rows, headers=("Run", "Build (ms)", "Hits", "Misses", "Invalids"), tablefmt="grid")
+
+
+def automaton_report(sizes: Iterable[int] = (5, 10, 20, 40), mode: PARSER_MODE = PARSER_MODE.LR1) -> str:
+    # Build the automaton for synthetic grammars of increasing size to check how the builder scales
+    rows = []
+    for size in sizes:
+        rules_table = RulesTable()
+        rules_table.build(synthetic_grammar(size))
+        first_table = FirstTable()
+        first_table.build(rules_table)
+        follow_table = FollowTable()
+        follow_table.build(rules_table, first_table)
+
+        start = time_ns()
+        automaton_table = AutomatonTable()
+        automaton_table.build(rules_table, first_table, follow_table, mode)
+        elapsed = time_ns() - start
+
+        states = len(automaton_table.table)
+        rows.append((size, len(rules_table.array), states, f"{elapsed / 1_000_000:.1f}", f"{elapsed / 1_000 / states:.1f}"))
+
+    return tabulate(rows, headers=("Size", "Rules", "States", "Build (ms)", "Per state (us)"), tablefmt="grid")
+
+
+def states_report(productions_rules: Iterable[Tuple[str, str]], start_symbol: Optional[str] = None, modes: Iterable[PARSER_MODE] = tuple(PARSER_MODE)) -> str:
+    # Count the automaton states and items of each construction mode with the peak memory used while building them
+    rules_table = RulesTable(start_symbol)
+    rules_table.build(tuple(productions_rules))
+    first_table = FirstTable()
+    first_table.build(rules_table)
+    follow_table = FollowTable()
+    follow_table.build(rules_table, first_table)
+
+    rows = []
+    for mode in modes:
+        start_tracing()
+        automaton_table = AutomatonTable()
+        automaton_table.build(rules_table, first_table, follow_table, mode)
+        _, peak = get_traced_memory()
+        stop_tracing()
+
+        states = automaton_table.states
+        items = sum(len(tuple(state)) for state in states)
+        size = _deep_size(automaton_table.table, {id(rules_table), *map(id, rules_table.symbols), *map(id, rules_table.array)})
+        rows.append((mode.name, len(states), items, size, f"{size / len(states):.0f}", peak))
+
+    return tabulate(rows, headers=("Mode", "States", "Items", "States (bytes)", "Per state (bytes)", "Peak (bytes)"), tablefmt="grid")
+
+
+def build_report(productions_rules: Iterable[Tuple[str, str]], start_symbol: Optional[str] = None, repeat: int = 5) -> str:
+    # Time each phase of the tables construction (best of "repeat" runs)
+    productions_rules = tuple(productions_rules)
+
+    phases: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(repeat):
+        start = time_ns()
+        rules_table = RulesTable(start_symbol)
+        rules_table.build(productions_rules)
+        phases["RulesTable"].append(time_ns() - start)
+
+        start = time_ns()
+        first_table = FirstTable()
+        first_table.build(rules_table)
+        phases["FirstTable"].append(time_ns() - start)
+
+        start = time_ns()
+        follow_table = FollowTable()
+        follow_table.build(rules_table, first_table)
+        phases["FollowTable"].append(time_ns() - start)
+
+        start = time_ns()
+        automaton_table = AutomatonTable()
+        automaton_table.build(rules_table, first_table, follow_table)
+        phases["AutomatonTable"].append(time_ns() - start)
+
+        start = time_ns()
+        action_table = ActionTable()
+        action_table.build(rules_table, automaton_table)
+        phases["ActionTable"].append(time_ns() - start)
+
+        start = time_ns()
+        compiled_table = CompiledTable()
+        compiled_table.build(rules_table, action_table)
+        phases["CompiledTable"].append(time_ns() - start)
+
+    rows = [(phase, f"{min(times) / 1_000_000:.2f}") for phase, times in phases.items()]
+    rows.append(("Total", f"{sum(min(times) for times in phases.values()) / 1_000_000:.2f}"))
+    return tabulate(rows, headers=("Phase", "Build (ms)"), tablefmt="grid")
+
+
+def containers_report(sizes: Iterable[int] = (10, 100, 1000)) -> str:
+    # Compare inserting values (with duplicates) into an OrderedSet and into a list checked before each append
+    rows = []
+    for size in sizes:
+        values = [f"SYMBOL_{i % size}" for i in range(2 * size)]
+
+        start = time_ns()
+        ordered_set = OrderedSet()
+        for value in values:
+            ordered_set.append(value)
+        ordered_set_time = time_ns() - start
+
+        start = time_ns()
+        unique_list = []
+        for value in values:
+            if not value in unique_list:
+                unique_list.append(value)
+        list_time = time_ns() - start
+
+        rows.append((size, f"{ordered_set_time / 1_000:.1f}", f"{list_time / 1_000:.1f}"))
+
+    return tabulate(rows, headers=("Size", "OrderedSet (us)", "List (us)"), tablefmt="grid")
+
+
+def symbols_report(productions_rules: Iterable[Tuple[str, str]], start_symbol: Optional[str] = None) -> str:
+    # Count the symbol objects referenced by the production rules and their memory footprint
+    rules_table = RulesTable(start_symbol)
+    rules_table.build(tuple(productions_rules))
+
+    symbols = [symbol for rule in rules_table for symbol in (rule.lhs, *rule.rhs)]
+    unique_symbols = {id(symbol): symbol for symbol in symbols}
+
+    rows = ((len(symbols), len(unique_symbols), _deep_size(list(unique_symbols.values())), _deep_size(rules_table.array)), )
+    return tabulate(rows, headers=("References", "Objects", "Symbols (bytes)", "Rules (bytes)"), tablefmt="grid")
+
+
+def tables_memory_report(productions_rules: Iterable[Tuple[str, str]], start_symbol: Optional[str] = None, expected_conflicts: int = 0) -> str:
+    # Compare the memory footprint of the ACTION table dict with the compiled integer arrays
+    parser = LR1Parser(tuple(productions_rules), start_symbol, expected_conflicts=expected_conflicts)
+
+    dict_size = _deep_size(parser.action_table.table)
+    compiled_size = _deep_size(parser.compiled_table)
+
+    rows = (
+        ("ActionTable (dict)", len(parser.action_table.table), dict_size),
+        ("CompiledTable (arrays)", len(parser.compiled_table.actions) + len(parser.compiled_table.gotos), compiled_size),
+        ("CompiledTable (buffers only)", len(parser.compiled_table.actions) + len(parser.compiled_table.gotos), parser.compiled_table.nbytes),
+    )
+    return tabulate(rows, headers=("Form", "Cells", "Bytes"), tablefmt="grid")
+
+
+def parse_report(parser: LR1Parser, documents: Dict[str, Iterable[Token]], scales: Iterable[int] = (1, 10, 100)) -> str:
+    # Measure the parse throughput (tokens per second) of each document scaled up
+    rows = []
+    for name, tokens in documents.items():
+        for scale in scales:
+            scaled_tokens = scale_tokens(tokens, scale)
+
+            start = time_ns()
+            try:
+                parser.parse_tokens(scaled_tokens)
+            except ValueError as e:
+                rows.append((name, scale, len(scaled_tokens), "-", f"Failed ({e})"))
+                break
+            elapsed = time_ns() - start
+
+            rows.append((name, scale, len(scaled_tokens), f"{elapsed / 1_000_000:.1f}", f"{len(scaled_tokens) / (elapsed / 1_000_000_000):,.0f}"))
+
+    return tabulate(rows, headers=("Document", "Scale", "Tokens", "Parse (ms)", "Tokens/s"), tablefmt="grid")
+
+
+def push_report(parser: LR1Parser, documents: Dict[str, Iterable[Token]], scales: Iterable[int] = (1, 10, 100)) -> str:
+    # Feed generated tokens to a push parser (time, deepest LR stack and peak memory, the syntax tree included)
+    rows = []
+    for name, tokens in documents.items():
+        for scale in scales:
+            # Timed run
+            start = time_ns()
+            try:
+                parser.push_parser().feed_many(stream_tokens(tokens, scale))
+            except ValueError as e:
+                rows.append((name, scale, "-", "-", "-", "-", f"Failed ({e})"))
+                break
+            elapsed = time_ns() - start
+
+            # Traced run (memory and stack depth)
+            push_parser = parser.push_parser()
+            max_depth = 0
+            start_tracing()
+            for token in stream_tokens(tokens, scale):
+                push_parser.feed(token)
+                max_depth = max(max_depth, push_parser.depth)
+            push_parser.finish()
+            _, peak = get_traced_memory()
+            stop_tracing()
+
+            rows.append((name, scale, f"{elapsed / 1_000_000:.1f}", max_depth, f"{peak:,}", f"{peak / sum(1 for _ in stream_tokens(tokens, scale)):.0f}"))
+
+    return tabulate(rows, headers=("Document", "Scale", "Push (ms)", "Max depth", "Peak (bytes)", "Per token (bytes)"), tablefmt="grid")
+
+
+def index_handlers(objects: List[Tuple[int, int]], references: List[Token], xref_elements: List[Token]) -> Tuple[Dict[str, ReduceHandler], ShiftHandler]:
+    # Semantic actions that only collect the objects ids, the references and the XREF elements (with discard_values as default)
+    def shift_token(token: Token) -> Token:
+        if token.category == "REFERENCE":
+            references.append(token)
+        elif token.category == "XREF_ELEMENT":
+            xref_elements.append(token)
+        return token
+
+    def reduce_object(lhs: str, values: List[Any]) -> None:
+        # Object id and gen are the first two unsigned integers
+        objects.append((int(values[0].string), int(values[1].string)))
+
+    return {"EXPR__OBJ": reduce_object}, shift_token
+
+
+def handlers_report(
+        parser: LR1Parser,
+        documents: Dict[str, Iterable[Token]],
+        handlers: Callable[[], Tuple[Dict[str | Tuple[str, str], ReduceHandler], ReduceHandler, ShiftHandler]],
+        scales: Iterable[int] = (1, 10, 100)
+    ) -> str:
+    # Compare the default semantic actions (syntax tree) with the given ones (time and peak memory)
+    rows = []
+    for name, tokens in documents.items():
+        for scale in scales:
+            scaled_tokens = scale_tokens(tokens, scale)
+
+            results = []
+            for run_handlers in ((None, None, None), handlers()):
+                try:
+                    start = time_ns()
+                    parser.parse_tokens(scaled_tokens, *run_handlers)
+                    elapsed = time_ns() - start
+                except ValueError as e:
+                    results = None
+                    rows.append((name, scale, len(scaled_tokens), "-", "-", "-", f"Failed ({e})"))
+                    break
+
+                start_tracing()
+                parser.parse_tokens(scaled_tokens, *run_handlers)
+                _, peak = get_traced_memory()
+                stop_tracing()
+                results.append((elapsed, peak))
+
+            if results is None:
+                break
+
+            (tree_time, tree_peak), (free_time, free_peak) = results
+            rows.append((
+                name, scale, len(scaled_tokens),
+                f"{tree_time / 1_000_000:.1f}", f"{free_time / 1_000_000:.1f}",
+                f"{tree_peak:,}", f"{free_peak:,}"
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Tokens", "Tree (ms)", "Handlers (ms)", "Tree peak (bytes)", "Handlers peak (bytes)"), tablefmt="grid")
+
+
+def tree_report(
+        parser: LR1Parser,
+        compact_parser: LR1Parser,
+        documents: Dict[str, Iterable[Token]],
+        analysis: Callable[[SyntaxNode], Any],
+        scales: Iterable[int] = (1, 10, 100),
+        repeat: int = 5
+    ) -> str:
+    # Compare the syntax trees without and with the tree annotations (nodes, depth, parse and analysis times, best of "repeat" runs)
+    # The compact parse isn't faster: the flat lists and elided nodes cost about as much as the nodes they save (the gain is in the analysis)
+    rows = []
+    for name, tokens in documents.items():
+        for scale in scales:
+            scaled_tokens = scale_tokens(tokens, scale)
+
+            results = []
+            for run_parser in (parser, compact_parser):
+                parse_times, analysis_times = [], []
+                try:
+                    for _ in range(repeat):
+                        start = time_ns()
+                        syntax_tree = run_parser.parse_tokens(scaled_tokens)
+                        parse_times.append(time_ns() - start)
+
+                        start = time_ns()
+                        analysis(syntax_tree)
+                        analysis_times.append(time_ns() - start)
+                except ValueError as e:
+                    results = None
+                    rows.append((name, scale, "-", "-", "-", "-", f"Failed ({e})"))
+                    break
+
+                results.append((*_tree_shape(syntax_tree), min(parse_times), min(analysis_times)))
+
+            if results is None:
+                break
+
+            (nodes, depth, parse_time, analysis_time), (compact_nodes, compact_depth, compact_parse_time, compact_analysis_time) = results
+            rows.append((
+                name, scale,
+                f"{nodes:,} / {compact_nodes:,}", f"{depth} / {compact_depth}",
+                f"{parse_time / 1_000_000:.1f} / {compact_parse_time / 1_000_000:.1f}",
+                f"{analysis_time / 1_000_000:.1f} / {compact_analysis_time / 1_000_000:.1f}"
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Nodes", "Depth", "Parse (ms)", "Analysis (ms)"), tablefmt="grid")
+
+
+def optimize_report(
+        productions_rules: Iterable[Tuple[str, str]],
+        documents: Dict[str, Iterable[Token]],
+        start_symbol: Optional[str] = None,
+        mode: PARSER_MODE = PARSER_MODE.LR1,
+        expected_conflicts: Tuple[int, int] = (0, 0)
+    ) -> str:
+    # Compare the declared grammar with the optimized one (sizes of the tables and reduce steps per token of each document)
+    # The expected conflicts are the ones of the declared grammar and of the optimized one
+    productions_rules = tuple(productions_rules)
+
+    rows = []
+    for (name, optimize), conflicts in zip((("Declared", False), ("Optimized", True)), expected_conflicts):
+        parser = LR1Parser(productions_rules, start_symbol, mode=mode, optimize=optimize, expected_conflicts=conflicts)
+
+        reduces = []
+        for tokens in documents.values():
+            tokens = tuple(tokens)
+            reduce_steps = _reduce_steps(parser, tokens)
+            reduces.append(f"{reduce_steps / len(tokens):.2f}" if reduce_steps is not None else "-")
+
+        rows.append((
+            name,
+            len(parser.compiled_table.rules_lhs),
+            len(parser.automaton_table.table),
+            len(parser.action_table.table),
+            len(parser.action_table.conflicts),
+            *reduces,
+        ))
+
+    return tabulate(rows, headers=("Grammar", "Rules", "States", "Entries", "Conflicts", *(f"Reduces/token ({name})" for name in documents)), tablefmt="grid")
+
+
+def reparse_report(
+        contents: Dict[str, str],
+        analysis: Callable[[bytes], Tuple[Iterable[Token], SyntaxNode]],
+        incremental_analysis: Callable[[bytes, Iterable[Token], SyntaxNode, Tuple[int, int, int]], Tuple[Iterable[Token], SyntaxNode]],
+        scales: Iterable[int] = (1, 10, 100)
+    ) -> str:
+    # Insert a comment line before the middle object of each document scaled up and analyse it again (full and incremental)
+    # The tokens after the edit are shifted by the incremental analysis (its time grows with them, far less than the parsing)
+    # The documents are analysed as raw bytes (as in the validation)
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content, scale)
+            lines = scaled_content.split("\n")
+            object_lines = [i for i, line in enumerate(lines) if line.endswith(" obj")]
+            if not object_lines:
+                rows.append((name, scale, "-", "-", "-", "Failed (no object)"))
+                break
+            line = object_lines[len(object_lines) // 2]
+            edited_content = "\n".join((*lines[:line], "% edited", *lines[line:])).encode("utf-8")
+
+            try:
+                tokens, syntax_tree = analysis(scaled_content.encode("utf-8"))
+
+                start = time_ns()
+                full_tokens, full_tree = analysis(edited_content)
+                full_time = time_ns() - start
+            except ValueError as e:
+                rows.append((name, scale, "-", "-", "-", f"Failed ({e})"))
+                break
+
+            start = time_ns()
+            tokens, syntax_tree = incremental_analysis(edited_content, tokens, syntax_tree, (line, line, line + 1))
+            incremental_time = time_ns() - start
+
+            tokens, full_tokens = tuple(tokens), tuple(full_tokens)
+            rows.append((
+                name, scale, len(full_tokens),
+                f"{full_time / 1_000_000:.1f}", f"{incremental_time / 1_000_000:.2f}",
+                tokens == full_tokens and [token.offset for token in tokens] == [token.offset for token in full_tokens] and str(syntax_tree) == str(full_tree)
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Tokens", "Full (ms)", "Incremental (ms)", "Same result"), tablefmt="grid")
+
+
+def parallel_report(
+        contents: Dict[str, str],
+        lexer: Callable[[str], Tuple[Token]],
+        serial_analysis: Callable[[Tuple[Token]], SyntaxNode],
+        parallel_analysis: Callable[[Tuple[Token], int], SyntaxNode],
+        processes: Iterable[int] = (SPDF_PARALLEL_MIN_PROCESSES, 4, 8),
+        scales: Iterable[int] = (400, 2000)
+    ) -> str:
+    # Parse each document scaled up serially and in parallel with each amount of processes (speedup over the serial parsing)
+    # Only the amounts of processes up to the available CPUs are run (more processes than CPUs don't measure any speedup)
+    # The default amounts start at the minimum of the syntax analysis (fewer processes never break even)
+    cpus = available_cpus()
+    processes = tuple(count for count in processes if count <= cpus)
+    if not processes:
+        return f"Skipped ({cpus} CPU available, the parallel parsing needs at least {SPDF_PARALLEL_MIN_PROCESSES})"
+
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content, scale)
+            tokens = lexer(scaled_content)
+
+            try:
+                start = time_ns()
+                syntax_tree = serial_analysis(tokens)
+                serial_time = time_ns() - start
+            except ValueError as e:
+                rows.append((name, scale, "-", "-", "-", *("-" for _ in processes), f"Failed ({e})"))
+                break
+
+            times = []
+            is_same = True
+            for process_count in processes:
+                start = time_ns()
+                parallel_tree = parallel_analysis(tokens, process_count)
+                times.append(time_ns() - start)
+                is_same = is_same and str(parallel_tree) == str(syntax_tree)
+
+            rows.append((
+                name, scale, f"{len(scaled_content.encode('utf-8')) / 1_000_000:.1f}", len(tokens),
+                f"{serial_time / 1_000_000:.0f}",
+                *(f"{time / 1_000_000:.0f} (x{serial_time / time:.2f})" for time in times),
+                is_same
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Size (MB)", "Tokens", "Serial (ms)", *(f"{count} processes (ms)" for count in processes), "Same result"), tablefmt="grid")
+
+
+def lexer_report(contents: Dict[str, str], lexers: Dict[str, Callable[[str], Tuple[Token]]], scales: Iterable[int] = (1, 10, 100)) -> str:
+    # Lex each document scaled up with each lexer (throughput in MB/s, the tokens compared with the ones of the first lexer)
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content, scale)
+            size = len(scaled_content.encode("utf-8")) / 1_000_000
+
+            throughputs = []
+            results = []
+            for lexer in lexers.values():
+                start = time_ns()
+                results.append(lexer(scaled_content))
+                throughputs.append(size / max(time_ns() - start, 1) * 1_000_000_000)
+
+            rows.append((
+                name, scale, f"{size:.2f}", len(results[0]),
+                *(f"{throughput:.2f} (x{throughput / throughputs[0]:.1f})" for throughput in throughputs),
+                all(result == results[0] for result in results)
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Size (MB)", "Tokens", *(f"{lexer} (MB/s)" for lexer in lexers), "Same tokens"), tablefmt="grid")
+
+
+def lexer_memory_report(contents: Dict[str, bytes], lexers: Dict[str, Callable[[bytes], Tuple[Token]]], scales: Iterable[int] = (1, 10, 100)) -> str:
+    # Peak memory of lexing the raw content of each document scaled up with each lexer (the tokens included, the raw content excluded)
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content.decode("utf-8"), scale).encode("utf-8")
+
+            peaks = []
+            for lexer in lexers.values():
+                start_tracing()
+                tokens = lexer(scaled_content)
+                _, peak = get_traced_memory()
+                stop_tracing()
+                peaks.append(peak)
+                del tokens
+
+            rows.append((
+                name, scale, f"{len(scaled_content) / 1_000_000:.2f}",
+                *(f"{peak / 1_000_000:.2f} (x{peak / len(scaled_content):.1f})" for peak in peaks)
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Size (MB)", *(f"{lexer} peak (MB)" for lexer in lexers)), tablefmt="grid")
+
+
+def line_index_report(contents: Dict[str, bytes], scales: Iterable[int] = (1, 10, 100)) -> str:
+    # Convert the offset of every object of each document scaled up to line and column (a scan per offset and a shared index)
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content.decode("utf-8"), scale).encode("utf-8")
+            offsets = [match.start() for match in compile(rb"\d+ \d+ obj").finditer(scaled_content)]
+
+            start = time_ns()
+            scanned = [calc_line_column(scaled_content, offset) for offset in offsets]
+            scan_time = time_ns() - start
+
+            start = time_ns()
+            line_index = LineIndex(scaled_content)
+            indexed = [line_index.line_column(offset) for offset in offsets]
+            index_time = time_ns() - start
+
+            rows.append((
+                name, scale, f"{len(scaled_content) / 1_000_000:.2f}", len(offsets),
+                f"{scan_time / 1_000_000:.1f}", f"{index_time / 1_000_000:.2f}", scanned == indexed
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Size (MB)", "Offsets", "Scan per offset (ms)", "Line index (ms)", "Same result"), tablefmt="grid")
+
+
+def streams_report(
+        lexer: Callable[[bytes, List[Tuple[int, bool]]], Iterable[Token]],
+        objects: int = 100,
+        stream_sizes: Iterable[int] = (1_000, 10_000, 100_000)
+    ) -> str:
+    # Lex documents with content streams of each size with and without their /Length (time and streams jumped over with it)
+    rows = []
+    for stream_size in stream_sizes:
+        results = []
+        for has_length in (True, False):
+            content = stream_document(objects, stream_size, has_length)
+            streams: List[Tuple[int, bool]] = []
+            start = time_ns()
+            tokens = tuple(lexer(content, streams))
+            elapsed = time_ns() - start
+            results.append((content, tokens, streams, elapsed))
+
+        (content, tokens, streams, length_time), (_, scan_tokens, _, scan_time) = results
+        rows.append((
+            stream_size, f"{len(content) / 1_000_000:.2f}",
+            f"{sum(is_length for _, is_length in streams)}/{len(streams)}",
+            f"{length_time / 1_000_000:.1f}", f"{scan_time / 1_000_000:.1f}", f"x{scan_time / length_time:.1f}",
+            [token.string for token in tokens if token.category == "STREAM_BLOCK"] == [token.string for token in scan_tokens if token.category == "STREAM_BLOCK"]
+        ))
+
+    return tabulate(rows, headers=("Stream size", "Size (MB)", "With /Length", "/Length (ms)", "Scan (ms)", "Speedup", "Same streams"), tablefmt="grid")
+
+
+def token_store_report(contents: Dict[str, bytes], lexers: Dict[str, Callable[[bytes], Sequence[Token]]], scales: Iterable[int] = (10, 100, 1000)) -> str:
+    # Memory kept by the tokens of each document scaled up with each lexer (the raw content excluded) and the time to lex them
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content.decode("utf-8"), scale).encode("utf-8")
+
+            results = []
+            for lexer in lexers.values():
+                start_tracing()
+                start = time_ns()
+                tokens = lexer(scaled_content)
+                elapsed = time_ns() - start
+                kept, _ = get_traced_memory()
+                stop_tracing()
+                results.append((len(tokens), kept, elapsed))
+                del tokens
+
+            count = results[0][0]
+            rows.append((
+                name, scale, count,
+                *(f"{kept / count:.1f} ({elapsed / 1_000_000:.0f} ms)" for _, kept, elapsed in results)
+            ))
+
+    return tabulate(rows, headers=("Document", "Scale", "Tokens", *(f"{lexer} (bytes/token)" for lexer in lexers)), tablefmt="grid")
+
+
+def queries_report(
+        contents: Dict[str, bytes],
+        parse: Callable[[bytes, Optional[Iterable[str]]], SyntaxNode],
+        values: Iterable[str],
+        scope: str,
+        scales: Iterable[int] = (1, 10, 100)
+    ) -> str:
+    # Find the nodes of each value in the syntax tree of each document scaled up and under each of its "scope" nodes
+    # By searching the tree and with its index (built on the first query, its build is timed apart)
+    # The parse with index values is timed too (the index isn't built while parsing, so it costs the same as the parse without them)
+    values = tuple(values)
+    rows = []
+    for name, content in contents.items():
+        for scale in scales:
+            scaled_content = scale_content(content.decode("utf-8"), scale).encode("utf-8")
+
+            start = time_ns()
+            parse(scaled_content, None)
+            parse_time = time_ns() - start
+            start = time_ns()
+            syntax_tree = parse(scaled_content, values)
+            indexed_parse_time = time_ns() - start
+
+            start = time_ns()
+            index = NodeIndex(syntax_tree, values)
+            build_time = time_ns() - start
+
+            results = []
+            for tree_index in (index, None):
+                syntax_tree.index, syntax_tree.index_values = tree_index, (values if tree_index is not None else None)
+                start = time_ns()
+                found = [syntax_tree.find(value) for value in values]
+                found.extend(syntax_tree.find(value, node) for node in syntax_tree.find(scope) for value in values)
+                results.append((found, time_ns() - start))
+
+            (indexed, indexed_time), (searched, search_time) = results
+            rows.append((
+                name, scale, len(found),
+                f"{parse_time / 1_000_000:.1f}", f"{indexed_parse_time / 1_000_000:.1f}",
+                f"{search_time / 1_000_000:.1f}", f"{build_time / 1_000_000:.1f}", f"{indexed_time / 1_000_000:.2f}",
+                all(len(a) == len(b) and all(x is y for x, y in zip(a, b)) for a, b in zip(indexed, searched))
+            ))
+
+    return tabulate(
+        rows,
+        headers=("Document", "Scale", "Queries", "Parse (ms)", "Parse with index values (ms)", "Search (ms)", "Index build (ms)", "Index (ms)", "Same nodes"),
+        tablefmt="grid"
+    )
+
+
+def _reduce_steps(parser: LR1Parser, tokens: Iterable[Token]) -> Optional[int]:
+    # Amount of reductions made by the parser tables for the tokens (None when the tokens are rejected)
+    reduce_steps = 0
+
+    def count_reduce(lhs: str, values: List[Any]) -> None:
+        nonlocal reduce_steps
+        reduce_steps += 1
+
+    push_parser = PushParser(parser.compiled_table, reduce_handlers=(count_reduce, ) * len(parser.compiled_table.rules_lhs), shift_handler=keep_token)
+    try:
+        push_parser.feed_many(tokens)
+        push_parser.finish()
+    except ValueError:
+        return None
+    return reduce_steps
+
+
+def _tree_shape(syntax_tree: SyntaxNode) -> Tuple[int, int]:
+    # Amount of nodes and depth of a syntax tree (iterative, the trees can be deeper than the recursion limit)
+    nodes, depth = 0, 0
+    pending = [(syntax_tree, 1)]
+    while pending:
+        node, level = pending.pop()
+        nodes += 1
+        depth = max(depth, level)
+        pending.extend((child, level + 1) for child in node.children)
+    return nodes, depth
+
+
+def _deep_size(obj: Any, seen: Optional[set] = None) -> int:
+    # Approximated size of an object and everything it references (shared objects counted once)
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (type, Enum)):
+        return 0
+    seen.add(id(obj))
+
+    size = getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif isinstance(obj, (str, bytes, int, float, array, Pattern)):
+        pass
+    else:
+        slots = getattr(type(obj), "__slots__", ())
+        for slot in (slots, ) if isinstance(slots, str) else slots:
+            if hasattr(obj, slot):
+                size += _deep_size(getattr(obj, slot), seen)
+        if hasattr(obj, "__dict__"):
+            size += _deep_size(vars(obj), seen)
+    return size
+
+
+if __name__ == "__main__":
+    paths = sorted((Path(__file__).parents[1] / "spdf_analyser" / "in").glob("*.spdf"))
+    contents = {path.name: path.read_bytes().decode("utf-8") for path in paths}
+    raw_contents = {name: content.encode("utf-8") for name, content in contents.items()}
+    documents = {name: lexicon_analysis(content) for name, content in contents.items()}
+    compact_parser = LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE)
+
+    def index_run_handlers() -> Tuple[Dict[str, ReduceHandler], ReduceHandler, ShiftHandler]:
+        # Tree-free run collecting the objects, references and XREF elements
+        reduce_handlers, shift_handler = index_handlers([], [], [])
+        return reduce_handlers, discard_values, shift_handler
+
+    def full_analysis(content: bytes) -> Tuple[Iterable[Token], SyntaxNode]:
+        tokens = bytes_lexicon_store(content)
+        return tokens, syntax_analysis(tokens)
+
+    def recovering_parse(content: bytes, index_values: Optional[Iterable[str]]) -> SyntaxNode:
+        # The documents with errors are parsed too (as in the analysis)
+        push_parser = compact_parser.push_parser(sync_categories=SPDF_GRAMMAR_SYNC, insert_categories=SPDF_GRAMMAR_INSERT, index_values=index_values)
+        push_parser.feed_many(bytes_lexicon_stream(content))
+        return push_parser.finish()
+
+    print("SPDF_GRAMMAR")
+    print(modes_report(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_MODES_CONFLICTS))
+
+    print("TABLE CACHE (none / cold / warm)")
+    print(cache_report(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS))
+
+    print("STATES")
+    print(states_report(SPDF_GRAMMAR))
+
+    print("BUILD PHASES")
+    print(build_report(SPDF_GRAMMAR))
+
+    print("SYMBOLS")
+    print(symbols_report(SPDF_GRAMMAR))
+
+    print("CONTAINERS")
+    print(containers_report())
+
+    print("TABLES MEMORY")
+    print(tables_memory_report(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS))
+
+    print("PARSE THROUGHPUT")
+    print(parse_report(LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS), documents))
+
+    print("PUSH PARSING")
+    print(push_report(LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS), documents))
+
+    print("SEMANTIC ACTIONS")
+    print(handlers_report(LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS), documents, index_run_handlers))
+
+    print("GRAMMAR OPTIMIZATION")
+    print(optimize_report(SPDF_GRAMMAR, documents, expected_conflicts=(SPDF_GRAMMAR_CONFLICTS, 0)))
+
+    print("SYNTAX TREE COMPACTION (plain / compact, the compaction costs about as much to parse)")
+    print(tree_report(LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS), compact_parser, documents, references_analysis))
+
+    print("INCREMENTAL ANALYSIS")
+    print(reparse_report(contents, full_analysis, incremental_syntax_analysis))
+
+    print("LEXER THROUGHPUT (lines / single pass)")
+    print(lexer_report(contents, {"Lines": lambda content: lines_lexicon_analysis(content, SPDF_LANGUAGE_PATTERNS), "Single pass": lexicon_analysis}))
+
+    print("LEXER MEMORY (decoded / bytes)")
+    print(lexer_memory_report(raw_contents, {"Decoded": lambda content: lexicon_analysis(content.decode("utf-8")), "Bytes": bytes_lexicon_analysis}))
+
+    print("TOKEN STORE (tokens / columns)")
+    print(token_store_report(raw_contents, {"Tokens": bytes_lexicon_analysis, "Columns": bytes_lexicon_store}))
+
+    print("STREAM BLOCKS (/Length / scan)")
+    print(streams_report(lambda content, streams: bytes_lexicon_stream(content, streams=streams)))
+
+    print("SYNTAX TREE QUERIES (search / index)")
+    print(queries_report(raw_contents, recovering_parse, SPDF_GRAMMAR_INDEX, "EXPR__OBJ"))
+
+    print("LINE INDEX")
+    print(line_index_report(raw_contents))
+
+    print(f"PARALLEL PARSING ({available_cpus()} CPUs available)")
+    print(parallel_report(contents, lexicon_analysis, syntax_analysis, parallel_syntax_analysis))
+
+    print("AUTOMATON SCALING")
+    print(automaton_report())
\ No newline at end of file
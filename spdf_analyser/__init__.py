@@ -1,10 +1,25 @@
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from enum import Enum
+from hashlib import sha256
+from importlib.util import module_from_spec, spec_from_file_location
+from json import dumps, loads
+from mmap import ACCESS_READ, mmap
 from more_itertools import collapse
+from multiprocessing import get_start_method
+from os import cpu_count, environ
 from pathlib import Path
+from pickle import PicklingError
 from re import Match, Pattern, compile, escape, finditer, match
+from sys import platform
 from tabulate import tabulate
 from time import time_ns
-from typing import Callable, Dict, Generator, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Self, SupportsIndex, Any
\ No newline at end of file
+from types import ModuleType
+from typing import Callable, Deque, Dict, FrozenSet, Generator, Generic, Iterable, List, MutableSet, Optional, Sequence, Tuple, Type, TypeVar, Self, SupportsIndex, Any
+from warnings import warn
+from zlib import compress, decompress, error as ZlibError
\ No newline at end of file
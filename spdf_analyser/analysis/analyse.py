@@ -1,77 +1,92 @@
 from .. import *
 
-from ..io import config_loader, file_loader, file_writter
+from ..io import config_loader, file_mapper, file_writter
 from ..parser.classes.syntax_node import SyntaxNode
 from ..parser.classes.token import Token
 
 from .language import SPDF_LANGUAGE_PATTERNS
+from .nodes import dict_pair, object_reference, parse_reference
 from .validation.hierarchy import hierarchy_analysis
-from .validation.lexical import lexicon_analysis, has_margins_analysis
-from .validation.syntax import syntax_analysis
+from .validation.lexical import bytes_lexicon_store, store_margins_analysis
+from .validation.syntax import recovering_syntax_analysis
 from .validation.references import references_analysis
 from .validation.xref import xref_analysis
 
 
 def analyse(path: Path, config_path: Optional[Path] = None, output_path: Path = Path("output.txt"), encoding: str="utf-8") -> None:
-    # Try loading file 
-    file_content = file_loader(path, print_status=True)
+    # Try loading file (mapped, the content is lexed as bytes and never copied)
+    file_content = file_mapper(path, print_status=True)
     if not file_content:
-        return None
+        return None # Not loaded (or empty)
 
-    # Try loading config file 
-    config = config_loader(config_path, encoding=encoding, print_status=True) if config_path else None
+    # The mapping is closed once the analysis is done
+    with file_content:
+        # Try loading config file 
+        config = config_loader(config_path, encoding=encoding, print_status=True) if config_path else None
     
-    start = time_ns()
+        start = time_ns()
 
-    # VALIDATION
-    syntax_tree, hierarchy, types, outlines_ref, metadata_ref = validation(file_content, encoding)
+        # VALIDATION
+        syntax_tree, hierarchy, types, outlines_ref, metadata_ref = validation(file_content, encoding)
 
-    # Getting all raw data
-    raw_data = get_raw_data(syntax_tree)
+        # Getting all raw data
+        raw_data = get_raw_data(syntax_tree)
 
-    # Getting metadata
-    metadata_data = get_metadata_data(syntax_tree, metadata_ref)
+        # Getting metadata
+        metadata_data = get_metadata_data(syntax_tree, metadata_ref)
 
-    # STATISTICS
-    statistics(file_content, syntax_tree, types, raw_data, encoding)
+        # STATISTICS
+        statistics(file_content, syntax_tree, types, raw_data, encoding)
 
-    # CONTENT
-    content(raw_data, metadata_data)
+        # CONTENT
+        content(raw_data, metadata_data)
 
-    # OBJECTS TREE
-    objects_tree(hierarchy, types)
+        # OBJECTS TREE
+        objects_tree(hierarchy, types)
 
-    # ADVANCED ANALYSIS
-    if config:
-        outlines = get_outlines(syntax_tree, outlines_ref, hierarchy)
-        advanced_analysis(config, output_path, raw_data, outlines, hierarchy, types, encoding)
+        # ADVANCED ANALYSIS
+        if config:
+            outlines = get_outlines(syntax_tree, outlines_ref, hierarchy)
+            advanced_analysis(config, output_path, raw_data, outlines, hierarchy, types, encoding)
 
-    # Final message
-    print(f"Executed analysis into {(time_ns() - start) / 1_000_000_000:.2}s", end="")
+        # Final message
+        print(f"Executed analysis into {(time_ns() - start) / 1_000_000_000:.2}s", end="")
 
 
-def validation(file_content: bytes, encoding: str="utf-8") -> Tuple[SyntaxNode, Dict[Tuple[int, int], List[Tuple[int, int]]], Dict[int, Tuple[str, str]]]:
+def validation(file_content: bytes | mmap, encoding: str="utf-8") -> Tuple[SyntaxNode, Dict[Tuple[int, int], List[Tuple[int, int]]], Dict[int, Tuple[str, str]]]:
     validation_errors: Dict[str, List[str]] = defaultdict(list)
 
-    # Lexicon analysis
-    tokens = lexicon_analysis(file_content.decode(encoding))
-    for token in tokens:
-        if token.category == None:
-            validation_errors["General structure"].append(f"Failed when trying to classify \"{token.string}\" at the line {token.line + 1} and at the position {token.position + 1}")
+    # Lexicon analysis (the tokens are kept as columns, a token is only created when the parser or an error reads it)
+    tokens = bytes_lexicon_store(file_content, encoding)
+
+    # Syntax analysis (every syntax error is reported, the next analyses run on the recovered objects)
+    # Serial (the parallel parsing of syntax_analysis can't recover the errors)
+    syntax_tree = None
+    syntax_errors: List[str] = []
+    try:
+        syntax_tree, recovered_errors = recovering_syntax_analysis(tokens)
+        for token, error in recovered_errors:
+            if token.category is None:
+                continue # Undefined lexicon (reported by the lexicon analysis)
+            elif token.line is None:
+                syntax_errors.append(f"{error} at the end of the file")
+            else:
+                syntax_errors.append(f"{error} (\"{token.string}\") at the line {token.line + 1} and at the position {token.position + 1}")
+    except Exception as e:
+        syntax_errors.append(f"Error when trying to generate the syntactic tree: {str(e)}")
+
+    # Undefined lexicons (found in the category column)
+    for i in tokens.indexes(None):
+        validation_errors["General structure"].append(f"Failed when trying to classify \"{tokens.string(i)}\" at the line {tokens.lines[i] + 1} and at the position {tokens.positions[i] + 1}")
 
-    # Header and EOF analysis
-    has_header, has_eof = has_margins_analysis(tokens)
+    # Header and EOF analysis (on the lines column)
+    has_header, has_eof = store_margins_analysis(tokens)
     if not has_header:
         validation_errors["General structure"].append("Header not found")
     if not has_eof:
         validation_errors["General structure"].append("EOF not found")
 
-    # Syntax analysis
-    syntax_tree = None
-    try:
-        syntax_tree = syntax_analysis(tokens)
-    except Exception as e:
-        validation_errors["Objects syntax"].append(f"Error when trying to generate the syntactic tree: {str(e)}")
+    validation_errors["Objects syntax"].extend(syntax_errors)
 
     # References analysis
     if syntax_tree:
@@ -95,6 +110,7 @@ def validation(file_content: bytes, encoding: str="utf-8") -> Tuple[SyntaxNode,
         if hierarchy_errors:
             validation_errors["Hierarchy structure"].extend(hierarchy_errors)
     else:
+        hierarchy, types, outlines_ref, metadata_ref = None, None, None, None
         validation_errors["Hierarchy structure"].append("Unable to execute the hierarchy analysis")
 
     # Summary
@@ -119,7 +135,7 @@ def validation(file_content: bytes, encoding: str="utf-8") -> Tuple[SyntaxNode,
     return syntax_tree, hierarchy, types, outlines_ref, metadata_ref
 
 
-def statistics(file_content: bytes, syntax_tree: SyntaxNode, types: Dict[Tuple[int, int], Tuple[str, str]], raw_data: Tuple[Tuple[int, int], str], encoding="utf-8") -> None:
+def statistics(file_content: bytes | mmap, syntax_tree: SyntaxNode, types: Dict[Tuple[int, int], Tuple[str, str]], raw_data: Tuple[Tuple[int, int], str], encoding="utf-8") -> None:
     # Summary
     summary = ""
 
@@ -128,12 +144,10 @@ def statistics(file_content: bytes, syntax_tree: SyntaxNode, types: Dict[Tuple[i
     if syntax_tree:
         # Building objects
         objects = None
-        objects: List[Tuple[int, int]] = syntax_tree.find_tokens(
-            lambda x:  (int(x[0].string), int(x[1].string)) if "KEYWORD__OBJ" in [y.category for y in x] else tuple()
-        )[0]
+        objects: Tuple[SyntaxNode] = syntax_tree.find("EXPR__OBJ")
 
         # Getting amount per type
-        obj_types = dict(Counter([type[0].lstrip("/") for type in types.values() if type[0] != None]))
+        obj_types = dict(Counter([type[0].lstrip("/") for type in (types or dict()).values() if type[0] != None]))
 
         # Calculating structural overhead
         overhead = len(bytes("".join([stream for _, stream in raw_data]), encoding=encoding))
@@ -230,8 +244,11 @@ def advanced_analysis(config: Dict[str, bool], output_path: Path, raw_data: Tupl
         # SUMMARY
         if "generate_summary" in config and config["generate_summary"] == True:
             text = "Summary: "
-            if outlines:
-                text += ", ".join([SPDF_LANGUAGE_PATTERNS["LITERAL__STRING"].match(outline[0]).group(1) for outline in outlines])
+            # Outlines without a title (or with something else than a string) are left out
+            titles = [SPDF_LANGUAGE_PATTERNS["LITERAL__STRING"].match(title) for title, _ in outlines or [] if title]
+            titles = [title.group(1) for title in titles if title]
+            if titles:
+                text += ", ".join(titles)
             else:
                 text += "Unable to generate a summary"
             analysis.append(text)
@@ -242,9 +259,9 @@ def advanced_analysis(config: Dict[str, bool], output_path: Path, raw_data: Tupl
             if output_path and raw_data and outlines and hierarchy:
                 text_data = []
                 added_texts = []
-                for outline in outlines:
+                for _, destination in outlines:
                     for (obj_id, obj_gen), stream in raw_data:
-                        if (obj_id, obj_gen) in hierarchy[outline[1]] and not (obj_id, obj_gen) in added_texts:
+                        if (obj_id, obj_gen) in hierarchy.get(destination, []) and not (obj_id, obj_gen) in added_texts:
                             text_data.append(format_stream(stream))
                             added_texts.append((obj_id, obj_gen))
                 is_written = file_writter(output_path, "\n\n".join(text_data), encoding=encoding, print_status=False)
@@ -259,8 +276,9 @@ def advanced_analysis(config: Dict[str, bool], output_path: Path, raw_data: Tupl
             if hierarchy:
                 page_hierarchy = {}
                 for k, v in hierarchy.items():
-                    if types[k][0] and types[k][0].lstrip("/") in ["Catalog", "Pages", "Page"]:
-                        page_hierarchy[k] = [e for e in v if types[e][0] and types[e][0].lstrip("/") in ["Catalog", "Pages", "Page"]]
+                    # Objects without a type (not found) are left out
+                    if types.get(k, [None])[0] and types[k][0].lstrip("/") in ["Catalog", "Pages", "Page"]:
+                        page_hierarchy[k] = [e for e in v if types.get(e, [None])[0] and types[e][0].lstrip("/") in ["Catalog", "Pages", "Page"]]
                 text += f"{'Cycles detected' if has_cycle(page_hierarchy) else 'No cycles detected'}"
             else:
                 text += "Unable to detect cycles"
@@ -278,68 +296,51 @@ def get_raw_data(syntax_tree: SyntaxNode) -> Tuple[Tuple[int, int], str]:
     raw_data = list()
 
     # Building objects 
-    object_nodes = syntax_tree.find_nodes(
-        lambda x: x.value == "EXPR__OBJ"
-    )
-    object_nodes = list(collapse(object_nodes))
+    object_nodes = syntax_tree.find("EXPR__OBJ")
 
     # Adding STREAM_BLOCK raw data
     for object_node in object_nodes:
-        stream_node = object_node.find_nodes(
-            lambda x: isinstance(x.value, Token) and x.value.category == "STREAM_BLOCK"
-        )[0]
+        stream_node = syntax_tree.find("STREAM_BLOCK", object_node)
+        obj_ref = object_reference(object_node) # First and second unsigned integer
 
-        if not stream_node:
+        # Missing in a partial object
+        if not stream_node or not obj_ref:
             continue
 
-        obj_id = int(object_node.children[0].value.string) # First unsigned integer
-        obj_gen = int(object_node.children[1].value.string) # Second unsigned integer
-
         stream = SPDF_LANGUAGE_PATTERNS["STREAM_BLOCK"].match(stream_node[0].value.string).group(1)
-        raw_data.append(((obj_id, obj_gen), stream))
+        raw_data.append((obj_ref, stream))
     
     # Returning all raw data
     return raw_data
 
 
 def get_outlines(syntax_tree: SyntaxNode, outlines_ref: str, hierarchy: Dict[Tuple[int, int], List[Tuple[int, int]]]) -> Optional[Tuple[Tuple[str, Tuple[int, int]]]]:
-    if syntax_tree and outlines_ref:
-        outlines_id = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(outlines_ref).group(1)) # First unsigned integer
-        outlines_gen = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(outlines_ref).group(2)) # Second unsigned integer
-        
-        outlines_childs = hierarchy[(outlines_id, outlines_gen)]
+    # The outlines of a partial syntax tree can be something else than a reference
+    outlines = parse_reference(outlines_ref) if syntax_tree and hierarchy else None
+    if outlines:
+        outlines_childs = hierarchy.get(outlines, [])
 
         # Building objects 
-        object_nodes = syntax_tree.find_nodes(
-            lambda x: x.value == "EXPR__OBJ"
-        )
-        object_nodes = list(collapse(object_nodes))
+        object_nodes = syntax_tree.find("EXPR__OBJ")
 
         # Finding outlines childs nodes
-        outlines_nodes = []
-        for object_node in object_nodes:
-            for outlines_child in outlines_childs:
-                if int(object_node.children[0].value.string) == outlines_child[0] and int(object_node.children[1].value.string) == outlines_child[1]:
-                    outlines_nodes.append(object_node)
+        outlines_nodes = [object_node for object_node in object_nodes if object_reference(object_node) in outlines_childs]
         
-        # Getting title from childs nodes
+        # Getting title and destination from childs nodes (None when missing)
         titles = []
         for outlines_node in outlines_nodes:
-            dict_pairs = outlines_node.find_nodes(
-                lambda x: x.value == "STRUCT__DICT_PAIR"
-            )[0]
-            values = []
-            for dict_pair in dict_pairs:
-                k, v = dict_pair.children[0].value, dict_pair.children[1].children[0]
-                if k.string == "/Title":
-                    values.append(v.value.string)
-                elif k.string == "/Dest":
-                    ref = v.find_tokens("REFERENCE")[0][0][0].string
-                    ref_id = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(ref).group(1)) # First unsigned integer
-                    ref_gen = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(ref).group(2)) # Second unsigned integer
-                    values.append((ref_id, ref_gen))
-            if values:
-                titles.append(tuple(values))
+            title, destination = None, None
+            for pair_node in syntax_tree.find("STRUCT__DICT_PAIR", outlines_node):
+                pair = dict_pair(pair_node)
+                if not pair:
+                    continue # Partial dict pair
+                k, v = pair
+                if k.string == "/Title" and isinstance(v.value, Token):
+                    title = v.value.string
+                elif k.string == "/Dest" and v.find_tokens("REFERENCE")[0]:
+                    destination = parse_reference(v.find_tokens("REFERENCE")[0][0][0].string)
+            if title is not None or destination is not None:
+                titles.append((title, destination))
 
         return tuple(titles)
     else:
@@ -347,26 +348,26 @@ def get_outlines(syntax_tree: SyntaxNode, outlines_ref: str, hierarchy: Dict[Tup
 
 
 def get_metadata_data(syntax_tree: SyntaxNode, metadata_ref: str) -> Dict[str, str]:
-    if not syntax_tree:
+    # The metadata of a partial syntax tree can be missing or something else than a reference
+    metadata = parse_reference(metadata_ref) if syntax_tree else None
+    if not metadata:
         return dict()
 
     # Extracting metadata
-    metadata_id = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(metadata_ref).group(1)) # First unsigned integer
-    metadata_gen = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(metadata_ref).group(2)) # Second unsigned integer
-
     metadata_node = None
-    for node in syntax_tree.find_nodes(
-        lambda x: x.value == "EXPR__OBJ"
-    )[0]:
-        if int(node.children[0].value.string) == metadata_id and int(node.children[1].value.string) == metadata_gen:
+    for node in syntax_tree.find("EXPR__OBJ"):
+        if object_reference(node) == metadata:
             metadata_node = node
+
+    # Missing in a partial syntax tree
+    if metadata_node is None:
+        return dict()
     
     metadata_data = dict()
-    for dict_pair in metadata_node.find_nodes(
-        lambda x: x.value == "STRUCT__DICT_PAIR"
-    )[0]:
-        k, v = dict_pair.children[0].value, dict_pair.children[1].children[0].value
-        metadata_data[k.string.lstrip("/")] = v.string
+    for pair_node in syntax_tree.find("STRUCT__DICT_PAIR", metadata_node):
+        pair = dict_pair(pair_node)
+        if pair and isinstance(pair[1].value, Token): # Partial dict pair otherwise
+            metadata_data[pair[0].string.lstrip("/")] = pair[1].value.string
     
     return metadata_data
 
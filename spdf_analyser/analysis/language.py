@@ -45,6 +45,19 @@ SPDF_LANGUAGE: Dict[str, str] = {
     "NAME": r"/([A-Z][a-zA-Z0-9]*)", # Lower priority
 }
 SPDF_LANGUAGE_PATTERNS: Dict[str, Pattern[str]] = {key: compile(value) for key, value in SPDF_LANGUAGE.items()}
+# Master pattern of the lexer (leading whitespace, then one group per token in order of priority, the "lastgroup" of a match is its category)
+SPDF_LANGUAGE_REGEX: Pattern[str] = compile(r"\s*(?:" + "|".join(f"(?P<{key}>{value})" for key, value in SPDF_LANGUAGE.items()) + ")")
+SPDF_LANGUAGE_SPACES: Pattern[str] = compile(r"\s*")
+# Same patterns for the raw bytes of a document (ASCII classes)
+SPDF_LANGUAGE_BYTES_PATTERNS: Dict[str, Pattern[bytes]] = {key: compile(value.encode("ascii")) for key, value in SPDF_LANGUAGE.items()}
+SPDF_LANGUAGE_BYTES_REGEX: Pattern[bytes] = compile(SPDF_LANGUAGE_REGEX.pattern.encode("ascii"))
+SPDF_LANGUAGE_BYTES_SPACES: Pattern[bytes] = compile(rb"\s*")
+# Start of the data of a stream block and the end of the block after its data (the data is jumped over with the /Length of the object)
+# An EOL ends the data (as in the STREAM_BLOCK pattern, "endstream" right after the data isn't the end of a block)
+SPDF_STREAM_DATA_START: Pattern[str] = compile(r"stream(?:\r\n|[\s])")
+SPDF_STREAM_DATA_END: Pattern[str] = compile(r"[\r\n][\s]*endstream")
+SPDF_STREAM_BYTES_DATA_START: Pattern[bytes] = compile(rb"stream(?:\r\n|[\s])")
+SPDF_STREAM_BYTES_DATA_END: Pattern[bytes] = compile(rb"[\r\n][\s]*endstream")
 
 # Definition of the grammar with its production rules
 SPDF_GRAMMAR: Tuple[Tuple[str, str]] = (
@@ -100,4 +113,20 @@ SPDF_GRAMMAR: Tuple[Tuple[str, str]] = (
     ("VALUE__ARRAY", "LITERAL__UNSIGNED_INTEGER"),
     ("VALUE__ARRAY", "LITERAL__STRING"),
     ("VALUE__ARRAY", "NAME"),
-)
\ No newline at end of file
+)
+# Conflicts of the LR(1) tables of the declared grammar (the lists and their elements both derive nothing, resolved by SHIFT as an empty element is never kept)
+# Another amount of conflicts (e.g. with a weaker construction mode) is reported when the tables are built
+SPDF_GRAMMAR_CONFLICTS: int = 23
+# Conflicts of the tables of the declared grammar with each construction mode (by the name of the mode)
+SPDF_GRAMMAR_MODES_CONFLICTS: Dict[str, int] = {"LR0": 39, "SLR1": 17, "LALR1": 17, "LR1": SPDF_GRAMMAR_CONFLICTS}
+# Shape of the syntax tree (lists built as flat nodes and pass-through non-terminals elided)
+SPDF_GRAMMAR_FLATTEN: Tuple[str] = ("EXPRS", "STRUCT__DICT_PAIRS", "STRUCT__ARRAY_ELEMENTS", "STRUCT__XREF_ELEMENTS")
+SPDF_GRAMMAR_ELIDE: Tuple[str] = ("EXPR", "EXPR__COMMENT", "STRUCT__ARRAY_ELEMENT", "STRUCT__XREF_ELEMENT", "VALUE__DICT", "VALUE__ARRAY")
+# Error recovery of the grammar (synchronization tokens with the non-terminal they end, None to resume at them, and the tokens inserted when missing)
+SPDF_GRAMMAR_SYNC: Dict[str, Optional[str]] = {"KEYWORD__ENDOBJ": "EXPR", "KEYWORD__XREF": None, "KEYWORD__TRAILER": None}
+SPDF_GRAMMAR_INSERT: Tuple[str] = (
+    "MARGIN__HEADER", "MARGIN__EOF", "KEYWORD__OBJ", "KEYWORD__ENDOBJ",
+    "PUNCTUATOR__OPEN_CONTENT", "PUNCTUATOR__CLOSE_CONTENT", "PUNCTUATOR__OPEN_ARRAY", "PUNCTUATOR__CLOSE_ARRAY"
+)
+# Nodes of the syntax tree queried by the analysis (indexed by the parser)
+SPDF_GRAMMAR_INDEX: Tuple[str] = ("EXPR__OBJ", "EXPR__XREF", "EXPR__TRAILER", "STRUCT__DICT_PAIR", "STREAM_BLOCK")
\ No newline at end of file
@@ -0,0 +1,34 @@
+from .. import *
+
+from ..parser.classes.syntax_node import SyntaxNode
+from ..parser.classes.token import Token
+
+from .language import SPDF_LANGUAGE_PATTERNS
+
+
+# Accessors of the nodes of a syntax tree, None for a partial node (the nodes of a recovered syntax tree can miss their last children)
+
+
+def object_reference(object_node: SyntaxNode) -> Optional[Tuple[int, int]]:
+    # Id and gen of an EXPR__OBJ node (first and second unsigned integer, followed by the "obj" keyword)
+    tokens = [child.value for child in object_node.children[:3]]
+    if len(tokens) < 3 or not all(isinstance(token, Token) for token in tokens):
+        return None
+    if [token.category for token in tokens] != ["LITERAL__UNSIGNED_INTEGER", "LITERAL__UNSIGNED_INTEGER", "KEYWORD__OBJ"]:
+        return None
+    return int(tokens[0].string), int(tokens[1].string)
+
+
+def dict_pair(pair_node: SyntaxNode) -> Optional[Tuple[Token, SyntaxNode]]:
+    # Name token and value node of a STRUCT__DICT_PAIR node (VALUE__DICT node is elided)
+    if len(pair_node.children) != 2 or not isinstance(pair_node.children[0].value, Token):
+        return None
+    return pair_node.children[0].value, pair_node.children[1]
+
+
+def parse_reference(reference: Optional[str]) -> Optional[Tuple[int, int]]:
+    # Id and gen of a reference (e.g. "1 0 R"), a value of a partial syntax tree can be something else
+    reference_match = SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(reference) if reference else None
+    if not reference_match:
+        return None
+    return int(reference_match.group(1)), int(reference_match.group(2)) # First and second unsigned integer
\ No newline at end of file
@@ -1,40 +1,37 @@
 from ... import *
 
 from ...parser.classes.syntax_node import SyntaxNode
+from ...parser.classes.token import Token
 
 from ..language import SPDF_LANGUAGE_PATTERNS
+from ..nodes import dict_pair, object_reference
 
 
 def hierarchy_analysis(syntax_tree: SyntaxNode) -> Tuple[Tuple[str], Dict[Tuple[int, int], List[Tuple[int, int]]], Dict[Tuple[int, int], Tuple[str, str]], str, str]:
     hierarchy_errors = []
 
-    # Get the dict pairs nodes from trailer node
-    dict_nodes = syntax_tree.find_nodes(
-        lambda x: x.value == "EXPR__TRAILER"
-    )[0][0].find_nodes(
-        lambda x: x.value == "STRUCT__DICT_PAIR"
-    )[0]
+    # Get the dict pairs nodes from trailer node (missing in a partial syntax tree)
+    trailer_nodes = syntax_tree.find("EXPR__TRAILER")
+    if not trailer_nodes:
+        hierarchy_errors.append("Failed to find the trailer")
+        return hierarchy_errors, None, None, None, None
+    dict_nodes = syntax_tree.find("STRUCT__DICT_PAIR", trailer_nodes[0])
 
     # Getting root node
     root_node_ref = None
     for dict_node in dict_nodes:
-        tokens = dict_node.get_all_tokens()
-        if tokens[0].string == "/Root":
-            root_node_ref = tokens[1].string
+        pair = dict_pair(dict_node)
+        if pair and pair[0].string == "/Root" and isinstance(pair[1].value, Token):
+            root_node_ref = pair[1].value.string
 
     # Failed to get root node reference
     if not root_node_ref:
         hierarchy_errors.append("Failed to get root node reference")
-        return hierarchy_errors, None, None
+        return hierarchy_errors, None, None, None, None
 
-    # Building objects
-    objects_refs = syntax_tree.find_tokens(
-        lambda x: (int(x[0].string), int(x[1].string)) if "KEYWORD__OBJ" in [y.category for y in x] else tuple()
-    )[0]
-    object_nodes = syntax_tree.find_nodes(
-        lambda x: x.value == "EXPR__OBJ"
-    )
-    object_nodes = list(collapse(object_nodes))
+    # Building objects (without the partial objects of a recovered syntax tree)
+    object_nodes = [node for node in syntax_tree.find("EXPR__OBJ") if object_reference(node)]
+    objects_refs = [object_reference(node) for node in object_nodes] # First and second unsigned integer
 
     # Verifing hierarchy
     hierarchy: Dict[int, List[int]] = defaultdict(list) # Map from obj_id to children obj_ids
@@ -44,57 +41,85 @@ def hierarchy_analysis(syntax_tree: SyntaxNode) -> Tuple[Tuple[str], Dict[Tuple[
     outlines_type = "/Outlines"
     metadata_type = "/Metadata"
     pending = [(root_node_ref, None, None, 0)] # Tuple with next node reference, previous node reference, parent reference and expected type for next one
+    visited = set() # Pending entries already processed (a cycle of references gives the same entries again)
     outlines_ref = None
     metadata_ref = None
-    while pending:
-        obj, prev, parent, exp_index_type = pending.pop() # FIFO
-        obj_id = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(obj).group(1)) # First unsigned integer
-        obj_gen = int(SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(obj).group(2)) # Second unsigned integer
+    while True:
+        if not pending:
+            # Objects not reached from the root
+            for id, gen in objects_refs:
+                if not (id, gen) in types.keys():
+                    pending.append((f"{id} {gen} R", None, None, None))
+            if not pending:
+                break
 
-        # Get the current object node via reference
+        obj, prev, parent, exp_index_type = pending.pop() # FIFO
+        if (obj, prev, parent, exp_index_type) in visited:
+            continue
+        visited.add((obj, prev, parent, exp_index_type))
+        obj_match = SPDF_LANGUAGE_PATTERNS["REFERENCE"].match(obj) if obj else None
+        if not obj_match:
+            hierarchy_errors.append(f"Expected a reference to an object, found \"{obj}\"")
+            continue
+        obj_id = int(obj_match.group(1)) # First unsigned integer
+        obj_gen = int(obj_match.group(2)) # Second unsigned integer
+
+        # Get the current object node via reference (missing in a partial syntax tree)
+        if not (obj_id, obj_gen) in objects_refs:
+            hierarchy_errors.append(f"Object \"{obj}\" not found")
+            continue
         index = objects_refs.index((obj_id, obj_gen))
         references = [r.string for r in collapse(object_nodes[index].find_tokens("REFERENCE"))]
-        dict_pairs = object_nodes[index].find_nodes(
-            lambda x: x.value == "STRUCT__DICT_PAIR"
-        )[0]
+        dict_pairs = syntax_tree.find("STRUCT__DICT_PAIR", object_nodes[index])
 
         # Search for the info inside the node
         type_ref = None
         subtype_ref = None
         next_ref = None
         prev_ref = None
-        for dict_pair in dict_pairs:
-            k, v = dict_pair.children[0].value, dict_pair.children[1].children[0].value
+        for pair_node in dict_pairs:
+            pair = dict_pair(pair_node)
+            if not pair:
+                continue # Partial dict pair
+            k, v = pair[0], pair[1].value
+            v = v.string if isinstance(v, Token) else None # A dict or an array otherwise
             match k.string:
                 case "/Type":
-                    type_ref = v.string
+                    type_ref = v
                 case "/Subtype":
-                    subtype_ref = v.string
+                    subtype_ref = v
                 case "/Next":
-                    next_ref = v.string
-                    references.remove(next_ref)
+                    next_ref = v
+                    if next_ref in references:
+                        references.remove(next_ref)
                 case "/Prev":
-                    prev_ref = v.string
-                    references.remove(prev_ref)
+                    prev_ref = v
+                    if prev_ref in references:
+                        references.remove(prev_ref)
                 case "/Parent":
-                    references.remove(v.string)
+                    if v in references:
+                        references.remove(v)
                 case "/Dest":
-                    refs = collapse(dict_pair.find_tokens("REFERENCE"))
+                    refs = collapse(pair_node.find_tokens("REFERENCE"))
                     for ref in refs:
-                        references.remove(ref.string)
+                        if ref.string in references:
+                            references.remove(ref.string)
                 case "/Last":
-                    references.remove(v.string)
+                    if v in references:
+                        references.remove(v)
                 case "/Outlines":
                     if not outlines_ref:
-                        outlines_ref = v.string
-                        references.remove(outlines_ref)
+                        outlines_ref = v
+                        if outlines_ref in references:
+                            references.remove(outlines_ref)
                         pending.append((outlines_ref, None, None, None))
                     else:
                         hierarchy_errors.append(f"Object {obj} tried to overwrite the outlines")
                 case "/Metadata":
                     if not metadata_ref:
-                        metadata_ref = v.string
-                        references.remove(metadata_ref)
+                        metadata_ref = v
+                        if metadata_ref in references:
+                            references.remove(metadata_ref)
                         pending.append((metadata_ref, None, None, None))
                     else:
                         hierarchy_errors.append(f"Object {obj} tried to overwrite the metadata")
@@ -135,7 +160,7 @@ def hierarchy_analysis(syntax_tree: SyntaxNode) -> Tuple[Tuple[str], Dict[Tuple[
             if not (obj_id, obj_gen) in hierarchy[(parent_id, parent_gen)]:
                 hierarchy[(parent_id, parent_gen)].append((obj_id, obj_gen))
 
-        if not exp_index_type is None:
+        if not exp_index_type is None and exp_index_type + 1 < len(expected_types):
             for reference in references:
                 pending.append((reference, None, obj, exp_index_type + 1))
         else:
@@ -143,10 +168,5 @@ def hierarchy_analysis(syntax_tree: SyntaxNode) -> Tuple[Tuple[str], Dict[Tuple[
                 pending.append((reference, None, obj, None))
 
         types[(obj_id, obj_gen)] = type_ref, subtype_ref
-        
-        if not pending:
-            for id, gen in objects_refs:
-                if not (id, gen) in types.keys():
-                    pending.append((f"{id} {gen} R", None, None, None))
 
     return hierarchy_errors, hierarchy, types, outlines_ref, metadata_ref
\ No newline at end of file
@@ -1,80 +1,165 @@
 from ... import *
 
-from ...parser.parser import *
 from ...parser.classes.token import *
+from ...parser.classes.token_store import TokenStore
 
 from ..language import *
 
 
 def lexicon_analysis(content: str) -> Tuple[Token]:
-    # Combine tokens patterns into one regex
-    tokens_regex = compile("|".join(f"(?P<{cat}>{pat.pattern})" for cat, pat in SPDF_LANGUAGE_PATTERNS.items()))
-    
-    # Split content into lines (except for stream blocks)
-    stream_blocks: List[Match[str]] = [x for x in finditer(SPDF_LANGUAGE_PATTERNS["STREAM_BLOCK"], content)] # All stream block matches in the content
-    current_block: int = 0 # Index to track which stream block is being processed
-    lines: List[List[int, str]] = [[0, ""]] # List to store lines of content
-    pos: int = 0 # Current position in the content
-    jump_lines: int = 1 # How many lines add to counter when adding new line
-    while pos < len(content):
-        # If a stream block starts at the current position, append it as is
-        if stream_blocks and current_block < len(stream_blocks) and stream_blocks[current_block].start() <= pos:
-            matched_string = content[pos:stream_blocks[current_block].end()]
-            lines[-1][1] += matched_string # Add entire stream block
-            pos = stream_blocks[current_block].end()
-            jump_lines += matched_string.count("\n")
-            current_block += 1 # Next stream block
-            continue
-
-        # Newline found
-        elif content[pos] == "\n":
-            lines.append([lines[-1][0] + jump_lines, ""])
-            pos += 1
-            jump_lines = 1
-            continue
-
-        # Otherwise, add the character to the current line
-        lines[-1][1] += content[pos]
-        pos += 1
-    
-    tokens = [] # Tokens already validated
-    
-    # Process each line
-    for i, line in lines:
-        pos = 0 # Current start match position in line (i.e. column)
-        
-        while pos < len(line):
-            # Skip whitespace
-            if line[pos].isspace():
-                pos += 1
-                continue
-                
-            # Try to match a token at current position
-            match = tokens_regex.match(line, pos)
-
-            if not match or not pos == match.start():
-                # If no match found or start position is not the same, undefined lexicon found
-                end_lexicon = line[pos:].find(" ")
-                if end_lexicon < 0:
-                    end_lexicon = len(line)
-                else:
-                    end_lexicon += pos
-                tokens.append(Token(None, line[pos:end_lexicon], i, pos))
-                pos = end_lexicon
+    return tuple(lexicon_stream(content))
+
+
+def lexicon_stream(content: str, streams: Optional[List[Tuple[int, bool]]] = None) -> Generator[Token, Any, None]:
+    # Tokens of the content generated one by one (lexed as they are consumed, e.g. while they are parsed)
+    for category, start, end, line, position in _lexicon_spans(content, _SPDF_LEXICON_PATTERNS, streams):
+        yield Token(category, content[start:end], line, position, start)
+
+
+def bytes_lexicon_analysis(content: bytes | memoryview | mmap, encoding: str = "utf-8", lazy_size: int = 64) -> Tuple[Token]:
+    return tuple(bytes_lexicon_stream(content, encoding, lazy_size))
+
+
+def bytes_lexicon_stream(
+        content: bytes | memoryview | mmap,
+        encoding: str = "utf-8",
+        lazy_size: int = 64,
+        streams: Optional[List[Tuple[int, bool]]] = None
+    ) -> Generator[Token, Any, None]:
+    # Same as lexicon_stream over the raw bytes of the document (the whole content is never decoded or copied)
+    # Tokens longer than "lazy_size" bytes (streams, comments, long strings) are decoded when accessed, the short ones right away
+    # Invalid bytes for the encoding are replaced (as in the tokens decoded when accessed and in the token store)
+    # The positions of the tokens are byte offsets from the start of their lines (as the XREF pointers)
+    for category, start, end, line, position in _lexicon_spans(content, _SPDF_LEXICON_BYTES_PATTERNS, streams):
+        yield (BufferToken(category, content, start, end, line, position, encoding) if end - start > lazy_size else
+               Token(category, str(content[start:end], encoding, "replace"), line, position, start))
+
+
+def bytes_lexicon_store(content: bytes | memoryview | mmap, encoding: str = "utf-8", streams: Optional[List[Tuple[int, bool]]] = None) -> TokenStore:
+    # Tokens of the raw bytes of the document as columns (no Token object is created until one is accessed)
+    store = TokenStore(content, (None, *SPDF_LANGUAGE), encoding)
+    append = store.append
+    for span in _lexicon_spans(content, _SPDF_LEXICON_BYTES_PATTERNS, streams):
+        append(*span)
+    return store
+
+
+# Patterns used by the lexers over text and over raw bytes (tokens, whitespace, stream block, start and end of the stream data, newline, space and the /Length name)
+_SPDF_LEXICON_PATTERNS: Tuple[Pattern[str] | str, ...] = (
+    SPDF_LANGUAGE_REGEX, SPDF_LANGUAGE_SPACES, SPDF_LANGUAGE_PATTERNS["STREAM_BLOCK"],
+    SPDF_STREAM_DATA_START, SPDF_STREAM_DATA_END, compile(r"\n"), compile(r" "), "/Length"
+)
+_SPDF_LEXICON_BYTES_PATTERNS: Tuple[Pattern[bytes] | bytes, ...] = (
+    SPDF_LANGUAGE_BYTES_REGEX, SPDF_LANGUAGE_BYTES_SPACES, SPDF_LANGUAGE_BYTES_PATTERNS["STREAM_BLOCK"],
+    SPDF_STREAM_BYTES_DATA_START, SPDF_STREAM_BYTES_DATA_END, compile(rb"\n"), compile(rb" "), b"/Length"
+)
+
+
+def _lexicon_spans(
+        content: str | bytes | memoryview | mmap,
+        patterns: Tuple[Pattern | str | bytes, ...],
+        streams: Optional[List[Tuple[int, bool]]] = None
+    ) -> Generator[Tuple[Optional[str], int, int, int, int], Any, None]:
+    # Category, start and end offsets, line and position of each token of the content (text or raw bytes, with the matching "patterns")
+    # Single pass over the content with the master pattern (the lines are never copied)
+    # A line ends at a newline out of the stream blocks (a stream block is kept in the line where it starts)
+    # The line of the tokens is the line where their line starts and their position is the offset from that start
+    # The data of a stream block is jumped over with the /Length of its object when consistent, otherwise it's scanned
+    # The line of each stream block and if its /Length was used are added to "streams"
+    tokens_regex, spaces_regex, stream_regex, data_start_regex, data_end_regex, newline_regex, space_regex, length_name = patterns
+    data_start: Optional[Match] = data_start_regex.search(content) # Start of the next stream block in the content
+    length: Optional[int] = None # /Length of the current object
+    is_length: bool = False # Last token is the /Length name
+    line_start: int = 0 # Offset of the start of the current line
+    line_number: int = 0 # Number of the current line (amount of newlines before it)
+    while line_start <= len(content):
+        # Find the end of the line (newlines inside stream blocks don't end it)
+        newline = newline_regex.search(content, line_start)
+        line_end = newline.start() if newline else len(content)
+        line_newlines = 1
+        line_blocks: List[Tuple[int, int]] = [] # Stream blocks of the line
+        while data_start and data_start.start() < line_end:
+            block = _stream_block(content, data_start, length, stream_regex, data_end_regex)
+            if not block:
+                data_start = None
+                break
+            line_blocks.append(block[:2])
+            streams.append((line_number, block[2])) if streams is not None else ...
+            length = None
+            line_newlines += len(newline_regex.findall(content, block[0], block[1]))
+            newline = newline_regex.search(content, block[1])
+            line_end = newline.start() if newline else len(content)
+            data_start = data_start_regex.search(content, block[1])
+
+        # Process the line (the patterns don't see past its end)
+        pos = line_start
+        block_index = 0
+        while pos < line_end:
+            # Stream block after the whitespace (its end is already known)
+            while block_index < len(line_blocks) and line_blocks[block_index][0] < pos:
+                block_index += 1
+            if block_index < len(line_blocks) and spaces_regex.match(content, pos, line_end).end() == line_blocks[block_index][0]:
+                start, pos = line_blocks[block_index]
+                yield "STREAM_BLOCK", start, pos, line_number, start - line_start
+                is_length = False
                 continue
 
-            # Get the matched token and its category
-            for cat in [k for k, _ in SPDF_LANGUAGE_PATTERNS.items()]:  # Respect priority order
-                token = match.group(cat)
-                if token is not None:
-                    tokens.append(Token(cat, token, i, pos))
-                    pos = match.end()
-                    break
+            # Try to match a token after the whitespace
+            match = tokens_regex.match(content, pos, line_end)
 
-    return tuple(tokens)
+            if not match:
+                # Skip whitespace
+                pos = spaces_regex.match(content, pos, line_end).end()
+                if pos >= line_end:
+                    break
 
+                # If no match found, undefined lexicon found (up to the next space)
+                space = space_regex.search(content, pos, line_end)
+                end_lexicon = space.start() if space else line_end
+                yield None, pos, end_lexicon, line_number, pos - line_start
+                pos = end_lexicon
+                is_length = False
+                continue
 
-def has_margins_analysis(tokens: Iterable[Token]) -> Tuple[bool, bool]:
+            # The matched token and its category (the only matched group)
+            category = match.lastgroup
+            start, pos = match.span(category)
+            yield category, start, pos, line_number, start - line_start
+
+            # Keep the /Length of the current object
+            if is_length and category == "LITERAL__UNSIGNED_INTEGER":
+                length = int(match.group(category))
+            elif category == "KEYWORD__OBJ" or category == "KEYWORD__ENDOBJ":
+                length = None
+            is_length = category == "NAME" and match.group(category) == length_name
+
+        line_number += line_newlines
+        line_start = line_end + 1
+
+
+def _stream_block(
+        content: str | bytes | memoryview | mmap,
+        data_start: Match,
+        length: Optional[int],
+        stream_regex: Pattern,
+        data_end_regex: Pattern
+    ) -> Optional[Tuple[int, int, bool]]:
+    # Span of the stream block starting at "data_start" and if it was found with the /Length (None when it has no end)
+    # With a consistent /Length, "endstream" is right after the data (no other byte of the data is read)
+    start = data_start.start()
+    if length is not None:
+        data_end = data_end_regex.match(content, data_start.end() + length)
+        if data_end:
+            return start, data_end.end(), True
+
+    # Otherwise scan the data for the first "endstream" (without it here, no later stream block has an end either)
+    block = stream_regex.match(content, start)
+    return (start, block.end(), False) if block else None
+
+
+def has_margins_analysis(tokens: Iterable[Token] | TokenStore) -> Tuple[bool, bool]:
+    if isinstance(tokens, TokenStore):
+        return store_margins_analysis(tokens)
     if not tokens:
         return False, False
 
@@ -100,5 +185,17 @@ def has_margins_analysis(tokens: Iterable[Token]) -> Tuple[bool, bool]:
 
     # EOF in first position in last valid line
     has_eof = last_count == 1 and tokens[-1].category == "MARGIN__EOF"
-    
-    return has_header, has_eof
\ No newline at end of file
+
+    return has_header, has_eof
+
+
+def store_margins_analysis(store: TokenStore) -> Tuple[bool, bool]:
+    # Same checks on the columns (the lines of the tokens never decrease, so the first and last lines are found by bisection)
+    if not len(store):
+        return False, False
+
+    # Header alone in the first valid line and EOF alone in the last valid line
+    has_header = bisect_right(store.lines, store.lines[0]) == 1 and store.category(0) == "MARGIN__HEADER"
+    has_eof = len(store) - bisect_left(store.lines, store.lines[-1]) == 1 and store.category(-1) == "MARGIN__EOF"
+
+    return has_header, has_eof
@@ -1,15 +1,297 @@
 from ... import *
 
-from ...parser.parser import LR1Parser
+from ...io import available_cpus, cache_directory
+from ...parser import DEFAULT_PARSER_GENERATED_VERSION
+from ...parser.classes.shifted_tokens import ShiftedTokens
 from ...parser.classes.syntax_node import SyntaxNode
 from ...parser.classes.token import Token
+from ...parser.classes.token_store import TokenStore
 
 from ..language import *
 
+from .lexical import bytes_lexicon_store
 
-def syntax_analysis(tokens: Iterable[Token]) -> SyntaxNode:
+
+# Directory of the cache of the built SPDF parser tables (shared between runs, in the user cache)
+SPDF_TABLE_CACHE_PATH: Path = cache_directory("spdf_analyser")
+
+# Default path of the generated tables module (in the user cache too, never inside the installed package)
+SPDF_SYNTAX_TABLES_PATH: Path = SPDF_TABLE_CACHE_PATH / "syntax_tables.py"
+
+# Minimum amount of tokens to parse the objects in parallel (smaller documents are parsed serially)
+# Chosen from parallel_syntax_analysis timed against the serial parsing on one core (example1 with its objects repeated 50 to 800 times):
+# the serial parsing takes ~3.4 µs per token, the parallel one adds ~1.7 µs per token (the nodes sent back and rebuilt) and ~8 ms for the pool
+# With the parsing split over p CPUs, 3 processes break even from ~14_000 tokens and 4 from ~10_000 (2 never do, see SPDF_PARALLEL_MIN_PROCESSES)
+# The threshold keeps a margin (~x1.2 with 3 and ~x1.3 with 4)
+SPDF_PARALLEL_THRESHOLD: int = 100_000
+
+# Minimum amount of processes (capped at the available CPUs) to parse the objects in parallel (with 2 the parallel parsing is never faster)
+# The parallel parsing can't recover the syntax errors (an invalid chunk raises its error), so it's only used by syntax_analysis
+# The analysis (analyse) always reports every error with recovering_syntax_analysis: the parallel parsing is library-only
+SPDF_PARALLEL_MIN_PROCESSES: int = 3
+
+# Parsers already built by start symbol (None for the whole grammar)
+_SPDF_PARSERS: Dict[Optional[str], Any] = dict()
+
+# Non-terminals of the grammar (their ids in the nodes sent by the worker processes)
+_SPDF_NONTERMINALS: Tuple[str] = tuple(dict.fromkeys(lhs for lhs, _ in SPDF_GRAMMAR))
+
+# Bits of the non-terminal id in the nodes sent by the worker processes (enough for every non-terminal of the grammar)
+_SPDF_NONTERMINAL_BITS: int = max(1, (len(_SPDF_NONTERMINALS) - 1).bit_length())
+
+# Tokens of the document parsed by a worker process (set once by the initializer of the worker)
+_SPDF_WORKER_TOKENS: Tuple[Token] | TokenStore = tuple()
+
+# Generated tables modules already loaded by path (None when missing, invalid or generated for another grammar)
+_SPDF_SYNTAX_TABLES: Dict[Path, Optional[ModuleType]] = dict()
+
+
+def load_syntax_tables(path: Path = SPDF_SYNTAX_TABLES_PATH) -> Optional[ModuleType]:
+    # Tables module generated by "python -m spdf_analyser.parser.generate" (optional, None when missing)
+    # A module that can't be loaded is reported and ignored (the tables are built at runtime)
+    if not path.is_file():
+        return None
+    try:
+        spec = spec_from_file_location("spdf_syntax_tables", path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"No module loader for \"{path}\"")
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (ImportError, SyntaxError, OSError) as error:
+        warn(f"Ignoring the generated tables module \"{path}\" ({error.__class__.__name__}: {error})", stacklevel=2)
+        return None
+    return module
+
+
+def syntax_analysis(tokens: Iterable[Token] | TokenStore, processes: int = 1, threshold: int = SPDF_PARALLEL_THRESHOLD) -> SyntaxNode:
+    # Parse the objects in parallel with enough processes (for documents with at least "threshold" tokens)
+    # The processes are capped at the CPUs available to this process (more processes than CPUs are only slower than the serial parsing)
+    # The tokens of a token store are only created as they are parsed
+    processes = min(processes, available_cpus())
+    if processes >= SPDF_PARALLEL_MIN_PROCESSES:
+        if not isinstance(tokens, TokenStore):
+            tokens = tuple(tokens)
+        if len(tokens) >= threshold:
+            return parallel_syntax_analysis(tokens, processes)
+
+    # Use the generated tables when they were generated for the current grammar
+    if (syntax_tables := _spdf_syntax_tables()) is not None:
+        return syntax_tables.parse_tokens(tokens)
+
+    # Otherwise build the tables at runtime
     # BOTTOM-UP APPROACH PARSING
     # parser = LR0Parser(SPDF_GRAMMAR)
-    parser = LR1Parser(SPDF_GRAMMAR)
+    parser = _spdf_parser()
     syntax_tree = parser.parse_tokens(tokens)
-    return syntax_tree
\ No newline at end of file
+    return syntax_tree
+
+
+def recovering_syntax_analysis(tokens: Iterable[Token]) -> Tuple[SyntaxNode, Tuple[Tuple[Token, str]]]:
+    # Parse the whole document reporting every syntax error (the invalid token and the error message)
+    # Missing delimiters are inserted, invalid tokens are discarded and an invalid object is skipped up to its "endobj"
+    # The syntax tree keeps the recovered objects (partial when the document couldn't be recovered up to its end)
+    # The nodes queried by the analysis are indexed while parsing
+    # The generated tables are used when they were generated for the current grammar (otherwise they're built at runtime)
+    spdf_parser = _spdf_syntax_tables() or _spdf_parser()
+    parser = spdf_parser.push_parser(sync_categories=SPDF_GRAMMAR_SYNC, insert_categories=SPDF_GRAMMAR_INSERT, index_values=SPDF_GRAMMAR_INDEX)
+    parser.feed_many(tokens)
+    syntax_tree = parser.finish()
+    return syntax_tree, parser.errors
+
+
+def parallel_syntax_analysis(tokens: Tuple[Token] | TokenStore, processes: int) -> SyntaxNode:
+    # The body is split into chunks of whole objects (and comments) parsed by worker processes
+    # The header, XREF and trailer are parsed by this process and the objects of the chunks are joined under its EXPRS node
+    # The categories of a token store are read from its columns
+    category = tokens.category if isinstance(tokens, TokenStore) else lambda i: tokens[i].category
+    body_end = next((i for i in range(len(tokens)) if category(i) == "KEYWORD__XREF"), None)
+    if body_end is None:
+        return _spdf_parser().parse_tokens(tokens)
+
+    # A few chunks per process (so a slower chunk doesn't hold the others)
+    chunk_size = max(1, (body_end - 1) // (processes * 4))
+    chunks: List[Tuple[int, int]] = []
+    chunk_start = 1
+    for i in range(1, body_end):
+        if category(i) in ("KEYWORD__ENDOBJ", "COMMENT") and i + 1 - chunk_start >= chunk_size:
+            chunks.append((chunk_start, i + 1))
+            chunk_start = i + 1
+    if chunk_start < body_end:
+        chunks.append((chunk_start, body_end))
+
+    # A token store over a mapped file can't be given to started workers (a mapping can't be pickled, forked workers inherit it)
+    if isinstance(tokens, TokenStore) and isinstance(tokens.buffer, mmap) and get_start_method() != "fork":
+        return _spdf_parser().parse_tokens(tokens)
+
+    # Build the tables before the workers are created (forked workers don't build them again)
+    _spdf_parser("EXPRS")
+    try:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(tokens, )) as executor:
+            chunks_codes = executor.map(_parse_chunk, chunks)
+            syntax_tree = _spdf_parser().parse_tokens((tokens[0], *tokens[body_end:]))
+            syntax_tree.children[1].children = [item for codes in chunks_codes for item in _decode_nodes(codes, tokens)]
+    except (BrokenProcessPool, PicklingError, OSError):
+        # The workers couldn't be started or given the tokens (an invalid chunk raises its error, as the serial parsing)
+        return _spdf_parser().parse_tokens(tokens)
+
+    return syntax_tree
+
+
+def _init_worker(tokens: Tuple[Token] | TokenStore) -> None:
+    global _SPDF_WORKER_TOKENS
+    _SPDF_WORKER_TOKENS = tokens
+
+
+def _parse_chunk(chunk: Tuple[int, int]) -> array:
+    # Objects (and comments) of the tokens in the chunk (encoded, sending the nodes themselves is slower than parsing them)
+    start, stop = chunk
+    chunk_tokens = _SPDF_WORKER_TOKENS[start:stop] # The same token objects for the parsing and the indexes (a token store creates new ones)
+    items = _spdf_parser("EXPRS").parse_tokens(chunk_tokens).children
+    return _encode_nodes(items, {id(token): start + i for i, token in enumerate(chunk_tokens)})
+
+
+def _encode_nodes(nodes: List[SyntaxNode], token_indexes: Dict[int, int]) -> array:
+    # Nodes in postorder as integers (index of the token or -1 - (amount of children << _SPDF_NONTERMINAL_BITS | non-terminal id))
+    nonterminal_ids = {nonterminal: i for i, nonterminal in enumerate(_SPDF_NONTERMINALS)}
+    codes = array("q")
+    pending: List[Tuple[SyntaxNode, bool]] = [(node, False) for node in nodes[::-1]]
+    while pending:
+        node, is_visited = pending.pop()
+        if isinstance(node.value, Token):
+            codes.append(token_indexes[id(node.value)])
+        elif is_visited:
+            codes.append(-1 - (len(node.children) << _SPDF_NONTERMINAL_BITS | nonterminal_ids[node.value]))
+        else:
+            pending.append((node, True))
+            pending.extend((child, False) for child in node.children[::-1])
+    return codes
+
+
+def _decode_nodes(codes: array, tokens: Tuple[Token] | TokenStore) -> List[SyntaxNode]:
+    # Nodes from the integers of _encode_nodes with the tokens of this process (the children are the last nodes built)
+    nodes: List[SyntaxNode] = []
+    for code in codes:
+        if code >= 0:
+            nodes.append(SyntaxNode(tokens[code]))
+        else:
+            code = -1 - code
+            children_start = len(nodes) - (code >> _SPDF_NONTERMINAL_BITS)
+            node = SyntaxNode(_SPDF_NONTERMINALS[code & ((1 << _SPDF_NONTERMINAL_BITS) - 1)], nodes[children_start:])
+            del nodes[children_start:]
+            nodes.append(node)
+    return nodes
+
+
+def incremental_syntax_analysis(
+        content: bytes,
+        tokens: Iterable[Token] | TokenStore | ShiftedTokens,
+        syntax_tree: SyntaxNode,
+        edit: Tuple[int, int, int],
+        encoding: str = "utf-8"
+    ) -> Tuple[Iterable[Token], SyntaxNode]:
+    # Tokens and syntax tree of the edited content (raw bytes, as in the validation) from the ones of the previous content
+    # The edit replaced the lines [first, end) of the previous content by the lines [first, new end) (lines start at 0)
+    # Only the objects (and comments) on the edited lines are lexed and parsed again, the other subtrees are reused
+    # The previous syntax tree is updated in place and the tokens are its leaves (a ShiftedTokens, given back for the next edits)
+    # The lines and offsets of the tokens after the edit are shifted in place (the tree has the positions of the edited content)
+    # The reused tokens keep the previous contents they were lexed from (their offsets are moved, not their range in those contents)
+    first_line, end_line, new_end_line = edit
+
+    # Objects and comments of the body (children of the flat EXPRS node)
+    exprs_node = syntax_tree.children[1] if syntax_tree and len(syntax_tree.children) > 2 else None
+    if not exprs_node or exprs_node.value != "EXPRS" or not tokens:
+        return _full_syntax_analysis(content, encoding)
+    if not isinstance(tokens, ShiftedTokens) or tokens.list_node is not exprs_node:
+        tokens = ShiftedTokens(syntax_tree, exprs_node)
+    items = tokens.items
+
+    # Items touching the edited lines (whole lines, so items sharing a line with them are taken too)
+    start = tokens.bisect(first_line, tokens.last_line)
+    stop = tokens.bisect(end_line, tokens.first_line)
+    region_start = min(first_line, tokens.first_line(start)) if start < len(items) else first_line
+    region_end = max(end_line, tokens.last_line(stop - 1) + 1) if start < stop else end_line
+    while start > 0 and tokens.last_line(start - 1) >= region_start:
+        start -= 1
+        region_start = min(region_start, tokens.first_line(start))
+    while stop < len(items) and tokens.first_line(stop) < region_end:
+        stop += 1
+        region_end = max(region_end, tokens.last_line(stop - 1) + 1)
+
+    # Edits out of the body (header, XREF or trailer) need the full analysis
+    header_token = syntax_tree.children[0].value
+    xref_token = syntax_tree.children[2].children[0].value
+    if region_start <= header_token.line or region_end > xref_token.line:
+        return _full_syntax_analysis(content, encoding)
+
+    # Offsets of the lines of the region from the tokens around it (the content is only scanned from the token before it to the token after it)
+    # The lines before the region are the same in both contents
+    line_shift = new_end_line - end_line
+    previous_token = tokens.last_token(start - 1) if start > 0 else header_token
+    region_offset = _line_offset(content, region_start, previous_token.line, previous_token.offset - previous_token.position)
+    region_end_offset = _line_offset(content, region_end + line_shift, region_start, region_offset)
+
+    # The next tokens keep their position in their line
+    next_token = tokens.first_token(stop) if stop < len(items) else xref_token
+    offset_shift = _line_offset(content, next_token.line + line_shift, region_end + line_shift, region_end_offset) - (next_token.offset - next_token.position)
+
+    # Lex and parse the lines of the region again (only the region is copied)
+    region_tokens = tuple(bytes_lexicon_store(content[region_offset:region_end_offset], encoding))
+    for token in region_tokens:
+        token.line += region_start
+        token.offset += region_offset
+    try:
+        region_node = _spdf_parser("EXPRS").parse_tokens(region_tokens)
+    except ValueError:
+        return _full_syntax_analysis(content, encoding)
+
+    # Replace the items of the region and shift the next items
+    # The index of the tree (if any) no longer matches it (it's built again on the next query)
+    tokens.replace(start, stop, region_node.children, line_shift, offset_shift)
+    syntax_tree.index = None
+    return tokens, syntax_tree
+
+
+def _full_syntax_analysis(content: bytes, encoding: str = "utf-8") -> Tuple[TokenStore, SyntaxNode]:
+    tokens = bytes_lexicon_store(content, encoding)
+    return tokens, syntax_analysis(tokens)
+
+
+def _spdf_syntax_tables(path: Path = SPDF_SYNTAX_TABLES_PATH) -> Optional[ModuleType]:
+    # Generated tables module when it's available and generated for the current grammar and tree shape (by the current generator)
+    # It's only loaded on the first use (importing the analysis never runs it) and a stale module is reported once
+    if not path in _SPDF_SYNTAX_TABLES:
+        module = load_syntax_tables(path)
+        if module is not None and not module.is_up_to_date(
+            SPDF_GRAMMAR, mode="LR1", flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE, version=DEFAULT_PARSER_GENERATED_VERSION
+        ):
+            warn(f"Ignoring the generated tables module \"{path}\" (generated for another grammar or generator version)", stacklevel=2)
+            module = None
+        _SPDF_SYNTAX_TABLES[path] = module
+    return _SPDF_SYNTAX_TABLES[path]
+
+
+def _spdf_parser(start_symbol: Optional[str] = None) -> Any:
+    # Parser of the SPDF grammar (or of a part of it) with the SPDF syntax tree shape
+    # The whole grammar has the same tables as the generated module (the state numbers of the errors don't depend on the tables used)
+    # A part of it is optimized (with "EXPR -> ε" a list of EXPRS never ends when it's the start symbol), its trees are the same
+    # The tables construction stack is only imported here (the analysis with an up to date generated module never imports it)
+    # Each parser is built once (the incremental analysis would spend most of its time on it)
+    if not start_symbol in _SPDF_PARSERS:
+        from ...parser.cache import TableCache
+        from ...parser.parser import LR1Parser
+
+        _SPDF_PARSERS[start_symbol] = LR1Parser(
+            SPDF_GRAMMAR, start_symbol, optimize=start_symbol is not None, cache=TableCache(SPDF_TABLE_CACHE_PATH),
+            expected_conflicts=SPDF_GRAMMAR_CONFLICTS if start_symbol is None else 0, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE
+        )
+    return _SPDF_PARSERS[start_symbol]
+
+
+def _line_offset(content: bytes, line: int, start_line: int = 0, start_offset: int = 0) -> int:
+    # Offset of the start of the line (the end of the content after the last line), counted from the start of a previous line
+    offset = start_offset
+    for _ in range(line - start_line):
+        offset = content.find(b"\n", offset) + 1
+        if not offset:
+            return len(content)
+    return offset
@@ -1,37 +1,49 @@
 from ... import *
 
-from ...io import calc_line_column
+from ...io import LineIndex
 from ...parser.classes.syntax_node import SyntaxNode
+from ...parser.classes.token import Token
 
 from ..language import SPDF_LANGUAGE_PATTERNS
 
 
-def xref_analysis(content: bytes, syntax_tree: SyntaxNode) -> Tuple[str]:
+def xref_analysis(content: bytes | mmap, syntax_tree: SyntaxNode) -> Tuple[str]:
     xref_errors: List[str] = []
 
+    # The pointers are compared to the offsets of the tokens (the lines are only indexed for the messages)
+    line_index: Optional[LineIndex] = None
+    def line_column(offset: int) -> Tuple[Optional[int], Optional[int]]:
+        nonlocal line_index
+        if line_index is None:
+            line_index = LineIndex(content)
+        return line_index.line_column(offset)
+
     # Get all necessary nodes
-    trailer_node, xref_node = syntax_tree.find_nodes(
-        lambda x: x.value == "EXPR__TRAILER",
-        lambda x: x.value == "EXPR__XREF"
-    )
+    trailer_node, xref_node = syntax_tree.find("EXPR__TRAILER"), syntax_tree.find("EXPR__XREF")
+    # Missing in a partial syntax tree
+    if not trailer_node or not xref_node:
+        return ("Failed to find the XREF table and the trailer", )
     trailer_node = trailer_node[0]
     xref_node = xref_node[0]
 
-    # Building objects
-    objects: List[Tuple[int, int]] = syntax_tree.find_tokens(
-        lambda x:  (int(x[0].line), int(x[0].position)) if "KEYWORD__OBJ" in [y.category for y in x] else tuple()
-    )[0]
+    # Offsets of the objects (in the order of the file)
+    objects: List[Optional[int]] = [node.offset for node in syntax_tree.find("EXPR__OBJ")]
 
-    # Get all tokens inside the XREF node
+    # Get all tokens inside the XREF node (partial in a partial syntax tree)
     xref_tokens = xref_node.get_all_tokens()
+    xref_categories = ("KEYWORD__XREF", "LITERAL__UNSIGNED_INTEGER", "LITERAL__UNSIGNED_INTEGER", "XREF_ELEMENT")
+    if tuple(token.category for token in xref_tokens[:4]) != xref_categories:
+        return ("Failed to read the XREF table header and its root element", )
 
-    # Get the STARTXREF pointer from TRAILER node
-    startxref_pointer = int(trailer_node.children[-1].value.string)
+    # Get the STARTXREF pointer from TRAILER node (partial in a partial syntax tree)
+    startxref_token = trailer_node.children[-1].value if trailer_node.children else None
+    if not isinstance(startxref_token, Token) or startxref_token.category != "LITERAL__UNSIGNED_INTEGER":
+        return ("Failed to read the STARTXREF pointer of the trailer", )
+    startxref_pointer = int(startxref_token.string)
 
     # Verify is STARTXREF points to XREF
-    result = calc_line_column(content, startxref_pointer)
-    if not result == (xref_tokens[0].line, xref_tokens[0].position):
-        xref_errors.append(f"STARTXREF value doesn't point to XREF, should be {result}")
+    if not startxref_pointer == xref_tokens[0].offset:
+        xref_errors.append(f"STARTXREF value doesn't point to XREF, should be {line_column(startxref_pointer)}")
 
     # Get two values after XREF and all XREF elements
     xref_gen, xref_amount = (int(xref_tokens[1].string), int(xref_tokens[2].string))
@@ -56,13 +68,14 @@ def xref_analysis(content: bytes, syntax_tree: SyntaxNode) -> Tuple[str]:
         xref_errors.append(f"XREF root element \"gen\" has a value different of 65535")
 
 
-    # Verify XREF elements pointers and gens
-    for i, xref_element in enumerate(xref_elements):
-        xref_pointer = int(SPDF_LANGUAGE_PATTERNS["XREF_ELEMENT"].match(xref_element.string).group(1))
-        # xref_gen = int(SPDF_LANGUAGE_PATTERNS["XREF_ELEMENT"].match(xref_element.string).group(2))
-
-        result = calc_line_column(content, xref_pointer)
-        if not result == objects[i]:
-            xref_errors.append(f"XREF element {i + 1} pointer doesn't point to its corresponding object, should be {result}")
+    # Verify XREF elements pointers and gens (the objects of a partial syntax tree can be less than the elements)
+    xref_pointers = [int(SPDF_LANGUAGE_PATTERNS["XREF_ELEMENT"].match(xref_element.string).group(1)) for xref_element in xref_elements]
+    for i, (xref_pointer, object_offset) in enumerate(zip(xref_pointers, objects)):
+        if not xref_pointer == object_offset:
+            xref_errors.append(f"XREF element {i + 1} pointer doesn't point to its corresponding object, should be {line_column(xref_pointer)}")
+    for i in range(len(objects), len(xref_pointers)):
+        xref_errors.append(f"XREF element {i + 1} doesn't correspond to any object in file")
+    for i in range(len(xref_pointers), len(objects)):
+        xref_errors.append(f"Object {i + 1} in file doesn't have a corresponding XREF element")
 
     return tuple(xref_errors)
\ No newline at end of file
@@ -1,5 +1,10 @@
 from . import *
 
+try:
+    from os import sched_getaffinity
+except ImportError:
+    sched_getaffinity = None # Not on every platform (e.g. Windows and macOS)
+
 ENDL = Enum("ENDL", ["CRLF", "LF", "UNKNOWN"])
 
 
@@ -18,6 +23,40 @@ def file_loader(path: Path, print_status: bool = False) -> bytes | None:
         return content
 
 
+def file_mapper(path: Path, print_status: bool = False) -> mmap | bytes | None:
+    # Try mapping file (read only, the pages are loaded by the OS when accessed instead of copying the content)
+    # An empty file can't be mapped (its content is empty bytes), the mapping is closed by the caller
+    print("Loading file...", end=" ") if print_status else ...
+    try:
+        with open(path, "rb") as file:
+            content = mmap(file.fileno(), 0, access=ACCESS_READ) if Path(path).stat().st_size else bytes()
+            file.close()
+    except:
+        print("failed.\n") if print_status else ...
+        return None
+    else:
+        print("successfully.\n") if print_status else ...
+        return content
+
+
+def cache_directory(name: str) -> Path:
+    # Directory of the user cache of the platform for an application (never inside the installed package)
+    if platform == "win32":
+        base = Path(environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / name
+
+
+def available_cpus() -> int:
+    # CPUs this process can run on (its affinity, limited e.g. by a container or taskset), all of them where the affinity isn't available
+    if sched_getaffinity is None:
+        return cpu_count() or 1
+    return len(sched_getaffinity(0))
+
+
 def file_writter(path: Path, text: str, encoding: str = "utf-8", print_status: bool = False) -> bool:
     # Try writting file
     print("Writting file...", end=" ") if print_status else ...
@@ -75,44 +114,54 @@ def config_loader(config_path: Path, encoding: str = "utf-8", print_status: bool
     return config
 
 
-def calc_line_column(content: bytes, offset: int, endl: ENDL = None) -> Tuple[int, int]:
-    if not endl:
-        endl = get_endl(content)
-
-    if offset > len(content):
-        return (None, None)
-
-    # Get the length of the end line marker
-    endl_marker, endl_size = None, None
-    match endl:
-        case ENDL.CRLF:
-            endl_marker = b"\r\n"
-            endl_size = 2
-        case ENDL.LF:
-            endl_marker = b"\n"
-            endl_size = 1
-        case _:
-            endl_marker = None
-            endl_size = 0
-
-    line, column, index = 0, 0, 0
-    
-    while index < offset - (endl_size - 1 if endl_size else 0):
-        if content[index:index + endl_size] == endl_marker:
-            line += 1
-            column = 0
-            index += endl_size
-        else:
-            column += 1
-            index += 1
-    
-    return line, column
+class LineIndex:
+    # Offsets of the start of each line of a content (built once, then each conversion is a bisect or a lookup)
+    # The lines end at the end line marker of the content (CRLF when there is any, otherwise LF)
+    __slots__ = ("size", "endl", "line_starts")
+
+    def __init__(self, content: bytes | mmap, endl: ENDL = None) -> None:
+        self.size: int = len(content)
+        self.endl: ENDL = endl or get_endl(content)
+
+        # Get the end line marker
+        match self.endl:
+            case ENDL.CRLF:
+                endl_marker = b"\r\n"
+            case ENDL.LF:
+                endl_marker = b"\n"
+            case _:
+                endl_marker = None
+
+        self.line_starts: array = array("q", (0, ))
+        if endl_marker:
+            self.line_starts.extend(match.end() for match in compile(escape(endl_marker)).finditer(content))
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+    def line_column(self, offset: int) -> Tuple[int, int]:
+        # Line and column of the offset, (None, None) when out of the content
+        if offset < 0 or offset > self.size:
+            return (None, None)
+        line = bisect_right(self.line_starts, offset) - 1
+        return line, offset - self.line_starts[line]
+
+    def offset(self, line: int, column: int) -> Optional[int]:
+        # Offset of the line and column, None when the line is out of the content
+        if line < 0 or line >= len(self.line_starts):
+            return None
+        return self.line_starts[line] + column
+
+
+def calc_line_column(content: bytes | mmap, offset: int, endl: ENDL = None) -> Tuple[int, int]:
+    # Single conversion (build a LineIndex once for many of them)
+    return LineIndex(content, endl).line_column(offset)
 
 
-def get_endl(content: bytes) -> ENDL:
-    if b"\r\n" in content:
+def get_endl(content: bytes | mmap) -> ENDL:
+    if content.find(b"\r\n") >= 0:
         return ENDL.CRLF
-    elif b"\n" in content:
+    elif content.find(b"\n") >= 0:
         return ENDL.LF
     else:
         return ENDL.UNKNOWN
\ No newline at end of file
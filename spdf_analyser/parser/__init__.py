@@ -1,4 +1,5 @@
 DEFAULT_PARSER_STRING_SEP = " "
 DEFAULT_PARSER_STRING_MARKER = "\""
 DEFAULT_PARSER_END_MARKER = "$"
-DEFAULT_PARSER_EPSILON_MARKER = "ε"
\ No newline at end of file
+DEFAULT_PARSER_EPSILON_MARKER = "ε"
+DEFAULT_PARSER_GENERATED_VERSION = 5
\ No newline at end of file
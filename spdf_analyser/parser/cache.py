@@ -0,0 +1,151 @@
+from .. import *
+
+from .classes.action_entry import ActionEntry, PARSER_ACTION
+from .classes.symbol import Symbol
+from .table.action_table import ActionTable
+from .table.automaton_table import PARSER_MODE
+from .table.rules_table import RulesTable
+
+
+DEFAULT_CACHE_MAGIC = b"SPDFLR"
+DEFAULT_CACHE_VERSION = 4
+DEFAULT_CACHE_SUFFIX = ".lrt"
+
+
+class TableCache:
+    def __init__(self, directory: Path, print_status: bool = False) -> None:
+        self._directory: Path = Path(directory)
+        self._print_status: bool = print_status
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalids: int = 0
+
+    def __str__(self) -> str:
+        return f"<directory=\"{self._directory}\", " + ", ".join(f"{k}={v}" for k, v in self.statistics.items()) + ">"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        # Loads found in the cache, loads that had to build the tables and invalid files found (counted as misses too)
+        return {"hits": self.hits, "misses": self.misses, "invalids": self.invalids}
+
+    def fingerprint(self, rules_table: RulesTable, mode: PARSER_MODE = PARSER_MODE.LR1) -> str:
+        # Hash everything that changes the built tables (rules, start symbol, markers and construction mode)
+        description = {
+            "version": DEFAULT_CACHE_VERSION,
+            "mode": mode.name,
+            "start": rules_table.start_symbol.value,
+            "end": rules_table.end_symbol.value,
+            "epsilon": rules_table.epsilon_symbol.value,
+            "rules": [
+                [rule.lhs.value, [[symbol.is_terminal(), symbol.pattern.pattern] for symbol in rule.rhs]]
+                for rule in rules_table
+            ],
+        }
+        return sha256(dumps(description, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def path(self, fingerprint: str) -> Path:
+        return self._directory / f"{fingerprint[:32]}{DEFAULT_CACHE_SUFFIX}"
+
+    def load(self, rules_table: RulesTable, action_table: ActionTable, mode: PARSER_MODE = PARSER_MODE.LR1) -> bool:
+        # Try loading the ACTION table stored for the grammar fingerprint (with the conflicts resolved when it was built and the partials of the states)
+        fingerprint = self.fingerprint(rules_table, mode)
+        path = self.path(fingerprint)
+
+        print("Loading parser tables from cache...", end=" ") if self._print_status else ...
+        if not path.exists():
+            self.misses += 1
+            print("miss.\n") if self._print_status else ...
+            return False
+
+        try:
+            entries, conflicts_entries, partials = self._decode(path.read_bytes(), fingerprint)
+            symbols = self._symbols(rules_table)
+            table = {
+                (state, symbols[symbol]): ActionEntry(PARSER_ACTION(action), None if param < 0 else param)
+                for state, symbol, action, param in entries
+            }
+            conflicts = [
+                ((state, symbols[symbol]), *(ActionEntry(PARSER_ACTION(action), None if param < 0 else param) for action, param in (current, entry)))
+                for state, symbol, current, entry in conflicts_entries
+            ]
+            partials = [(rule, length) for rule, length in partials]
+        except (OSError, ValueError, KeyError, IndexError, TypeError, ZlibError):
+            # Corrupted or stale file (it's rebuilt by the next store)
+            self.invalids += 1
+            self.misses += 1
+            print("invalid.\n") if self._print_status else ...
+            return False
+
+        action_table.from_keys()
+        action_table.table.update(table)
+        action_table.conflicts = conflicts
+        action_table.partials = partials
+
+        self.hits += 1
+        print("hit.\n") if self._print_status else ...
+        return True
+
+    def store(self, rules_table: RulesTable, action_table: ActionTable, mode: PARSER_MODE = PARSER_MODE.LR1) -> bool:
+        # Try storing the ACTION table under the grammar fingerprint
+        fingerprint = self.fingerprint(rules_table, mode)
+        indexes = {symbol: i for i, symbol in enumerate(self._symbols(rules_table))}
+
+        try:
+            entries = [
+                [state, indexes[symbol], entry.action.value, -1 if entry.param is None else entry.param]
+                for (state, symbol), entry in action_table
+            ]
+            conflicts = [
+                [state, indexes[symbol], *([entry.action.value, -1 if entry.param is None else entry.param] for entry in (current, entry))]
+                for (state, symbol), current, entry in action_table.conflicts
+            ]
+            self._directory.mkdir(parents=True, exist_ok=True)
+            partials = [list(partial) for partial in action_table.partials]
+            self.path(fingerprint).write_bytes(self._encode(entries, conflicts, partials, fingerprint))
+        except (OSError, KeyError):
+            return False
+        else:
+            return True
+
+    def clear(self) -> int:
+        # Remove every stored table (returns the amount of removed files)
+        removed = 0
+        if self._directory.exists():
+            for path in self._directory.glob(f"*{DEFAULT_CACHE_SUFFIX}"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _symbols(self, rules_table: RulesTable) -> Tuple[Symbol]:
+        # Stable symbol order used to encode the table keys
+        return (*rules_table.terminals, *rules_table.nonterminals, rules_table.aug_start_symbol)
+
+    def _encode(self, entries: List[List[int]], conflicts: List[List[Any]], partials: List[List[int]], fingerprint: str) -> bytes:
+        # Layout: MAGIC | VERSION (1 byte) | SHA256(payload) (32 bytes) | zlib(JSON payload)
+        payload = compress(dumps({"fingerprint": fingerprint, "entries": entries, "conflicts": conflicts, "partials": partials}, separators=(",", ":")).encode("ascii"))
+        return DEFAULT_CACHE_MAGIC + bytes([DEFAULT_CACHE_VERSION]) + sha256(payload).digest() + payload
+
+    def _decode(self, content: bytes, fingerprint: str) -> Tuple[List[List[int]], List[List[Any]], List[List[int]]]:
+        header_size = len(DEFAULT_CACHE_MAGIC) + 1
+        if content[:len(DEFAULT_CACHE_MAGIC)] != DEFAULT_CACHE_MAGIC:
+            raise ValueError("Invalid cache file marker")
+        if content[len(DEFAULT_CACHE_MAGIC)] != DEFAULT_CACHE_VERSION:
+            raise ValueError("Invalid cache file version")
+
+        digest, payload = content[header_size:header_size + 32], content[header_size + 32:]
+        if sha256(payload).digest() != digest:
+            raise ValueError("Corrupted cache file")
+
+        data = loads(decompress(payload).decode("ascii"))
+        if data["fingerprint"] != fingerprint:
+            raise ValueError("Cache file built for another grammar")
+
+        return data["entries"], data["conflicts"], data["partials"]
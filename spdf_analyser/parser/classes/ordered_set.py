@@ -0,0 +1,47 @@
+from ... import *
+
+
+T = TypeVar("T")
+
+
+class OrderedSet(Generic[T], MutableSet[T]):
+    __slots__ = ("_items", )
+
+    def __init__(self, iterable: Optional[Iterable[T]] = None) -> None:
+        # Dict keys keep the insertion order with O(1) membership
+        self._items: Dict[T, None] = dict.fromkeys(iterable) if iterable else dict()
+
+    def __contains__(self, object: Any) -> bool:
+        return object in self._items
+
+    def __iter__(self) -> Generator[T, Any, None]:
+        yield from self._items
+
+    def __reversed__(self) -> Generator[T, Any, None]:
+        yield from reversed(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"OrderedSet({list(self._items)})"
+
+    def add(self, object: T) -> None:
+        self._items[object] = None
+
+    def discard(self, object: T) -> None:
+        self._items.pop(object, None)
+
+    def remove(self, object: T) -> None:
+        del self._items[object]
+
+    def update(self, iterable: Iterable[T]) -> None:
+        for object in iterable:
+            self._items[object] = None
+
+    def copy(self) -> Self:
+        return OrderedSet(self._items)
+
+    # List-like names (as used by the parser tables)
+    append = add
+    extend = update
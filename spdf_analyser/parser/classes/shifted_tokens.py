@@ -0,0 +1,76 @@
+from ... import *
+
+from .syntax_node import SyntaxNode
+from .token import Token
+
+
+class ShiftedTokens:
+    # Tokens of a syntax tree whose items (the children of a flat list node, e.g. the objects of a document) are edited in place
+    # The tokens are the leaves of the tree (the ones before the items, the ones of each item and the ones after the items)
+    # After an edit, the tokens of the next items (and of the nodes after the list) are shifted to their new lines and offsets
+    # The tree is always up to date (the analyses read the positions from its tokens), only the new items are parsed
+    __slots__ = ("root", "list_node")
+
+    def __init__(self, root: SyntaxNode, list_node: SyntaxNode) -> None:
+        self.root: SyntaxNode = root
+        self.list_node: SyntaxNode = list_node # A child of the root
+
+    def __str__(self) -> str:
+        return f"<items={len(self.items)}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    @property
+    def items(self) -> List[SyntaxNode]:
+        return self.list_node.children
+
+    def __iter__(self) -> Generator[Token, Any, None]:
+        return ShiftedTokens._leaves(self.root)
+
+    def first_token(self, index: int) -> Token:
+        item = self.items[index]
+        return item.value if isinstance(item.value, Token) else item.children[0].value
+
+    def last_token(self, index: int) -> Token:
+        item = self.items[index]
+        return item.value if isinstance(item.value, Token) else item.children[-1].value
+
+    def first_line(self, index: int) -> int:
+        return self.first_token(index).line
+
+    def last_line(self, index: int) -> int:
+        return self.last_token(index).line
+
+    def bisect(self, line: int, key: Callable[[int], int]) -> int:
+        # Index of the first item whose line (first or last line as key) isn't before the line (as bisect_left)
+        low, high = 0, len(self.items)
+        while low < high:
+            middle = (low + high) // 2
+            if key(middle) < line:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def replace(self, start: int, stop: int, items: List[SyntaxNode], line_shift: int, offset_shift: int) -> None:
+        # Replace the items [start, stop) by the given ones (with their tokens at their final positions) and shift the next items
+        # Only the positions of the next tokens are updated (their items are reused as they are)
+        self.items[start:stop] = items
+        if not line_shift and not offset_shift:
+            return
+
+        next_nodes = self.items[start + len(items):] + self.root.children[self.root.children.index(self.list_node) + 1:]
+        for node in next_nodes:
+            for token in ShiftedTokens._leaves(node):
+                token.line += line_shift
+                token.offset += offset_shift
+
+    def _leaves(node: SyntaxNode) -> Generator[Token, Any, None]:
+        # Tokens of the node in the order of the document
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if isinstance(node.value, Token):
+                yield node.value
+            pending.extend(node.children[::-1])
@@ -1,29 +1,32 @@
 from ... import *
 
 from ..table.first_table import FirstTable
-from ..table.follow_table import FollowTable
 from ..table.rules_table import RulesTable
 
+from .ordered_set import OrderedSet
 from .state_item import StateItem
-from .unique_list import UniqueList
-from .unique_tuple import UniqueTuple
+from .symbol import Symbol
 
 
 class State:
-    __slots__ = ("items")
+    __slots__ = ("items", "transitions")
 
-    def __init__(self, items: Iterable[StateItem]) -> None:
-        self.items: UniqueTuple[StateItem] = UniqueTuple(items)
+    def __init__(self, items: Iterable[StateItem], transitions: Iterable[Tuple[Symbol, int]] = tuple()) -> None:
+        # Canonical set of items (unique and sorted, so the same items in any order are the same state)
+        self.items: Tuple[StateItem] = tuple(sorted(set(items)))
+        # Next state index for each symbol (pairs instead of a dict, most states have one or no transition)
+        self.transitions: Tuple[Tuple[Symbol, int]] = tuple(transitions)
 
     def __eq__(self, other: Any) -> bool:
-        return (isinstance(other, State) and 
+        return (isinstance(other, State) and
                 self.items == other.items)
 
     def __hash__(self) -> int:
         return hash(self.items)
 
     def __str__(self) -> str:
-        return f"{', '.join(map(str, self.items))}"
+        transitions = ', '.join(f"{symbol} -> {index}" for symbol, index in self.transitions)
+        return f"{', '.join(map(str, self))}{f' ({transitions})' if transitions else ''}"
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.__str__()})"
@@ -31,101 +34,73 @@ class State:
     def __iter__(self) -> Generator[StateItem, Any, None]:
         yield from self.items
 
+    def __len__(self) -> int:
+        return len(self.items)
+
     def __bool__(self) -> bool:
         return len(self.items) > 0
 
-    def closure(self, rules_table: RulesTable, first_table: FirstTable) -> None:
+    def closure(self, rules_table: RulesTable, first_table: FirstTable, with_lookaheads: bool = True) -> None:
         # Calculate the closure of the state by adding expanded production rules
         # I.e. expand the state by adding all productions of non-terminals that appear immediately after a dot
-        closure_list = list(self.items)
-
-        # Keep adding production rules based on the non-terminals in each RHS (while closure list keeps changing)
-        has_changed = True
-        while has_changed:
-            new_items: UniqueList[StateItem] = UniqueList()
-
-            # For all state items
-            for item in closure_list:
-                # Skip if dot is at end of RHS
-                if item.dot_position >= len(item.production.rhs):
-                    continue
-
-                next_symbol = item.production.rhs[item.dot_position]
-
-                # Skip if next symbol is not a non terminal
-                if not next_symbol in rules_table.nonterminals:
-                    continue
-
-                # Compute the lookaheads for the new item
-                if item.dot_position == len(item.production.rhs) - 1:
-                    # S -> ... . E, l <==> Terminals in l can follow E
-                    lookaheads = UniqueList(item.lookaheads)
-
-                elif item.production.rhs[item.dot_position + 1].is_terminal():
-                    # S -> ... . E '+', l <==> '+' can follow E
-                    lookaheads = UniqueList([item.production.rhs[item.dot_position + 1]])
-
-                elif item.production.rhs[item.dot_position + 1].is_non_terminal():
-                    # S -> ... . E F, l <==> Terminals in FIRST(F, l) can follow E
-                    lookaheads = UniqueList(first_table[item.production.rhs[item.dot_position + 1]])
-                    if not lookaheads:
-                        lookaheads.extend(item.lookaheads)
-
-                    # If lookahead has epsilon, inherit from current item
-                    elif rules_table.epsilon_symbol in lookaheads:
-                        lookaheads.remove(rules_table.epsilon_symbol)
-                        lookaheads.extend(item.lookaheads)
-
-                else:
-                    raise Exception("Non-Symbol value found")
-
-                # New item with dot position at start with each lookahead
-                for rule in rules_table[next_symbol]:
-                    new_item = StateItem(rule, 0, lookaheads)
-                    if not new_item in closure_list:
-                        new_items.append(new_item)
-            
-            # Add the new items
-            old_len = len(closure_list)
-            closure_list.extend(new_items)
-
-            # Process new items
-            for new_item in new_items:
-                # If a similar item with the same rule and the same dot but a different lookahead exists
-                has_base = list(StateItem.has_base_item(new_item, closure_list))
-                lookaheads = []
-                if has_base:
-                    while has_base:
-                        # Remove repeted
-                        i = has_base.pop()
-                        old_item = closure_list.pop(i)
-                        lookaheads.extend(old_item.lookaheads)
-
-                    # Merge lookaheads
-                    closure_list.append(
-                        StateItem(
-                            old_item.production,
-                            old_item.dot_position,
-                            UniqueList(lookaheads),
-                            old_item.transition
-                        )
-                    )
-
-            # If state hasn't changed, break the loop
-            if old_len == len(closure_list):
-                has_changed = False
-
-        self.items = UniqueTuple(closure_list)
-    
-    def goto(current_state: Self, target_symbol: str, rules_table: RulesTable, first_table: FirstTable) -> Self:
+        # Without lookaheads, the items are LR(0) items (used by the LR(0) and SLR(1) modes)
+        # Items with the same core are merged by joining their lookaheads
+        lookaheads: Dict[int, int] = defaultdict(int)
+        for item in self.items:
+            lookaheads[item.core()] |= item.lookaheads
+
+        # Revisit an item whenever its lookaheads grow (worklist)
+        pending: Deque[int] = deque(sorted(lookaheads))
+        while pending:
+            core = pending.popleft()
+            item = StateItem.from_core(core)
+            rhs = rules_table.array[item.rule].rhs
+            dot_position = item.dot_position
+
+            # Skip if dot is at end of RHS or the next symbol is not a non-terminal
+            if dot_position >= len(rhs) or not rhs[dot_position].is_non_terminal():
+                continue
+
+            # S -> ... . E beta, l <==> Terminals in FIRST(beta l) can follow E
+            new_lookaheads = 0
+            if with_lookaheads:
+                new_lookaheads, is_nullable = first_table.first_bits(rhs[dot_position + 1:], rules_table.epsilon_symbol)
+                if is_nullable:
+                    new_lookaheads |= lookaheads[core]
+
+            # New item with dot position at start for each production rule of E
+            for new_rule in rules_table.indexes(rhs[dot_position]):
+                new_core = StateItem(new_rule).core()
+                if not new_core in lookaheads or new_lookaheads & ~lookaheads[new_core]:
+                    lookaheads[new_core] |= new_lookaheads
+                    pending.append(new_core)
+
+        self.items = tuple(sorted(StateItem.from_core(core, bits) for core, bits in lookaheads.items()))
+
+    def goto(current_state: Self, target_symbol: Symbol, rules_table: RulesTable, first_table: FirstTable, with_lookaheads: bool = True) -> Self:
         # Calculates next state based on current state and the target symbol
-        # Filter items from current state based on target symbol and current dot position (it shifts dot position by 1)
-        new_state = State([
-            StateItem(item.production, item.dot_position + 1, item.lookaheads) for item in current_state
-            if item.dot_position < len(item.production.rhs) and item.production.rhs[item.dot_position] == target_symbol
-        ])
+        new_state = State.kernel(current_state, target_symbol, rules_table)
 
         # Do closure to complete state with all production rules needed
-        new_state.closure(rules_table, first_table)
+        new_state.closure(rules_table, first_table, with_lookaheads)
 
-        return new_state
\ No newline at end of file
+        return new_state
+
+    def kernel(current_state: Self, target_symbol: Symbol, rules_table: RulesTable) -> Self:
+        # Calculates the kernel (state before the closure) of the next state based on current state and the target symbol
+        # Filter items from current state based on target symbol and current dot position (it shifts dot position by 1)
+        return State(
+            StateItem(item.rule, item.dot_position + 1, item.lookaheads) for item in current_state
+            if item.next_symbol(rules_table) == target_symbol
+        )
+
+    def symbols(self, rules_table: RulesTable) -> OrderedSet[Symbol]:
+        # Symbols right after a dot (the symbols with a next state)
+        return OrderedSet(
+            symbol for symbol in map(lambda item: item.next_symbol(rules_table), self)
+            if symbol is not None and symbol != rules_table.epsilon_symbol
+        )
+
+    def core(self) -> FrozenSet[int]:
+        # The LR(0) core of the state (items without lookaheads)
+        return frozenset(item.core() for item in self.items)
\ No newline at end of file
@@ -1,42 +1,73 @@
 from ... import *
 
+from ..table.rules_table import RulesTable
+
 from .production_rule import ProductionRule
-from .symbol import Terminal
-from .transition import Transition
+from .symbol import Symbol
 
 
-class StateItem:
-    __slots__ = ("production", "dot_position", "lookaheads", "transition")
+# Bits of the item encoding: lookaheads | rule index | dot position (the core is rule index | dot position)
+STATE_ITEM_DOT_BITS = 8
+STATE_ITEM_RULE_BITS = 16
+STATE_ITEM_CORE_BITS = STATE_ITEM_DOT_BITS + STATE_ITEM_RULE_BITS
+STATE_ITEM_DOT_MASK = (1 << STATE_ITEM_DOT_BITS) - 1
+STATE_ITEM_CORE_MASK = (1 << STATE_ITEM_CORE_BITS) - 1
 
-    def __init__(self, production: ProductionRule, dot_position: int = 0, lookaheads: Iterable[Terminal] = tuple(), transition: Optional[Transition] = None) -> None:
-        self.production: ProductionRule = production
-        self.dot_position: int = dot_position
-        self.lookaheads: Tuple[Terminal] = tuple(lookaheads)
-        self.transition: Optional[Transition] = transition
 
-    def __eq__(self, other: Any) -> bool:
-        return (isinstance(other, StateItem) and 
-                self.production == other.production and 
-                self.dot_position == other.dot_position and
-                self.lookaheads == other.lookaheads and
-                self.transition == other.transition)
+class StateItem(int):
+    # The item is a single immutable integer (hashable, comparable and without any per instance attribute)
+    __slots__ = ()
 
-    def __hash__(self) -> int:
-        return hash((self.production, self.dot_position, self.lookaheads, self.transition))
+    def __new__(cls, rule: int, dot_position: int = 0, lookaheads: int = 0) -> Self:
+        if rule >> STATE_ITEM_RULE_BITS or dot_position >> STATE_ITEM_DOT_BITS:
+            raise ValueError(f"Item ({rule}, {dot_position}) out of the encoding range")
+        return int.__new__(cls, (lookaheads << STATE_ITEM_CORE_BITS) | (rule << STATE_ITEM_DOT_BITS) | dot_position)
 
     def __str__(self) -> str:
-        rhs = list(self.production.rhs)
-        rhs.insert(self.dot_position, '•') # Insert dot at the correct position
-        return f"[{self.production.lhs} -> {' '.join(map(str, rhs))}, {{{', '.join(map(str, self.lookaheads))}}}{f' ({self.transition.from_symbol} -> {self.transition.to_state})' if self.transition else ''}]"
+        return f"[{self.rule}, {self.dot_position}, {self.lookaheads:#x}]"
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.__str__()})"
 
-    def has_base_item(base: Self, iter: Iterable[Self]) -> Tuple[int]:
-        has_base = []
-        for i, item in enumerate(iter):
-            if item.production == base.production\
-                and item.dot_position == base.dot_position\
-                and item.transition == base.transition:
-                has_base.append(i)
-        return has_base
\ No newline at end of file
+    @property
+    def rule(self) -> int:
+        # Index of the production rule in the rules table
+        return (self & STATE_ITEM_CORE_MASK) >> STATE_ITEM_DOT_BITS
+
+    @property
+    def dot_position(self) -> int:
+        return self & STATE_ITEM_DOT_MASK
+
+    @property
+    def lookaheads(self) -> int:
+        # Bitmask of the lookahead terminals (bit i is the i-th terminal of the FIRST table)
+        return self >> STATE_ITEM_CORE_BITS
+
+    def core(self) -> int:
+        # The LR(0) item (without lookaheads)
+        return self & STATE_ITEM_CORE_MASK
+
+    def from_core(core: int, lookaheads: int = 0) -> Self:
+        return int.__new__(StateItem, (lookaheads << STATE_ITEM_CORE_BITS) | core)
+
+    def production(self, rules_table: RulesTable) -> ProductionRule:
+        return rules_table.array[self.rule]
+
+    def next_symbol(self, rules_table: RulesTable) -> Optional[Symbol]:
+        # Symbol right after the dot (None when the dot is at the end of the RHS)
+        rhs = rules_table.array[self.rule].rhs
+        dot_position = self.dot_position
+        return rhs[dot_position] if dot_position < len(rhs) else None
+
+    def is_complete(self, rules_table: RulesTable) -> bool:
+        # Dot at the end of the RHS (an epsilon RHS is always complete)
+        next_symbol = self.next_symbol(rules_table)
+        return next_symbol is None or next_symbol == rules_table.epsilon_symbol
+
+    def format(self, rules_table: RulesTable, terminals: Tuple[Symbol]) -> str:
+        # Readable item with the production rule and the lookaheads decoded
+        production = self.production(rules_table)
+        rhs = list(production.rhs)
+        rhs.insert(self.dot_position, '•') # Insert dot at the correct position
+        lookaheads = (str(terminal) for i, terminal in enumerate(terminals) if self.lookaheads >> i & 1)
+        return f"[{production.lhs} -> {' '.join(map(str, rhs))}, {{{', '.join(lookaheads)}}}]"
\ No newline at end of file
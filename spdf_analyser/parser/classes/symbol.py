@@ -2,15 +2,18 @@ from ... import *
 
 
 class Symbol(ABC):
+    __slots__ = ("_value", "_pattern", "_hash", "id")
+
     @abstractmethod
     def __init__(self, value: str) -> None:
         pass
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Symbol) and self.__hash__() == other.__hash__()
+        # Interned symbols are compared by identity (the value is only compared for symbols from different origins)
+        return self is other or (isinstance(other, Symbol) and self._hash == other._hash and self._value == other._value)
 
     def __hash__(self) -> int:
-        return hash(self.__str__())
+        return self._hash
 
     def __str__(self) -> str:
         return self.value
@@ -39,22 +42,32 @@ class Symbol(ABC):
 
 
 class Terminal(Symbol):
-    def __init__(self, value: str, escape_value: bool = False) -> None:
+    __slots__ = ()
+
+    def __init__(self, value: str, escape_value: bool = False, id: Optional[int] = None) -> None:
         self._value: str = value
         self._pattern: Pattern[str] = compile(value) if not escape_value else compile(escape(value))
+        self._hash: int = hash(value)
+        self.id: Optional[int] = id
 
     @Symbol.value.setter
     def value(self, value) -> None:
         self._value = value
         self._pattern = compile(value)
+        self._hash = hash(value)
 
 
 class NonTerminal(Symbol):
-    def __init__(self, value: str) -> None:
+    __slots__ = ()
+
+    def __init__(self, value: str, id: Optional[int] = None) -> None:
         self._value: str = value
         self._pattern: Pattern[str] = compile(escape(value))
+        self._hash: int = hash(value)
+        self.id: Optional[int] = id
 
     @Symbol.value.setter
     def value(self, value) -> None:
         self._value = value
-        self._pattern = compile(escape(value))
\ No newline at end of file
+        self._pattern = compile(escape(value))
+        self._hash = hash(value)
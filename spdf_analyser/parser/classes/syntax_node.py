@@ -4,6 +4,11 @@ from .token import Token
 
 
 class SyntaxNode:
+    # Values of the nodes to index and index of the nodes (a NodeIndex), only set on the root of a tree parsed with index values
+    # The index is built on the first query (see find) and has to be reset when the tree is changed
+    index_values = None
+    index = None
+
     def __init__(self, value: str | Token, children: Iterable[Self]=None) -> None:
         self.value: str | Token = value
         self.children: list[Self] = list(children or [])
@@ -17,21 +22,50 @@ class SyntaxNode:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.__str__()})"
 
+    @property
+    def offset(self) -> Optional[int]:
+        # Offset of the first token of the node in the source (None without tokens or offsets)
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if isinstance(node.value, Token):
+                return node.value.offset
+            pending.extend(node.children[::-1])
+        return None
+
+    def find(self, value: str, node: Optional[Self] = None) -> Tuple[Self]:
+        # Nodes with the value (and terminal nodes of the tokens with the category) under the node (this one by default)
+        # In the order of the document, from the index of the tree when it has one (otherwise the tree is searched)
+        node = self if node is None else node
+        if self.index is None and self.index_values is not None:
+            self.index = NodeIndex(self, self.index_values)
+        if self.index is not None:
+            nodes = self.index.nodes(value, None if node is self else node)
+            if nodes is not None:
+                return nodes
+        return node._preorder(
+            lambda x: (x.value.category if isinstance(x.value, Token) else x.value) == value
+        )
+
     def find_nodes(self, *args: Callable[[Self], bool]) -> List[List[Self]]:
+        # Nodes under this one matching each argument, in the reverse order of a breadth-first search (see find for the order of the document)
         nodes: List[List[SyntaxNode]] = list([[] for _ in range(len(args))])
-        pending = [self]
+        pending = deque([self])
         while pending:
             # Search the tree for a object
-            node = pending.pop(0)
+            node = pending.popleft()
 
             # Go through nodes and add them to pending
             for child in node.children:
                 for i, arg in enumerate(args):
                     # If child is a wanted node
                     if arg(child):
-                        nodes[i].insert(0, child)
+                        nodes[i].append(child)
                 pending.append(child)
 
+        # Reversed once (instead of inserting each node at the start)
+        for found in nodes:
+            found.reverse()
         return nodes
 
     def find_tokens(self, *args: str | Callable[[Iterable[Token]], Iterable[Token]]) -> List[List[Iterable[Token]]]:
@@ -68,4 +102,69 @@ class SyntaxNode:
         return tokens
 
     def get_all_tokens(self) -> Tuple[Token]:
-        return tuple(collapse(self.find_tokens(lambda x: x)[0]))
\ No newline at end of file
+        return tuple(collapse(self.find_tokens(lambda x: x)[0]))
+
+    def _preorder(self, arg: Callable[[Self], bool]) -> Tuple[Self]:
+        # Nodes under this one matching the argument, in the order of the document
+        nodes: List[SyntaxNode] = []
+        pending = self.children[::-1]
+        while pending:
+            node = pending.pop()
+            if arg(node):
+                nodes.append(node)
+            pending.extend(node.children[::-1]) # The first child is the next one
+        return tuple(nodes)
+
+
+class NodeIndex:
+    # Nodes of a syntax tree by value (terminal nodes by the category of their token), in the order of the document
+    # Only the nodes with the given values are indexed, each with its span in the preorder of the tree (itself and the one after its last node)
+    # Built by a single walk of the tree, the nodes under an indexed node are the ones in its span
+    __slots__ = ("values", "_spans", "_nodes", "_keys")
+
+    def __init__(self, root: SyntaxNode, values: Iterable[str]) -> None:
+        self.values: FrozenSet[str] = frozenset(values)
+        self._spans: Dict[int, Tuple[int, int]] = dict() # Span by node id
+        self._nodes: Dict[str, List[SyntaxNode]] = defaultdict(list)
+        self._keys: Dict[str, List[int]] = defaultdict(list) # Preorder position of each node
+
+        # Preorder walk (the position of a node is set when it's entered, the end of its span when it's left)
+        # An indexed node is pushed again with its position (as a pair) to be left after its children
+        values, spans, nodes, keys = self.values, self._spans, self._nodes, self._keys
+        position = 0
+        pending: List[SyntaxNode | Tuple[SyntaxNode, int]] = [root]
+        while pending:
+            node = pending.pop()
+            if node.__class__ is tuple:
+                node, start = node
+                spans[id(node)] = (start, position)
+                continue
+
+            key = node.value.category if isinstance(node.value, Token) else node.value
+            if key in values:
+                nodes[key].append(node)
+                keys[key].append(position)
+                pending.append((node, position))
+            position += 1
+            pending.extend(node.children[::-1])
+
+    def __str__(self) -> str:
+        return f"<values={len(self.values)}, nodes={len(self._spans)}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    def nodes(self, value: str, node: Optional[SyntaxNode] = None) -> Optional[Tuple[SyntaxNode]]:
+        # Indexed nodes with the value under the node (the whole tree by default)
+        # None when the value or the node isn't indexed (the tree has to be searched)
+        if not value in self.values or (node is not None and not id(node) in self._spans):
+            return None
+
+        nodes = self._nodes.get(value, [])
+        if node is None:
+            return tuple(nodes)
+
+        # The nodes under the node are the ones after it in its span
+        start, end = self._spans[id(node)]
+        keys = self._keys.get(value, [])
+        return tuple(nodes[bisect_right(keys, start):bisect_left(keys, end)])
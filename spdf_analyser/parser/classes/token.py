@@ -2,13 +2,14 @@ from ... import *
 
 
 class Token:
-    __slots__ = ("category", "string", "line", "position")
+    __slots__ = ("category", "string", "line", "position", "offset")
 
-    def __init__(self, category: str, string: str, line: int, position: int) -> None:
+    def __init__(self, category: str, string: str, line: int, position: int, offset: Optional[int] = None) -> None:
         self.category: str = category
         self.string: str = string
         self.line: str = line
         self.position: str = position
+        self.offset: Optional[int] = offset # Absolute offset in the source (None when unknown)
 
     def __eq__(self, other: Any) -> bool:
         return (isinstance(other, Token) and 
@@ -24,4 +25,41 @@ class Token:
         return f"<category={self.category}, string=\"{self.string}\", line={self.line}, position={self.position}>"
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({self.__str__()})"
\ No newline at end of file
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+
+class BufferToken(Token):
+    # Token over a range of a bytes buffer (bytes, memoryview or mmap), its string is decoded on the first access
+    # Its offset in the source can be moved (e.g. by an edit before it) without changing its range in the buffer
+    __slots__ = ("_buffer", "_start", "_end", "_encoding", "_string", "_shift")
+
+    def __init__(self, category: str, buffer: bytes | memoryview | mmap, start: int, end: int, line: int, position: int, encoding: str = "utf-8") -> None:
+        self.category: str = category
+        self._buffer: bytes | memoryview | mmap = buffer
+        self._start: int = start
+        self._end: int = end
+        self._encoding: str = encoding
+        self._string: Optional[str] = None
+        self._shift: int = 0 # From the start of the range to the offset in the source
+        self.line: int = line
+        self.position: int = position
+
+    @property
+    def string(self) -> str:
+        # Invalid bytes for the encoding are replaced (the token is still reported)
+        if self._string is None:
+            self._string = str(self._buffer[self._start:self._end], self._encoding, "replace")
+        return self._string
+
+    @property
+    def offset(self) -> int:
+        return self._start + self._shift
+
+    @offset.setter
+    def offset(self, offset: int) -> None:
+        self._shift = offset - self._start
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        # Byte offsets of the token in the buffer
+        return self._start, self._end
\ No newline at end of file
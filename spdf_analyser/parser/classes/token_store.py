@@ -0,0 +1,80 @@
+from ... import *
+
+from .token import BufferToken, Token
+
+
+class TokenStore:
+    # Tokens of a buffer as parallel arrays (category id, start and end offsets, line and position)
+    # A Token (with its string decoded on access) is only created when a token is accessed (the parser reads the category ids)
+    __slots__ = ("buffer", "encoding", "categories", "category_ids", "starts", "ends", "lines", "positions", "_category_indexes")
+
+    def __init__(self, buffer: bytes | memoryview | mmap, categories: Iterable[Optional[str]], encoding: str = "utf-8") -> None:
+        self.buffer: bytes | memoryview | mmap = buffer
+        self.encoding: str = encoding
+
+        # Categories by id (at most 256)
+        self.categories: Tuple[Optional[str]] = tuple(categories)
+        if len(self.categories) > 256:
+            raise ValueError("Too many categories for a token store")
+        self._category_indexes: Dict[Optional[str], int] = {category: i for i, category in enumerate(self.categories)}
+
+        self.category_ids: array = array("B")
+        self.starts: array = array("q")
+        self.ends: array = array("q")
+        self.lines: array = array("i")
+        self.positions: array = array("i")
+
+    def __str__(self) -> str:
+        return f"<tokens={len(self)}, bytes={self.nbytes()}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    def __len__(self) -> int:
+        return len(self.category_ids)
+
+    def __getitem__(self, index: int | slice) -> Token | Tuple[Token]:
+        if isinstance(index, slice):
+            return tuple(self.token(i) for i in range(*index.indices(len(self))))
+        return self.token(index)
+
+    def __iter__(self) -> Generator[Token, Any, None]:
+        for i in range(len(self)):
+            yield self.token(i)
+
+    def append(self, category: Optional[str], start: int, end: int, line: int, position: int) -> None:
+        self.category_ids.append(self._category_indexes[category])
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.positions.append(position)
+
+    def token(self, index: int) -> Token:
+        return BufferToken(
+            self.categories[self.category_ids[index]], self.buffer, self.starts[index], self.ends[index],
+            self.lines[index], self.positions[index], self.encoding
+        )
+
+    def category(self, index: int) -> Optional[str]:
+        return self.categories[self.category_ids[index]]
+
+    def string(self, index: int) -> str:
+        return str(self.buffer[self.starts[index]:self.ends[index]], self.encoding, "replace")
+
+    def indexes(self, category: Optional[str]) -> Generator[int, Any, None]:
+        # Indexes of the tokens of a category (in order)
+        if not category in self._category_indexes:
+            return
+        category_id = self._category_indexes[category]
+        category_ids = self.category_ids
+        index = -1
+        while True:
+            try:
+                index = category_ids.index(category_id, index + 1)
+            except ValueError:
+                return
+            yield index
+
+    def nbytes(self) -> int:
+        # Memory of the columns (the buffer excluded)
+        return sum(column.itemsize * len(column) for column in (self.category_ids, self.starts, self.ends, self.lines, self.positions))
\ No newline at end of file
@@ -0,0 +1,146 @@
+from .. import *
+
+from . import DEFAULT_PARSER_END_MARKER, DEFAULT_PARSER_GENERATED_VERSION, DEFAULT_PARSER_STRING_MARKER, DEFAULT_PARSER_STRING_SEP
+from .classes.syntax_node import SyntaxNode
+from .handlers import flat_node
+from .parser import LR1Parser
+from .push_parser import PushParser
+from .table.automaton_table import PARSER_MODE
+from .table.compiled_table import CompiledTable
+
+
+# Functions of the generated module, the push parser over its tables (the driver loop is the one of PushParser)
+GENERATED_DRIVER = '''
+
+# Tables of the module for the push parser (same as the compiled table of LR1Parser)
+COMPILED_TABLE = CompiledTable.from_literals(NONTERMINALS, RULES_LHS, RULES_LENGTH, PARTIAL_RULES, PARTIAL_LENGTHS, GOTOS, DISPATCH, FALLBACKS)
+
+
+def is_up_to_date(
+        productions_rules,
+        start_symbol=None,
+        string_sep=STRING_SEP,
+        string_marker=STRING_MARKER,
+        end_marker=END_MARKER,
+        mode=MODE,
+        flatten=(),
+        elide=(),
+        version=VERSION
+    ):
+    # Tables generated by the same generator version for the same grammar and options
+    return (version == VERSION and
+            mode == MODE and
+            start_symbol == START_SYMBOL and
+            (string_sep, string_marker, end_marker) == (STRING_SEP, STRING_MARKER, END_MARKER) and
+            (tuple(flatten), tuple(elide)) == (FLATTEN, ELIDE) and
+            tuple(map(tuple, productions_rules)) == GRAMMAR)
+
+
+def push_parser(sync_categories=None, insert_categories=(), index_values=None):
+    # Same as LR1Parser.push_parser with the tree handlers (errors recovered with synchronization tokens, nodes indexed with index values)
+    return PushParser(COMPILED_TABLE, END_MARKER, REDUCE_HANDLERS, SyntaxNode, sync_categories, insert_categories, SyntaxNode, index_values)
+
+
+def parse_tokens(tokens):
+    # Same as LR1Parser.parse_tokens with the tree handlers (the same driver loop, the first invalid symbol raises an error)
+    parser = push_parser()
+    parser.feed_many(tokens)
+    return parser.finish()'''
+
+
+def generate_module(
+        productions_rules: Iterable[Tuple[str, str]],
+        start_symbol: Optional[str] = None,
+        string_sep: str = DEFAULT_PARSER_STRING_SEP,
+        string_marker: str = DEFAULT_PARSER_STRING_MARKER,
+        end_marker: str = DEFAULT_PARSER_END_MARKER,
+        mode: PARSER_MODE = PARSER_MODE.LR1,
+        flatten: Iterable[str] = tuple(),
+        elide: Iterable[str] = tuple(),
+        expected_conflicts: int = 0
+    ) -> str:
+    # Source of a module with the compiled tables as literals (parsed by PushParser, the tables construction stack isn't imported)
+    # The driver loop isn't copied into it: the module imports the push parser (with its error recovery and node index) and SyntaxNode
+    # from the package, so its syntax trees are the ones the analysis reads
+    productions_rules = tuple(map(tuple, productions_rules))
+    flatten, elide = tuple(flatten), tuple(elide)
+    parser = LR1Parser(productions_rules, start_symbol, string_sep, string_marker, end_marker, mode, expected_conflicts=expected_conflicts, flatten=flatten, elide=elide)
+    table = parser.compiled_table
+
+    # Tree handler of each production rule (referenced by name in the module)
+    handlers = parser.rules_handlers(dict())
+
+    lines = [
+        f"# Generated by \"python -m {__spec__.name}\" (do not edit)",
+        f"# States: {table.states_count}, terminals: {len(table.terminals)}, non-terminals: {len(table.nonterminals)}",
+        f"# Requires the {__package__.split('.')[0]} package (its push parser, syntax node and tree handlers)",
+        f"from re import compile",
+        f"",
+        f"from {SyntaxNode.__module__} import SyntaxNode",
+        f"from {flat_node.__module__} import elided_node, flat_node",
+        f"from {PushParser.__module__} import PushParser",
+        f"from {CompiledTable.__module__} import CompiledTable",
+        f"",
+        f"",
+        f"VERSION = {DEFAULT_PARSER_GENERATED_VERSION!r}",
+        f"MODE = {mode.name!r}",
+        f"START_SYMBOL = {start_symbol!r}",
+        f"STRING_SEP = {string_sep!r}",
+        f"STRING_MARKER = {string_marker!r}",
+        f"END_MARKER = {end_marker!r}",
+        f"GRAMMAR = {productions_rules!r}",
+        f"FLATTEN = {flatten!r}",
+        f"ELIDE = {elide!r}",
+        f"",
+        f"NONTERMINALS = {tuple(nonterminal.value for nonterminal in table.nonterminals)!r}",
+        f"RULES_LHS = {tuple(table.rules_lhs)!r}",
+        f"RULES_LENGTH = {tuple(table.rules_length)!r}",
+        f"PARTIAL_RULES = {tuple(table.partial_rules)!r}",
+        f"PARTIAL_LENGTHS = {tuple(table.partial_lengths)!r}",
+        f"GOTOS = {tuple(table.gotos)!r}",
+        f"REDUCE_HANDLERS = ({''.join(f'{handler.__name__}, ' for handler in handlers)})",
+        f"DISPATCH = (",
+        *(f"    {dispatch!r}," for dispatch in table.dispatch),
+        f")",
+        f"FALLBACKS = (",
+        *(f"    ({''.join(f'(compile({pattern.pattern!r}), {entry!r}), ' for pattern, entry in fallback)}),"  for fallback in table.fallbacks),
+        f")",
+    ]
+    return "\n".join(lines) + GENERATED_DRIVER
+
+
+def write_module(
+        path: Path,
+        productions_rules: Iterable[Tuple[str, str]],
+        start_symbol: Optional[str] = None,
+        mode: PARSER_MODE = PARSER_MODE.LR1,
+        flatten: Iterable[str] = tuple(),
+        elide: Iterable[str] = tuple(),
+        expected_conflicts: int = 0,
+        print_status: bool = False
+    ) -> None:
+    print(f"Generating parser tables module \"{path}\"...", end=" ") if print_status else ...
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(generate_module(productions_rules, start_symbol, mode=mode, flatten=flatten, elide=elide, expected_conflicts=expected_conflicts), encoding="utf-8")
+    print("done.\n") if print_status else ...
+
+
+if __name__ == "__main__":
+    from sys import argv
+
+    from ..analysis.language import SPDF_GRAMMAR, SPDF_GRAMMAR_ELIDE, SPDF_GRAMMAR_FLATTEN, SPDF_GRAMMAR_MODES_CONFLICTS
+    from ..analysis.validation.syntax import SPDF_SYNTAX_TABLES_PATH
+
+    # python -m spdf_analyser.parser.generate [<output_filepath>] [<mode>]
+    # By default the module is written in the user cache, where the analysis loads it from
+    path = Path(argv[1]) if len(argv) > 1 else SPDF_SYNTAX_TABLES_PATH
+    if len(argv) > 2 and not argv[2] in PARSER_MODE.__members__:
+        print(f"Invalid mode given (\"{argv[2]}\"). Try one of {', '.join(PARSER_MODE.__members__)}")
+        exit()
+    mode = PARSER_MODE[argv[2]] if len(argv) > 2 else PARSER_MODE.LR1
+
+    # Each mode resolves its own amount of conflicts of the grammar (another amount is reported)
+    write_module(
+        path, SPDF_GRAMMAR, mode=mode, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE,
+        expected_conflicts=SPDF_GRAMMAR_MODES_CONFLICTS[mode.name], print_status=True
+    )
\ No newline at end of file
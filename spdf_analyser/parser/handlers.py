@@ -0,0 +1,36 @@
+from .. import *
+
+from .classes.syntax_node import SyntaxNode
+from .classes.token import Token
+
+
+# Semantic actions: the value of a shifted token and the value of a reduced LHS from the values of its RHS
+# The SyntaxNode class works as both handlers (it builds the syntax tree)
+ReduceHandler = Callable[[str, List[Any]], Any]
+ShiftHandler = Callable[[Token], Any]
+
+
+def discard_values(lhs: str, values: List[Any]) -> None:
+    # Reduce handler that keeps no value (for tree-free parsing)
+    return None
+
+
+def keep_token(token: Token) -> Token:
+    # Shift handler that keeps the token itself as its value
+    return token
+
+
+def flat_node(lhs: str, values: List[Any]) -> SyntaxNode:
+    # Reduce handler of a left-recursive list (the elements are appended to the node of the list itself)
+    # Empty elements (non-terminals that derived nothing) are not kept
+    if values and isinstance(values[0], SyntaxNode) and values[0].value == lhs:
+        node, values = values[0], values[1:]
+    else:
+        node = SyntaxNode(lhs)
+    node.children.extend(value for value in values if isinstance(value.value, Token) or value.children)
+    return node
+
+
+def elided_node(lhs: str, values: List[Any]) -> SyntaxNode:
+    # Reduce handler of a pass-through non-terminal (a single child takes the place of the node)
+    return values[0] if len(values) == 1 else SyntaxNode(lhs, values)
\ No newline at end of file
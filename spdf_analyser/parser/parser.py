@@ -1,11 +1,16 @@
 from .. import *
 
 from . import DEFAULT_PARSER_END_MARKER, DEFAULT_PARSER_STRING_SEP, DEFAULT_PARSER_STRING_MARKER
+from .cache import TableCache
 from .classes.action_entry import PARSER_ACTION
+from .classes.symbol import NonTerminal
 from .classes.syntax_node import SyntaxNode
 from .classes.token import Token
-from .table.automaton_table import AutomatonTable
+from .handlers import ReduceHandler, ShiftHandler, elided_node, flat_node
+from .push_parser import PushParser
+from .table.automaton_table import AutomatonTable, PARSER_MODE
 from .table.action_table import ActionTable
+from .table.compiled_table import COMPILED_ACCEPT, COMPILED_ACTION_BITS, COMPILED_ACTION_MASK, COMPILED_REDUCE, COMPILED_SHIFT, CompiledTable
 from .table.first_table import FirstTable
 from .table.follow_table import FollowTable
 from .table.rules_table import RulesTable
@@ -18,18 +23,56 @@ class LR1Parser:
             start_symbol: Optional[str] = None,
             string_sep: str = DEFAULT_PARSER_STRING_SEP,
             string_marker: str = DEFAULT_PARSER_STRING_MARKER,
-            end_marker: str = DEFAULT_PARSER_END_MARKER
+            end_marker: str = DEFAULT_PARSER_END_MARKER,
+            mode: PARSER_MODE = PARSER_MODE.LR1,
+            optimize: bool = False,
+            cache: Optional[TableCache] = None,
+            expected_conflicts: int = 0,
+            strict: bool = False,
+            flatten: Iterable[str] = tuple(),
+            elide: Iterable[str] = tuple(),
+            reduce_handlers: Optional[Dict[str | Tuple[str, str], ReduceHandler]] = None,
+            default_reduce_handler: ReduceHandler = SyntaxNode,
+            shift_handler: ShiftHandler = SyntaxNode
         ) -> None:
         self.apply(
             productions_rules=productions_rules,
             start_symbol=start_symbol,
             string_sep=string_sep,
             string_marker=string_marker,
-            end_marker=end_marker
+            end_marker=end_marker,
+            mode=mode,
+            optimize=optimize,
+            cache=cache,
+            expected_conflicts=expected_conflicts,
+            strict=strict,
+            flatten=flatten,
+            elide=elide,
+            reduce_handlers=reduce_handlers,
+            default_reduce_handler=default_reduce_handler,
+            shift_handler=shift_handler
         )
 
     # --GETTERS------
+    @property
+    def mode(self) -> PARSER_MODE:
+        return self._mode
 
+    @property
+    def cache(self) -> Optional[TableCache]:
+        return self._cache
+
+    @property
+    def automaton_table(self) -> AutomatonTable:
+        return self._automaton_table
+
+    @property
+    def action_table(self) -> ActionTable:
+        return self._action_table
+
+    @property
+    def compiled_table(self) -> CompiledTable:
+        return self._compiled_table
     # ---------------
 
     # --SETTERS------
@@ -42,22 +85,56 @@ class LR1Parser:
             start_symbol: Optional[str] = None,
             string_sep: str = DEFAULT_PARSER_STRING_SEP,
             string_marker: str = DEFAULT_PARSER_STRING_MARKER,
-            end_marker: str = DEFAULT_PARSER_END_MARKER
+            end_marker: str = DEFAULT_PARSER_END_MARKER,
+            mode: PARSER_MODE = PARSER_MODE.LR1,
+            optimize: bool = False,
+            cache: Optional[TableCache] = None,
+            expected_conflicts: int = 0,
+            strict: bool = False,
+            flatten: Iterable[str] = tuple(),
+            elide: Iterable[str] = tuple(),
+            reduce_handlers: Optional[Dict[str | Tuple[str, str], ReduceHandler]] = None,
+            default_reduce_handler: ReduceHandler = SyntaxNode,
+            shift_handler: ShiftHandler = SyntaxNode
         ) -> None:
         self._string_sep: str = string_sep
+        self._mode: PARSER_MODE = mode
+        self._cache: Optional[TableCache] = cache
+
+        # Semantic actions used by default (by LHS or by declared production rule)
+        self._reduce_handlers: Dict[str | Tuple[str, str], ReduceHandler] = dict(reduce_handlers or dict())
+        self._default_reduce_handler: ReduceHandler = default_reduce_handler
+        self._shift_handler: ShiftHandler = shift_handler
 
         self._rules_table: RulesTable = RulesTable(start_symbol, end_marker)
         self._first_table: FirstTable = FirstTable()
         self._follow_table: FollowTable = FollowTable()
         self._automaton_table: AutomatonTable = AutomatonTable()
         self._action_table: ActionTable = ActionTable()
+        self._compiled_table: CompiledTable = CompiledTable()
 
         # Build production rules table
-        self._rules_table.build(productions_rules, string_sep, string_marker)
+        self._rules_table.build(productions_rules, string_sep, string_marker, optimize)
         # print("PRODUCTION RULES", self._rules_table.array)
 
+        # Annotate the syntax tree shape (it doesn't change the parser tables)
+        self._rules_table.annotate(flatten, elide)
+
+        # Load parser tables from cache (skips the tables construction)
+        if self._cache and self._cache.load(self._rules_table, self._action_table, self._mode):
+            self._check_conflicts(expected_conflicts, strict)
+            self._compiled_table.build(self._rules_table, self._action_table)
+            return
+
         # Build parser tables
         self.build()
+
+        # Check the conflicts resolved while building them (before they're stored)
+        self._check_conflicts(expected_conflicts, strict)
+
+        # Store parser tables for the next runs
+        if self._cache:
+            self._cache.store(self._rules_table, self._action_table, self._mode)
     
     def build(self) -> None:
         # Build all tables
@@ -71,7 +148,7 @@ class LR1Parser:
         # print("FOLLOW TABLE", self._follow_table)
 
         # Build AUTOMATON STATES
-        self._automaton_table.build(self._rules_table, self._first_table, self._follow_table)
+        self._automaton_table.build(self._rules_table, self._first_table, self._follow_table, self._mode)
         # print("STATES")
         # for i, state in enumerate(self._automaton_table):
         #     print(f"\t {i} {state}")
@@ -82,156 +159,155 @@ class LR1Parser:
         # for (i, symbol), entry in self._action_table:
         #     print(f"({i}, {symbol}) {entry.action} {entry.param}")
 
+        # Build COMPILED TABLE (integer ACTION and GOTO arrays used while parsing)
+        self._compiled_table.build(self._rules_table, self._action_table)
+
     def parse_string(self, string: str, string_sep: Optional[str] = None) -> bool:
+        table = self._compiled_table
+        dispatch, gotos = table.dispatch, table.gotos
+        nonterminals_count = len(table.nonterminals)
+
         stack = [0] # Initial stack with states index
         string_symbols = string.split(string_sep) + [self._rules_table.end_symbol.value] # Add end marker
         pos = 0
+        cycle_states = set() # Stacks reduced for the current symbol (a symbol never shifted by a cycle of reductions is rejected)
 
         while True:
             state_index = stack[-1] # Last state index
             string_symbol = string_symbols[pos] # Current symbol
 
-            # Verify match with any state index and symbol
-            symbol = None
-            for (current_index, current_symbol), _ in self._action_table:
-                if state_index == current_index and current_symbol.pattern.fullmatch(string_symbol):
-                    symbol = current_symbol
-                    break
-
-            # Identify invalid symbol
-            if symbol is None:
-                return False
-
-            # Map the current state and symbol
-            entry = self._action_table[(state_index, symbol)]
-
-            match entry.action:
-                case PARSER_ACTION.SHIFT:
-                    # Push the new state
-                    stack.append(entry.param)
-                    pos += 1
-
-                case PARSER_ACTION.GOTO:
+            # Map the current state and symbol (literal terminals first, then regex terminals)
+            entry = dispatch[state_index].get(string_symbol)
+            if entry is None:
+                entry = table.fallback(state_index, string_symbol)
+            action, param = entry & COMPILED_ACTION_MASK, entry >> COMPILED_ACTION_BITS
+
+            if action == COMPILED_SHIFT:
+                # Push the new state
+                stack.append(param)
+                pos += 1
+                cycle_states.clear()
+
+            elif action == COMPILED_REDUCE:
+                # The same stack again for the symbol (see PushParser.feed_many)
+                if tuple(stack) in cycle_states:
                     return False
+                cycle_states.add(tuple(stack))
 
-                case PARSER_ACTION.REDUCE:
-                    # Get the production rule
-                    rule = self._rules_table.array[entry.param]
+                # Reduce by the RHS elements (epsilon elements are not counted)
+                rhs_length = table.rules_length[param]
+                if rhs_length > 0:
+                    # Remove the length of RHS from the stack
+                    del stack[-rhs_length:]
 
-                    # Reduce by the RHS elements
-                    rhs_length = len(rule.rhs) - rule.rhs.count(self._rules_table.epsilon_symbol) # Ignore epsilon elements (consider size as null)
-                    if rhs_length > 0:
-                        # Remove the length of RHS from the stack
-                        del stack[-rhs_length:]
+                if not stack:
+                    return False
 
-                    if not stack:
-                        return False
+                # Get next state
+                goto_state = gotos[stack[-1] * nonterminals_count + table.rules_lhs[param]]
 
-                    if not (stack[-1], rule.lhs) in self._action_table.table.keys():
-                        return False
+                # No next state found
+                if not goto_state:
+                    return False
 
-                    # Get next state
-                    goto_entry = self._action_table[(stack[-1], rule.lhs)]
+                # Push the new state
+                stack.append(goto_state)
 
-                    # No next state found
-                    if goto_entry.action != PARSER_ACTION.GOTO or not goto_entry.param:
-                        return False
-                    
-                    # Push the new state
-                    stack.append(goto_entry.param)
+            elif action == COMPILED_ACCEPT:
+                # Sentence accepted
+                return True
 
-                case PARSER_ACTION.ACCEPT:
-                    # Sentence accepted
-                    return True
+            else:
+                # No action for the state and symbol
+                return False
 
-                case PARSER_ACTION.ERROR:
-                    # TODO
-                    ...
+    def parse_tokens(
+            self,
+            tokens: Iterable[Token],
+            reduce_handlers: Optional[Dict[str | Tuple[str, str], ReduceHandler]] = None,
+            default_reduce_handler: Optional[ReduceHandler] = None,
+            shift_handler: Optional[ShiftHandler] = None,
+            index_values: Optional[Iterable[str]] = None
+        ) -> Any:
+        # Tokens are pushed as they are produced (only the LR stack is kept)
+        # Returns the value for START (the root of the syntax tree with the default handlers)
+        # With index values, the syntax tree is indexed by these values on its first query (see SyntaxNode.find)
+        push_parser = self.push_parser(reduce_handlers, default_reduce_handler, shift_handler, index_values=index_values)
+        push_parser.feed_many(tokens)
+        return push_parser.finish()
+
+    def push_parser(
+            self,
+            reduce_handlers: Optional[Dict[str | Tuple[str, str], ReduceHandler]] = None,
+            default_reduce_handler: Optional[ReduceHandler] = None,
+            shift_handler: Optional[ShiftHandler] = None,
+            sync_categories: Optional[Dict[str, Optional[str]]] = None,
+            insert_categories: Iterable[str] = tuple(),
+            index_values: Optional[Iterable[str]] = None
+        ) -> PushParser:
+        # New incremental parser over the tables (feed the tokens, then finish)
+        # The given handlers replace the ones of the parser
+        # With synchronization tokens, the errors are recovered (see PushParser.errors) instead of raised
+        return PushParser(
+            self._compiled_table,
+            self._rules_table.end_symbol.value,
+            self.rules_handlers(
+                self._reduce_handlers if reduce_handlers is None else reduce_handlers,
+                default_reduce_handler or self._default_reduce_handler
+            ),
+            shift_handler or self._shift_handler,
+            sync_categories,
+            insert_categories,
+            default_reduce_handler or self._default_reduce_handler,
+            index_values
+        )
 
-                case PARSER_ACTION.CONFLICT:
-                    # TODO
-                    ...
+    def rules_handlers(self, reduce_handlers: Dict[str | Tuple[str, str], ReduceHandler], default_reduce_handler: ReduceHandler = SyntaxNode) -> Tuple[ReduceHandler]:
+        # Reduce handler of each declared production rule (the declared rule first, then its LHS, then the default handler)
+        declared_handlers = tuple(
+            reduce_handlers.get(source, reduce_handlers.get(source[0], self.tree_handler(rule.lhs, default_reduce_handler))) if source else default_reduce_handler
+            for rule, source in zip(self._rules_table.declared_array, self._rules_table.sources)
+        )
 
-    def parse_tokens(self, tokens: Iterable[Token]) -> SyntaxNode:
-        stack = [(0, None)] # Initial stack with states index
-        tokens = (*tokens, Token(self._rules_table.end_symbol.value, self._rules_table.end_symbol.value, None, None)) # Add end marker
-        pos = 0
+        # Reduce handler of each production rule (the handlers of the declared rules are chained for the removed unit rules)
+        return tuple(
+            declared_handlers[origin[0]] if len(origin) == 1 else LR1Parser._chain_handlers(
+                tuple(declared_handlers[i] for i in origin),
+                tuple(self._rules_table.declared_array[i].lhs.value for i in origin)
+            )
+            for origin in self._rules_table.origins
+        )
 
-        while True:
-            state_index = stack[-1][0] # Last state index
-            token = tokens[pos] # Current symbol
-
-            # Verify match with any state index and symbol
-            symbol = None
-            for (current_index, current_symbol), _ in self._action_table:
-                if state_index == current_index and current_symbol.pattern.fullmatch(token.category):
-                    symbol = current_symbol
-                    break
-
-            # Identify invalid symbol
-            if symbol is None:
-                raise ValueError(f"Invalid symbol \"{token.category}\" at state {state_index}")
-
-            # Map the current state and symbol
-            entry = self._action_table[(state_index, symbol)]
-
-            match entry.action:
-                case PARSER_ACTION.SHIFT:
-                    # Create a terminal node and push it with the new state
-                    node = SyntaxNode(token)
-                    stack.append((entry.param, node))
-                    pos += 1
-
-                case PARSER_ACTION.GOTO:
-                    raise ValueError("Unexpected GOTO on token input")
-
-                case PARSER_ACTION.REDUCE:
-                    # Get the production rule
-                    rule = self._rules_table.array[entry.param]
-
-                    # Reduce by the RHS elements
-                    rhs_length = len(rule.rhs) - rule.rhs.count(self._rules_table.epsilon_symbol) # Ignore epsilon elements (consider size as null)
-                    if rhs_length > 0:
-                        # Remove the length of RHS from the stack
-                        # del stack[-rhs_length:]
-                        rhs_nodes = [stack.pop()[1] for _ in range(rhs_length)]
-                        rhs_nodes.reverse() # Preserve order (left-to-right)
-                    else:
-                        rhs_nodes = []  # Epsilon production
-
-                    # Create a new node for the LHS non-terminal
-                    new_node = SyntaxNode(rule.lhs.value, children=rhs_nodes)
-
-                    if not stack:
-                        raise ValueError(f"Empty stack after REDUCE")
-
-                    if not (stack[-1][0], rule.lhs) in self._action_table.table.keys():
-                        raise ValueError(f"Invalid pair (\"{stack[-1][0]}\", \"{rule.lhs}\") in ACTION table")
-
-                    # Get next state
-                    goto_entry = self._action_table[(stack[-1][0], rule.lhs)]
-
-                    # No next state found
-                    if goto_entry.action != PARSER_ACTION.GOTO or not goto_entry.param:
-                        raise ValueError(f"Invalid GOTO state for \"{rule.lhs}\"")
-                    
-                    # Push the new state and node
-                    stack.append((goto_entry.param, new_node))
-
-                case PARSER_ACTION.ACCEPT:
-                    # Sentence accepted
-                    if len(stack) < 2:
-                        raise ValueError("Stack too small on ACCEPT")
-                    root_node = stack[-1][1]  # The node for START
-                    return root_node
-
-                case PARSER_ACTION.ERROR:
-                    # TODO
-                    ...
-
-                case PARSER_ACTION.CONFLICT:
-                    # TODO
-                    ...
+    def _check_conflicts(self, expected_conflicts: int, strict: bool) -> None:
+        # The conflicts are resolved (SHIFT over REDUCE, the first rule between REDUCEs) which can change the language of the grammar
+        # E.g. a weaker construction mode than the grammar needs, so any amount of conflicts other than the expected one is reported
+        conflicts = self._action_table.conflicts
+        if len(conflicts) == expected_conflicts:
+            return
+
+        message = f"{len(conflicts)} conflicts resolved in the {self._mode.name} tables, expected {expected_conflicts} ({self._action_table.describe_conflicts()})"
+        if strict:
+            raise ValueError(message)
+        warn(message, stacklevel=4) # Where the parser is created
+
+    def _chain_handlers(handlers: Tuple[ReduceHandler], lhs_values: Tuple[str]) -> ReduceHandler:
+        def chained_handler(lhs: str, values: List[Any]) -> Any:
+            # Reduce by the innermost declared rule, then by each unit rule around it (same values as the declared grammar)
+            value = handlers[-1](lhs_values[-1], values)
+            for handler, lhs_value in zip(handlers[-2::-1], lhs_values[-2::-1]):
+                value = handler(lhs_value, [value])
+            return value
+
+        return chained_handler
+
+    def tree_handler(self, lhs: NonTerminal, default_reduce_handler: ReduceHandler = SyntaxNode) -> ReduceHandler:
+        # The annotations of the rules table only change how the syntax tree is built (other default handlers are kept)
+        if default_reduce_handler is SyntaxNode:
+            if lhs in self._rules_table.flatten:
+                return flat_node
+            if lhs in self._rules_table.elide:
+                return elided_node
+        return default_reduce_handler
 
 
 # Example usage
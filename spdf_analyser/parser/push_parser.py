@@ -0,0 +1,316 @@
+from .. import *
+
+from . import DEFAULT_PARSER_END_MARKER
+from .classes.syntax_node import SyntaxNode
+from .classes.token import Token
+from .classes.token_store import TokenStore
+from .handlers import ReduceHandler, ShiftHandler
+from .table.compiled_table import COMPILED_ACCEPT, COMPILED_ACTION_BITS, COMPILED_ACTION_MASK, COMPILED_ERROR, COMPILED_REDUCE, COMPILED_SHIFT, CompiledTable
+
+
+class PushParser:
+    __slots__ = (
+        "_table", "_end_marker", "_reduce_handlers", "_shift_handler", "_sync_categories", "_insert_categories", "_error_handler",
+        "_index_values", "_stack", "_result", "_is_finished", "_is_recovering", "_errors"
+    )
+
+    def __init__(
+            self,
+            compiled_table: CompiledTable,
+            end_marker: str = DEFAULT_PARSER_END_MARKER,
+            reduce_handlers: Optional[Iterable[ReduceHandler]] = None,
+            shift_handler: ShiftHandler = SyntaxNode,
+            sync_categories: Optional[Dict[str, Optional[str]]] = None,
+            insert_categories: Iterable[str] = tuple(),
+            error_handler: ReduceHandler = SyntaxNode,
+            index_values: Optional[Iterable[str]] = None
+        ) -> None:
+        self._table: CompiledTable = compiled_table
+        self._end_marker: str = end_marker
+
+        # Semantic actions (one reduce handler per production rule), the default ones build the syntax tree
+        self._reduce_handlers: Tuple[ReduceHandler] = tuple(reduce_handlers) if reduce_handlers else (SyntaxNode, ) * len(compiled_table.rules_lhs)
+        self._shift_handler: ShiftHandler = shift_handler
+
+        # Error recovery (only when synchronization tokens are given, otherwise the first invalid symbol raises an error)
+        # Each synchronization token completes a non-terminal (e.g. the end of an object) or resumes the parsing (None)
+        # The insertion tokens can be inserted when they are missing (e.g. a closing punctuator)
+        self._sync_categories: Optional[Dict[str, Optional[int]]] = None
+        if sync_categories is not None:
+            nonterminals = {nonterminal.value: i for i, nonterminal in enumerate(compiled_table.nonterminals)}
+            for nonterminal in sync_categories.values():
+                if nonterminal is not None and not nonterminal in nonterminals:
+                    raise ValueError(f"Unknown synchronization non-terminal \"{nonterminal}\"")
+            self._sync_categories = {category: nonterminals.get(nonterminal) for category, nonterminal in sync_categories.items()}
+            self._sync_categories.setdefault(end_marker, None)
+        self._insert_categories: Tuple[str] = tuple(insert_categories)
+        self._error_handler: ReduceHandler = error_handler
+
+        # Values of the nodes indexed by the syntax tree (only with index values)
+        # The index is built from the whole tree on its first query (see SyntaxNode.find), the parsing doesn't track the nodes
+        self._index_values: Optional[FrozenSet[str]] = frozenset(index_values) if index_values is not None else None
+
+        # Only the LR stack is kept (pairs of state index and value), tokens are consumed as they are fed
+        self._stack: List[Tuple[int, Any]] = [(0, None)]
+        self._result: Any = None
+        self._is_finished: bool = False
+        self._is_recovering: bool = False # Discarding tokens after an error
+        self._errors: List[Tuple[Token, str]] = []
+
+    def __str__(self) -> str:
+        return f"<depth={self.depth}, finished={self.is_finished}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack) - 1
+
+    @property
+    def is_finished(self) -> bool:
+        return self._is_finished
+
+    @property
+    def result(self) -> Any:
+        return self._result
+
+    @property
+    def index_values(self) -> Optional[FrozenSet[str]]:
+        return self._index_values
+
+    @property
+    def errors(self) -> Tuple[Tuple[Token, str]]:
+        # Recovered errors (the invalid token and the error message), in the input order
+        return tuple(self._errors)
+
+    def reset(self) -> None:
+        self._stack = [(0, None)]
+        self._result = None
+        self._is_finished = False
+        self._is_recovering = False
+        self._errors = []
+
+    def feed(self, token: Token) -> None:
+        # Reduce as needed and shift the token (the token is accepted or rejected right away)
+        self.feed_many((token, ))
+
+    def feed_many(self, tokens: Iterable[Token] | TokenStore) -> None:
+        # Feed the tokens one by one (works with generators, nothing is materialized)
+        # The categories of a token store are read from its category ids, a token is only created for a value or an error
+        if isinstance(tokens, TokenStore):
+            categories = tokens.categories
+            sources = zip(map(categories.__getitem__, tokens.category_ids), range(len(tokens)))
+            token_at = tokens.token
+        else:
+            sources = ((token.category, token) for token in tokens)
+            token_at = None # The sources are the tokens
+
+        table = self._table
+        dispatch, gotos, rules_lhs, rules_length = table.dispatch, table.gotos, table.rules_lhs, table.rules_length
+        nonterminals_count = len(table.nonterminals)
+        reduce_handlers, shift_handler = self._reduce_handlers, self._shift_handler
+        stack = self._stack
+        reduces_limit = len(rules_lhs) # Reductions for a token before checking them for a cycle
+        reduces, cycle_states = 0, set()
+
+        for category, source in sources:
+            if self._is_finished:
+                raise ValueError("Token fed after the end of the input")
+            if self._is_recovering and not self._recover(source if token_at is None else token_at(source)):
+                continue # Discarded or consumed while recovering
+
+            if reduces > reduces_limit:
+                cycle_states.clear()
+            reduces = 0
+            while True:
+                state_index = stack[-1][0] # Last state index
+
+                # Map the current state and symbol (literal terminals first, then regex terminals)
+                entry = dispatch[state_index].get(category)
+                if entry is None:
+                    entry = table.fallback(state_index, category)
+                action, param = entry & COMPILED_ACTION_MASK, entry >> COMPILED_ACTION_BITS
+
+                # A token whose reductions come back to the same stack is never shifted (it's invalid there)
+                # E.g. "EXPR -> ε" then "EXPRS -> EXPRS EXPR" on any token with the conflicts of the LR(0) tables resolved
+                if action == COMPILED_REDUCE:
+                    reduces += 1
+                    if reduces > reduces_limit:
+                        states = tuple(state for state, _ in stack)
+                        if states in cycle_states:
+                            action = COMPILED_ERROR
+                        cycle_states.add(states)
+
+                if action == COMPILED_SHIFT:
+                    # Push the value of the token (the terminal node by default) with the new state
+                    stack.append((param, shift_handler(source if token_at is None else token_at(source))))
+                    break
+
+                elif action == COMPILED_REDUCE:
+                    # Reduce by the RHS elements (epsilon elements are not counted)
+                    rhs_length = rules_length[param]
+                    if rhs_length > 0:
+                        # Remove the length of RHS from the stack
+                        rhs_values = [value for _, value in stack[-rhs_length:]] # Preserve order (left-to-right)
+                        del stack[-rhs_length:]
+                    else:
+                        rhs_values = [] # Epsilon production
+
+                    # Value of the LHS non-terminal (the node with the RHS nodes as children by default)
+                    lhs = table.nonterminals[rules_lhs[param]]
+                    new_value = reduce_handlers[param](lhs.value, rhs_values)
+
+                    if not stack:
+                        raise ValueError(f"Empty stack after REDUCE")
+
+                    # Get next state
+                    goto_state = gotos[stack[-1][0] * nonterminals_count + rules_lhs[param]]
+
+                    # No next state found
+                    if not goto_state:
+                        raise ValueError(f"Invalid pair (\"{stack[-1][0]}\", \"{lhs}\") in ACTION table")
+
+                    # Push the new state and value
+                    stack.append((goto_state, new_value))
+
+                elif action == COMPILED_ACCEPT:
+                    # Sentence accepted
+                    if len(stack) < 2:
+                        raise ValueError("Stack too small on ACCEPT")
+                    self._result = stack[-1][1] # The value for START
+                    self._is_finished = True
+                    self._stack = [(0, None)]
+                    return
+
+                else:
+                    # Identify invalid symbol
+                    message = f"Invalid symbol \"{category}\" at state {state_index}"
+                    if self._sync_categories is None:
+                        raise ValueError(message)
+
+                    # Recover from the error (then retry the token if it became valid, from the new stack)
+                    token = source if token_at is None else token_at(source)
+                    self._errors.append((token, message))
+                    if not self._recover(token, True):
+                        break
+                    reduces = 0
+                    cycle_states.clear()
+
+    def finish(self) -> Any:
+        # Feed the end marker and return the value for START (the root of the syntax tree by default)
+        if not self._is_finished:
+            self.feed(Token(self._end_marker, self._end_marker, None, None))
+        if self._index_values is not None and isinstance(self._result, SyntaxNode):
+            self._result.index_values = self._index_values # Indexed on its first query (see SyntaxNode.find)
+        return self._result
+
+    def _recover(self, token: Token, is_error: bool = False) -> bool:
+        # Recover from an error, True when the token can be parsed now (otherwise it was discarded or consumed)
+        table = self._table
+        category = token.category
+        states = [state for state, _ in self._stack]
+
+        if is_error:
+            # Phrase level: insert a missing token when the invalid token becomes valid after it
+            for insert_category in self._insert_categories:
+                if PushParser._accepts(table, states, (insert_category, category)):
+                    self.feed(Token(insert_category, "", token.line, token.position, token.offset))
+                    return True
+            self._is_recovering = True
+        elif PushParser._accepts(table, states, (category, )):
+            # A valid token after the discarded ones
+            self._is_recovering = False
+            return True
+
+        # Panic mode: discard the tokens until a synchronization token, then pop the stack until a state to continue from
+        if category in self._sync_categories:
+            nonterminal = self._sync_categories[category]
+            for depth in range(len(states), 0, -1):
+                if nonterminal is None:
+                    # Resume at the synchronization token
+                    if PushParser._accepts(table, states[:depth], (category, )):
+                        del self._stack[depth:]
+                        self._is_recovering = False
+                        return True
+                else:
+                    # Consume the synchronization token as the end of the non-terminal (with an empty value)
+                    goto_state = table.gotos[states[depth - 1] * len(table.nonterminals) + nonterminal]
+                    if goto_state:
+                        del self._stack[depth:]
+                        self._stack.append((goto_state, self._error_handler(table.nonterminals[nonterminal].value, [])))
+                        self._is_recovering = False
+                        return False
+
+        if category == self._end_marker:
+            # Unrecoverable end of the input, partial value for START (an error even when the end is reached while discarding tokens)
+            if not is_error:
+                self._errors.append((token, f"Invalid symbol \"{category}\" at state {states[-1]}"))
+            self._result = self._wrap()
+            self._is_finished = True
+            self._stack = [(0, None)]
+        return False
+
+    def _wrap(self) -> Any:
+        # Close the production rules in progress from the top of the stack, until the value for START
+        # The values of a complete production rule are reduced, the ones of an incomplete production rule become a partial value of its LHS
+        table, stack = self._table, self._stack
+        aug_start_index = table.rules_lhs[0]
+        while len(stack) > 1:
+            state_index = stack[-1][0]
+            rule, length = table.partial_rules[state_index], table.partial_lengths[state_index]
+            if table.rules_lhs[rule] == aug_start_index:
+                return stack[-1][1] # The value for START
+            if not 0 < length < len(stack):
+                raise ValueError(f"Invalid partial production rule at state {state_index}")
+
+            depth = len(stack) - length
+            values = [value for _, value in stack[depth:]]
+            lhs = table.nonterminals[table.rules_lhs[rule]]
+            handler = self._reduce_handlers[rule] if length == table.rules_length[rule] else self._error_handler
+            new_value = handler(lhs.value, values)
+            del stack[depth:]
+
+            goto_state = table.gotos[stack[-1][0] * len(table.nonterminals) + table.rules_lhs[rule]]
+            if not goto_state:
+                raise ValueError(f"Invalid pair (\"{stack[-1][0]}\", \"{lhs}\") in ACTION table")
+            stack.append((goto_state, new_value))
+
+        # Nothing parsed
+        start_symbol = table.nonterminals[aug_start_index].value.removesuffix("'") # Augmented start symbol
+        return self._error_handler(start_symbol, [])
+
+    def _accepts(table: CompiledTable, states: List[int], categories: Iterable[str]) -> bool:
+        # Simulate the parsing of the categories from the states (only the states are used, no handler is called)
+        # A cycle of reductions (the same stack again for a category) rejects the category, as in feed_many
+        states = list(states)
+        nonterminals_count = len(table.nonterminals)
+        for category in categories:
+            cycle_states = set()
+            while True:
+                entry = table.dispatch[states[-1]].get(category)
+                if entry is None:
+                    entry = table.fallback(states[-1], category)
+                action, param = entry & COMPILED_ACTION_MASK, entry >> COMPILED_ACTION_BITS
+
+                if action == COMPILED_REDUCE:
+                    if tuple(states) in cycle_states:
+                        return False
+                    cycle_states.add(tuple(states))
+
+                if action == COMPILED_SHIFT:
+                    states.append(param)
+                    break
+                elif action == COMPILED_REDUCE:
+                    if table.rules_length[param] > 0:
+                        del states[-table.rules_length[param]:]
+                    if not states:
+                        return False
+                    states.append(table.gotos[states[-1] * nonterminals_count + table.rules_lhs[param]])
+                    if not states[-1]:
+                        return False
+                elif action == COMPILED_ACCEPT:
+                    return True
+                else:
+                    return False
+        return True
\ No newline at end of file
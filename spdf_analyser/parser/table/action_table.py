@@ -9,40 +9,85 @@ from .table import Table
 
 
 class ActionTable(Table[Tuple[int, Symbol], ActionEntry]):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._conflicts: List[Tuple[Tuple[int, Symbol], ActionEntry, ActionEntry]] = list()
+        self._partials: List[Tuple[int, int]] = list()
+
+    @property
+    def conflicts(self) -> Tuple[Tuple[Tuple[int, Symbol], ActionEntry, ActionEntry]]:
+        # Resolved conflicts (the key, the entry already in the table and the conflicting one)
+        return tuple(self._conflicts)
+
+    @conflicts.setter
+    def conflicts(self, conflicts: Iterable[Tuple[Tuple[int, Symbol], ActionEntry, ActionEntry]]) -> None:
+        # Conflicts of tables loaded without building them (e.g. from a cache)
+        self._conflicts = list(conflicts)
+
+    @property
+    def partials(self) -> Tuple[Tuple[int, int]]:
+        # Production rule in progress of each state and the amount of its RHS symbols on the stack (the longest kernel item)
+        # The values on the stack are wrapped by them when the input ends before the START production rule
+        return tuple(self._partials)
+
+    @partials.setter
+    def partials(self, partials: Iterable[Tuple[int, int]]) -> None:
+        self._partials = [tuple(partial) for partial in partials]
+
     def build(self, rules_table: RulesTable, automaton_table: AutomatonTable) -> None:
         # Build the action table for the automate parser based on the states items transitions and end items (when dot position is at the end)
         # The action table maps from a current state with a symbol to an action and a parameter
+        self._conflicts = list()
+        self._partials = list()
         for i, state in automaton_table:
-            # Build table entries for each item in the state
-            for item in state:
-                if item.transition and item.transition.from_symbol.is_terminal():
-                    # Insert SHIFT action
-                    index = item.transition.to_state
-                    self._table[(i, item.transition.from_symbol)] = ActionEntry(PARSER_ACTION.SHIFT, index)
+            # The outer production rule in progress (the first one between the longest items)
+            item = max(state, key=lambda item: (item.dot_position, -item.rule))
+            self._partials.append((item.rule, item.dot_position))
 
-                elif item.transition and item.transition.from_symbol.is_non_terminal():
-                    # Insert GOTO action
-                    index = item.transition.to_state
-                    self._table[(i, item.transition.from_symbol)] = ActionEntry(PARSER_ACTION.GOTO, index)
+            # Build table entries for each end item of the state
+            for item in state:
+                if not item.is_complete(rules_table):
+                    continue
 
-                elif (item.dot_position == len(item.production.rhs) or item.production.rhs[item.dot_position] == rules_table.epsilon_symbol) and item.production.lhs != rules_table.aug_start_symbol:
+                elif item.production(rules_table).lhs != rules_table.aug_start_symbol:
                     # Insert REDUCE action
-                    index = rules_table.find(item.production)
-                    for lookahead in item.lookaheads:
-                        self._table[(i, lookahead)] = ActionEntry(PARSER_ACTION.REDUCE, index)
+                    for lookahead in automaton_table.lookaheads(item):
+                        self._insert((i, lookahead), ActionEntry(PARSER_ACTION.REDUCE, item.rule))
 
-                elif item.dot_position == len(item.production.rhs) and item.production.lhs == rules_table.aug_start_symbol:
+                else:
                     # Insert ACCEPT action
-                    self._table[(i, rules_table.end_symbol)] = ActionEntry(PARSER_ACTION.ACCEPT, None)
+                    self._insert((i, rules_table.end_symbol), ActionEntry(PARSER_ACTION.ACCEPT, None))
 
-                # elif something:
-                #     # TODO
-                #     # Insert ERROR action
-
-                # elif something:
-                #     # TODO
-                #     # Insert CONFLICT action
+            # Build table entries for each transition of the state
+            for symbol, index in state.transitions:
+                if symbol.is_terminal():
+                    # Insert SHIFT action
+                    self._insert((i, symbol), ActionEntry(PARSER_ACTION.SHIFT, index))
 
                 else:
-                    pass
-                    # raise Exception("Exception when building ACTION table")
\ No newline at end of file
+                    # Insert GOTO action
+                    self._insert((i, symbol), ActionEntry(PARSER_ACTION.GOTO, index))
+
+    def describe_conflicts(self) -> str:
+        # Amount of resolved conflicts by kind and the first one (e.g. "22 SHIFT/REDUCE, 1 REDUCE/REDUCE, first at state 3 on \"COMMENT\"")
+        if not self._conflicts:
+            return "no conflict"
+        kinds = Counter("/".join(sorted((current.action.name, entry.action.name), reverse=True)) for _, current, entry in self._conflicts)
+        (state, symbol), _, _ = self._conflicts[0]
+        return f"{', '.join(f'{count} {kind}' for kind, count in kinds.items())}, first at state {state} on \"{symbol}\""
+
+    def _insert(self, key: Tuple[int, Symbol], entry: ActionEntry) -> None:
+        # Register different entries for the same key as conflicts (the resolved entry is kept)
+        if key in self._table and self._table[key] != entry:
+            self._conflicts.append((key, self._table[key], entry))
+            entry = ActionTable._resolve(self._table[key], entry)
+        self._table[key] = entry
+
+    def _resolve(current: ActionEntry, entry: ActionEntry) -> ActionEntry:
+        # SHIFT wins over REDUCE and the first production rule wins between REDUCEs (the last entry wins otherwise)
+        if current.action == PARSER_ACTION.SHIFT and entry.action == PARSER_ACTION.REDUCE:
+            return current
+        if current.action == PARSER_ACTION.REDUCE and entry.action == PARSER_ACTION.REDUCE:
+            return current if current.param < entry.param else entry
+        return entry
\ No newline at end of file
@@ -1,9 +1,8 @@
 from ... import *
 
-from ..classes.production_rule import ProductionRule
 from ..classes.state import State
 from ..classes.state_item import StateItem
-from ..classes.transition import Transition
+from ..classes.symbol import Symbol, Terminal
 
 from .first_table import FirstTable
 from .follow_table import FollowTable
@@ -11,75 +10,130 @@ from .rules_table import RulesTable
 from .table import Table
 
 
+PARSER_MODE = Enum("PARSER_MODE", ["LR0", "SLR1", "LALR1", "LR1"])
+
+
 class AutomatonTable(Table[int, State]):
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Terminals of the lookahead bitmasks of the items
+        self._terminals: Tuple[Terminal] = tuple()
+
     @property
     def states(self) -> Tuple[State]:
         return tuple(self._table.values())
 
-    def build(self, rules_table: RulesTable, first_table: FirstTable, follow_table: FollowTable) -> None:
-        # Tecnically speaking, the automaton table is a directed acyclic graph of all states with root in the augmented start production rule
-        initial_state = State([StateItem(rules_table[rules_table.aug_start_symbol][0], 0, [rules_table.end_symbol])])
-        initial_state.closure(rules_table, first_table)
+    @property
+    def terminals(self) -> Tuple[Terminal]:
+        return self._terminals
 
-        automaton_states: List[State] = [initial_state]
-        pending_states: List[State] = [initial_state]
-        visited_states: List[State] = []
+    def build(self, rules_table: RulesTable, first_table: FirstTable, follow_table: FollowTable, mode: PARSER_MODE = PARSER_MODE.LR1) -> None:
+        self._terminals = first_table.terminals
 
-        transitions: Dict[Tuple[int, ProductionRule], Transition] = dict()
+        # LR(0) and SLR(1) share the LR(0) automaton, LALR(1) merges the canonical LR(1) automaton
+        with_lookaheads = mode in (PARSER_MODE.LALR1, PARSER_MODE.LR1)
+        automaton_states = self._build_states(rules_table, first_table, with_lookaheads)
+
+        match mode:
+            case PARSER_MODE.LR0:
+                # Reduce on any terminal
+                terminals = ((1 << len(first_table.terminals)) - 1) & ~first_table.terminal_bit(rules_table.epsilon_symbol)
+                automaton_states = self._apply_lookaheads(automaton_states, lambda _: terminals)
+
+            case PARSER_MODE.SLR1:
+                # Reduce on the terminals that can follow the LHS
+                automaton_states = self._apply_lookaheads(automaton_states, lambda item: follow_table.bits[item.production(rules_table).lhs])
+
+            case PARSER_MODE.LALR1:
+                # Merge states with the same core
+                automaton_states = self._merge_cores(automaton_states)
 
-        # Solve remaining states (BFS scan)
-        # Stop when dot position in each branch reachs the length of the RHS
-        while pending_states:
-            current_state = pending_states.pop(0) # FIFO
-
-            # For each rule, computes the next state from current state with next symbol as target
-            for item in current_state:
-                if item.dot_position >= len(item.production.rhs):
-                    continue
-
-                symbol = item.production.rhs[item.dot_position]
-
-                # Handle target symbols for common symbol or epsilon case
-                target_symbols = (symbol, ) if symbol != rules_table.epsilon_symbol else follow_table[item.production.lhs]
-
-                for target_symbol in target_symbols:
-                    next_state = State.goto(
-                        current_state,
-                        target_symbol,
-                        rules_table,
-                        first_table
-                    )
-
-                    index = None
-                    if next_state and next_state not in visited_states:
-                        # Add next state if not seen before
-                        automaton_states.append(next_state)
-                        pending_states.append(next_state)
-                        visited_states.append(next_state)
-
-                        # Quick index to transition
-                        index = len(automaton_states) - 1
-                    
-                    elif next_state and next_state in visited_states:
-                        # Find current state index to create transition
-                        index = automaton_states.index(next_state)
-
-                    if index:
-                        # Create transition from current rule to next state
-                        transitions[(automaton_states.index(current_state), item.production)] = Transition(target_symbol, index)
-
-        # # Apply transitions to each item reference
-        for (current_state, rule), transition in transitions.items():
-            for item in automaton_states[current_state]:
-                if item.production == rule:
-                    item.transition = transition
-        
         # Apply automaton states to table
+        self.from_keys()
         for i, state in enumerate(automaton_states):
             self._table[i] = state
-    
+
     def find(self, state: State) -> int:
         for i, current_state in self:
             if state == current_state:
                 return i
-        return -1
\ No newline at end of file
+        return -1
+
+    def lookaheads(self, item: StateItem) -> Generator[Terminal, Any, None]:
+        # Terminals in the lookahead bitmask of the item
+        yield from (terminal for i, terminal in enumerate(self._terminals) if item.lookaheads >> i & 1)
+
+    def _build_states(self, rules_table: RulesTable, first_table: FirstTable, with_lookaheads: bool) -> List[State]:
+        # Tecnically speaking, the automaton table is a directed acyclic graph of all states with root in the augmented start production rule
+        initial_state = State([StateItem(0, 0, first_table.terminal_bit(rules_table.end_symbol) if with_lookaheads else 0)])
+        initial_kernel = initial_state.items
+        initial_state.closure(rules_table, first_table, with_lookaheads)
+
+        # States are interned by their kernel (the closure of a kernel is unique), so each state gets its index when created
+        automaton_states: List[State] = [initial_state]
+        state_indexes: Dict[Tuple[StateItem], int] = {initial_kernel: 0}
+        pending_states: Deque[int] = deque([0])
+
+        # Solve remaining states (BFS scan)
+        # Stop when dot position in each branch reachs the length of the RHS
+        while pending_states:
+            current_index = pending_states.popleft() # FIFO
+            current_state = automaton_states[current_index]
+
+            # For each symbol after a dot, computes the next state from current state with it as target
+            transitions: List[Tuple[Symbol, int]] = []
+            for symbol in current_state.symbols(rules_table):
+                next_state = State.kernel(current_state, symbol, rules_table)
+
+                # Find the next state by its kernel, creating it only if not seen before
+                index = state_indexes.get(next_state.items)
+                if index is None:
+                    index = len(automaton_states)
+                    state_indexes[next_state.items] = index
+
+                    # Add next state (closure only computed for new kernels)
+                    next_state.closure(rules_table, first_table, with_lookaheads)
+                    automaton_states.append(next_state)
+                    pending_states.append(index)
+
+                transitions.append((symbol, index))
+
+            current_state.transitions = tuple(transitions)
+
+        return automaton_states
+
+    def _apply_lookaheads(self, automaton_states: List[State], lookaheads: Callable[[StateItem], int]) -> List[State]:
+        # Replace the lookaheads of every LR(0) item
+        return [
+            State((StateItem(item.rule, item.dot_position, lookaheads(item)) for item in state.items), state.transitions)
+            for state in automaton_states
+        ]
+
+    def _merge_cores(self, automaton_states: List[State]) -> List[State]:
+        # Group states by core (in order of first appearance)
+        groups: Dict[FrozenSet[int], List[int]] = defaultdict(list)
+        for i, state in enumerate(automaton_states):
+            groups[state.core()].append(i)
+
+        # Map from old state index to merged state index
+        merged_indexes: Dict[int, int] = dict()
+        for merged_index, indexes in enumerate(groups.values()):
+            for index in indexes:
+                merged_indexes[index] = merged_index
+
+        merged_states: List[State] = []
+        for indexes in groups.values():
+            # Union of the lookaheads of the items with the same core
+            lookaheads: Dict[int, int] = defaultdict(int)
+            for index in indexes:
+                for item in automaton_states[index].items:
+                    lookaheads[item.core()] |= item.lookaheads
+
+            # Merged items with the transitions of the first state of the group redirected
+            merged_states.append(State(
+                (StateItem.from_core(core, bits) for core, bits in lookaheads.items()),
+                ((symbol, merged_indexes[index]) for symbol, index in automaton_states[indexes[0]].transitions)
+            ))
+
+        return merged_states
\ No newline at end of file
@@ -0,0 +1,137 @@
+from ... import *
+
+from ..classes.action_entry import PARSER_ACTION
+from ..classes.symbol import NonTerminal, Terminal
+
+# Only what the parsing reads is imported here (a generated module loads this table without the tables construction stack)
+# The rules and ACTION tables given to "build" are only known by their names
+
+
+# Action kinds encoded in the lowest bits of each ACTION cell (the parameter is in the remaining bits)
+COMPILED_ACTION_BITS = 2
+COMPILED_ACTION_MASK = (1 << COMPILED_ACTION_BITS) - 1
+COMPILED_ERROR = 0
+COMPILED_SHIFT = 1
+COMPILED_REDUCE = 2
+COMPILED_ACCEPT = 3
+
+
+class CompiledTable:
+    __slots__ = ("terminals", "nonterminals", "actions", "gotos", "rules_lhs", "rules_length", "partial_rules", "partial_lengths", "dispatch", "fallbacks", "_nonterminal_indexes")
+
+    def __init__(self) -> None:
+        self.terminals: Tuple[Terminal] = tuple()
+        self.nonterminals: Tuple[NonTerminal] = tuple()
+
+        # Flat ACTION (states x terminals) and GOTO (states x non-terminals) tables
+        self.actions: array = array("i")
+        self.gotos: array = array("i")
+
+        # LHS non-terminal index and RHS length (without epsilon) of each production rule
+        self.rules_lhs: array = array("i")
+        self.rules_length: array = array("i")
+
+        # Production rule in progress of each state and the amount of its RHS values on the stack (to wrap them at an unexpected end)
+        self.partial_rules: array = array("i")
+        self.partial_lengths: array = array("i")
+
+        # Per state map from token category to ACTION cell (literal terminals) and list of regex terminals tried after it
+        self.dispatch: Tuple[Dict[str, int]] = tuple()
+        self.fallbacks: Tuple[Tuple[Tuple[Pattern[str], int]]] = tuple()
+
+        self._nonterminal_indexes: Dict[NonTerminal, int] = dict()
+
+    def __str__(self) -> str:
+        return f"<states={self.states_count}, terminals={len(self.terminals)}, nonterminals={len(self.nonterminals)}, nbytes={self.nbytes}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__str__()})"
+
+    @property
+    def states_count(self) -> int:
+        return len(self.dispatch)
+
+    @property
+    def nbytes(self) -> int:
+        # Size of the arrays buffers
+        return sum(table.itemsize * len(table) for table in (self.actions, self.gotos, self.rules_lhs, self.rules_length, self.partial_rules, self.partial_lengths))
+
+    def build(self, rules_table: "RulesTable", action_table: "ActionTable") -> None:
+        # Give dense indexes to the terminals and non-terminals
+        self.terminals = tuple(terminal for terminal in rules_table.terminals if terminal != rules_table.epsilon_symbol)
+        self.nonterminals = (*rules_table.nonterminals, rules_table.aug_start_symbol)
+        self._nonterminal_indexes = {nonterminal: i for i, nonterminal in enumerate(self.nonterminals)}
+        terminal_indexes = {terminal: i for i, terminal in enumerate(self.terminals)}
+
+        # Encode the production rules
+        self.rules_lhs = array("i", (self._nonterminal_indexes[rule.lhs] for rule in rules_table))
+        self.rules_length = array("i", (len(rule.rhs) - rule.rhs.count(rules_table.epsilon_symbol) for rule in rules_table))
+
+        # Encode the ACTION and GOTO entries
+        states_count = max((state for state, _ in action_table.table), default=-1) + 1
+        self.partial_rules = array("i", (rule for rule, _ in action_table.partials))
+        self.partial_lengths = array("i", (length for _, length in action_table.partials))
+        self.actions = array("i", bytes(array("i").itemsize * states_count * len(self.terminals)))
+        self.gotos = array("i", bytes(array("i").itemsize * states_count * len(self.nonterminals)))
+
+        for (state, symbol), entry in action_table:
+            match entry.action:
+                case PARSER_ACTION.SHIFT:
+                    self.actions[state * len(self.terminals) + terminal_indexes[symbol]] = (entry.param << COMPILED_ACTION_BITS) | COMPILED_SHIFT
+                case PARSER_ACTION.REDUCE:
+                    self.actions[state * len(self.terminals) + terminal_indexes[symbol]] = (entry.param << COMPILED_ACTION_BITS) | COMPILED_REDUCE
+                case PARSER_ACTION.ACCEPT:
+                    self.actions[state * len(self.terminals) + terminal_indexes[symbol]] = COMPILED_ACCEPT
+                case PARSER_ACTION.GOTO:
+                    self.gotos[state * len(self.nonterminals) + self._nonterminal_indexes[symbol]] = entry.param
+
+        # Index the non-empty ACTION cells of each state by the token category (regex terminals only as fallback)
+        dispatch: List[Dict[str, int]] = [dict() for _ in range(states_count)]
+        fallbacks: List[List[Tuple[Pattern[str], int]]] = [list() for _ in range(states_count)]
+        for state in range(states_count):
+            for i, terminal in enumerate(self.terminals):
+                entry = self.actions[state * len(self.terminals) + i]
+                if not entry:
+                    continue
+
+                if CompiledTable.is_literal(terminal):
+                    dispatch[state][terminal.value] = entry
+                else:
+                    fallbacks[state].append((terminal.pattern, entry))
+
+        self.dispatch = tuple(dispatch)
+        self.fallbacks = tuple(tuple(fallback) for fallback in fallbacks)
+
+    def from_literals(
+            nonterminals: Iterable[str],
+            rules_lhs: Iterable[int],
+            rules_length: Iterable[int],
+            partial_rules: Iterable[int],
+            partial_lengths: Iterable[int],
+            gotos: Iterable[int],
+            dispatch: Iterable[Dict[str, int]],
+            fallbacks: Iterable[Iterable[Tuple[Pattern[str], int]]]
+        ) -> Self:
+        # Table from the literals of a generated module (only what the parsing reads, the flat ACTION table and the terminals are left empty)
+        table = CompiledTable()
+        table.nonterminals = tuple(NonTerminal(nonterminal) for nonterminal in nonterminals)
+        table._nonterminal_indexes = {nonterminal: i for i, nonterminal in enumerate(table.nonterminals)}
+        table.rules_lhs = array("i", rules_lhs)
+        table.rules_length = array("i", rules_length)
+        table.partial_rules = array("i", partial_rules)
+        table.partial_lengths = array("i", partial_lengths)
+        table.gotos = array("i", gotos)
+        table.dispatch = tuple(dispatch)
+        table.fallbacks = tuple(tuple(fallback) for fallback in fallbacks)
+        return table
+
+    def fallback(self, state: int, category: str) -> int:
+        # ACTION cell of the first regex terminal matching the category (0 when none matches)
+        for pattern, entry in self.fallbacks[state]:
+            if pattern.fullmatch(category):
+                return entry
+        return 0
+
+    def is_literal(terminal: Terminal) -> bool:
+        # Terminal matching only its own value
+        return terminal.pattern.pattern == escape(terminal.value)
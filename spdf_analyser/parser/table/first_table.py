@@ -1,49 +1,146 @@
 from ... import *
 
-from ..classes.production_rule import ProductionRule
-from ..classes.symbol import NonTerminal, Terminal
-from ..classes.unique_list import UniqueList
+from ..classes.symbol import NonTerminal, Symbol, Terminal
+from ..classes.ordered_set import OrderedSet
 
 from .rules_table import RulesTable
 from .table import Table
 
 
-class FirstTable(Table[NonTerminal, UniqueList[Terminal]]):
+class FirstTable(Table[NonTerminal, OrderedSet[Terminal]]):
     def __init__(self) -> None:
-        super().__init__(value_type = UniqueList)
+        super().__init__(value_type = OrderedSet)
+
+        # Terminals sets are bitmasks (bit i is set when the i-th terminal is in the set)
+        self._terminals: Tuple[Terminal] = tuple()
+        self._terminal_bits: Dict[Terminal, int] = dict()
+        self._bits: Dict[NonTerminal, int] = dict()
+        self._nullable: FrozenSet[NonTerminal] = frozenset()
+
+    @property
+    def terminals(self) -> Tuple[Terminal]:
+        return self._terminals
+
+    @property
+    def bits(self) -> Dict[NonTerminal, int]:
+        return self._bits
+
+    @property
+    def nullable(self) -> FrozenSet[NonTerminal]:
+        return self._nullable
 
     def build(self, rules_table: RulesTable) -> None:
         self.from_keys([k for k in rules_table.table.keys() if k.is_non_terminal()])
 
-        has_changed = True
-        while has_changed:
-            has_changed = False
-
-            # Build the first table
-            for rule in rules_table:
-                old_len = len(self._table[rule.lhs])
-
-                # Empty RHS case
-                if rule.is_rhs_empty():
-                    self._table[rule.lhs].append(rules_table.epsilon_symbol)
-                
-                # For each symbol in the RHS
-                for symbol in rule.rhs:
-                    if symbol.is_terminal():
-                        # Add first terminal
-                        self._table[rule.lhs].append(symbol)
+        self._terminals = tuple(rules_table.terminals)
+        self._terminal_bits = {terminal: 1 << i for i, terminal in enumerate(self._terminals)}
+        self._nullable = FirstTable._build_nullable(rules_table)
+
+        epsilon_bit = self.terminal_bit(rules_table.epsilon_symbol)
+
+        # Initial FIRST sets and dependencies between non-terminals (FIRST(lhs) contains FIRST(symbol))
+        self._bits = {nonterminal: 0 for nonterminal in self._table}
+        dependents: Dict[NonTerminal, List[NonTerminal]] = defaultdict(list)
+        for rule in rules_table:
+            for symbol in rule.rhs:
+                if symbol == rules_table.epsilon_symbol:
+                    continue
+
+                elif symbol.is_terminal():
+                    # Add first terminal
+                    self._bits[rule.lhs] |= self._terminal_bits[symbol]
+                    break
+
+                elif symbol.is_non_terminal():
+                    # Depends on the FIRST of the non-terminal (and on the next symbol if it's nullable)
+                    if not rule.lhs in dependents[symbol]:
+                        dependents[symbol].append(rule.lhs)
+                    if not symbol in self._nullable:
                         break
-                
-                    elif symbol.is_non_terminal():
-                        # Add result of first table for non-terminal
-                        self._table[rule.lhs].extend(self._table[symbol] - [rules_table.epsilon_symbol])
-                        if not ProductionRule(symbol, (rules_table.epsilon_symbol, )) in rules_table[symbol]:
-                            break
-
-                    else:
-                        # If not broken manually
-                        self._table[rule.lhs].append(rules_table.epsilon_symbol)
-
-                # Check if there was any change
-                if old_len < len(self._table[rule.lhs]):
-                    has_changed = True
\ No newline at end of file
+
+                else:
+                    raise Exception("Non-Symbol value found")
+
+            # Nullable non-terminals have epsilon
+            if rule.lhs in self._nullable:
+                self._bits[rule.lhs] |= epsilon_bit
+
+        # Propagate changes until no set changes (worklist)
+        FirstTable._propagate(self._bits, dependents, ~epsilon_bit)
+
+        for nonterminal, bits in self._bits.items():
+            self._table[nonterminal] = OrderedSet(self.terminals_of(bits))
+
+    def terminal_bit(self, terminal: Terminal) -> int:
+        return self._terminal_bits.get(terminal, 0)
+
+    def terminals_of(self, bits: int) -> Generator[Terminal, Any, None]:
+        # Terminals in the bitmask (in order of the terminals)
+        while bits:
+            low_bit = bits & -bits
+            yield self._terminals[low_bit.bit_length() - 1]
+            bits ^= low_bit
+
+    def first_bits(self, symbols: Iterable[Symbol], epsilon_symbol: Terminal) -> Tuple[int, bool]:
+        # FIRST bitmask of a sequence of symbols (without epsilon) and if the whole sequence is nullable
+        bits = 0
+        for symbol in symbols:
+            if symbol == epsilon_symbol:
+                continue
+            elif symbol.is_terminal():
+                return bits | self.terminal_bit(symbol), False
+            else:
+                bits |= self._bits[symbol] & ~self.terminal_bit(epsilon_symbol)
+                if not symbol in self._nullable:
+                    return bits, False
+        return bits, True
+
+    def _build_nullable(rules_table: RulesTable) -> FrozenSet[NonTerminal]:
+        # Count the symbols not known to be nullable in each rule (terminals are never nullable)
+        remaining: List[int] = []
+        occurrences: Dict[NonTerminal, List[int]] = defaultdict(list)
+        for i, rule in enumerate(rules_table):
+            count = 0
+            for symbol in rule.rhs:
+                if symbol == rules_table.epsilon_symbol:
+                    continue
+                elif symbol.is_terminal():
+                    count = -1
+                    break
+                else:
+                    occurrences[symbol].append(i)
+                    count += 1
+            remaining.append(count)
+
+        # Rules with nothing left to derive make their LHS nullable (worklist)
+        nullable = set()
+        pending = deque(rules_table.array[i].lhs for i, count in enumerate(remaining) if count == 0)
+        while pending:
+            nonterminal = pending.popleft()
+            if nonterminal in nullable:
+                continue
+            nullable.add(nonterminal)
+
+            for i in occurrences[nonterminal]:
+                if remaining[i] > 0:
+                    remaining[i] -= 1
+                    if remaining[i] == 0:
+                        pending.append(rules_table.array[i].lhs)
+
+        return frozenset(nullable)
+
+    def _propagate(bits: Dict[NonTerminal, int], dependents: Dict[NonTerminal, List[NonTerminal]], mask: int = -1) -> None:
+        # Propagate each set to its dependents until nothing changes (only the changed sets are revisited)
+        pending = deque(bits.keys())
+        queued = set(pending)
+        while pending:
+            nonterminal = pending.popleft()
+            queued.discard(nonterminal)
+
+            for dependent in dependents.get(nonterminal, ()):
+                new_bits = bits[dependent] | (bits[nonterminal] & mask)
+                if new_bits != bits[dependent]:
+                    bits[dependent] = new_bits
+                    if not dependent in queued:
+                        pending.append(dependent)
+                        queued.add(dependent)
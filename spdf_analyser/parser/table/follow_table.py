@@ -1,57 +1,47 @@
 from ... import *
 
 from ..classes.symbol import NonTerminal, Terminal
-from ..classes.unique_list import UniqueList
+from ..classes.ordered_set import OrderedSet
 
 from .first_table import FirstTable
 from .rules_table import RulesTable
 from .table import Table
 
 
-class FollowTable(Table[NonTerminal, UniqueList[Terminal]]):
+class FollowTable(Table[NonTerminal, OrderedSet[Terminal]]):
     def __init__(self) -> None:
-        super().__init__(value_type = UniqueList)
+        super().__init__(value_type = OrderedSet)
+
+        self._bits: Dict[NonTerminal, int] = dict()
+
+    @property
+    def bits(self) -> Dict[NonTerminal, int]:
+        return self._bits
 
     def build(self, rules_table: RulesTable, first_table: FirstTable) -> None:
         self.from_keys([k for k in rules_table.table.keys() if k.is_non_terminal()])
 
         # Default follow value for the starting symbol
-        self._table[rules_table.aug_start_symbol].append(rules_table.end_symbol)
-
-        has_changed = True
-        while has_changed:
-            has_changed = False
-
-            # Build the first table
-            for rule in rules_table:
-                # For each symbol in the RHS
-                for i in range(len(rule.rhs)):
-                    symbol = rule.rhs[i]
-
-                    if not symbol.is_non_terminal():
-                        continue
-
-                    next_symbol = rule.rhs[i + 1] if i + 1 < len(rule.rhs) else None
-
-                    old_len = len(self._table[symbol])
-
-                    if next_symbol and next_symbol.is_terminal() and next_symbol != rules_table.epsilon_symbol:
-                        # Add following terminal
-                        self._table[symbol].append(next_symbol)
-                
-                    elif next_symbol and next_symbol.is_non_terminal():
-                        # Add result of first table for following non-terminal
-                        self._table[symbol].extend(first_table[next_symbol] - {rules_table.epsilon_symbol})
-                        if rules_table.epsilon_symbol in first_table[next_symbol]:
-                            self._table[symbol].extend(self._table[rule.lhs])
-
-                    elif i == len(rule.rhs) - 1 or next_symbol == rules_table.epsilon_symbol:
-                        # Add result of follow table for last and empty followed symbol
-                        self._table[symbol].extend(self._table[rule.lhs])
-                    
-                    else:
-                        raise Exception("Non-Symbol value found")
-
-                    # Check if there was any change
-                    if old_len < len(self._table[symbol]):
-                        has_changed = True
\ No newline at end of file
+        self._bits = {nonterminal: 0 for nonterminal in self._table}
+        self._bits[rules_table.aug_start_symbol] |= first_table.terminal_bit(rules_table.end_symbol)
+
+        # Initial FOLLOW sets and dependencies between non-terminals (FOLLOW(symbol) contains FOLLOW(lhs))
+        dependents: Dict[NonTerminal, List[NonTerminal]] = defaultdict(list)
+        for rule in rules_table:
+            for i, symbol in enumerate(rule.rhs):
+                if not symbol.is_non_terminal():
+                    continue
+
+                # Add the FIRST of the following symbols
+                bits, is_nullable = first_table.first_bits(rule.rhs[i + 1:], rules_table.epsilon_symbol)
+                self._bits[symbol] |= bits
+
+                # Last or nullable followed symbol depends on the follow of the LHS
+                if is_nullable and not symbol in dependents[rule.lhs]:
+                    dependents[rule.lhs].append(symbol)
+
+        # Propagate changes until no set changes (worklist)
+        FirstTable._propagate(self._bits, dependents)
+
+        for nonterminal, bits in self._bits.items():
+            self._table[nonterminal] = OrderedSet(first_table.terminals_of(bits))
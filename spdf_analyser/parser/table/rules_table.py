@@ -1,11 +1,11 @@
 from ... import *
 
 from .. import DEFAULT_PARSER_END_MARKER, DEFAULT_PARSER_EPSILON_MARKER, DEFAULT_PARSER_STRING_MARKER, DEFAULT_PARSER_STRING_SEP
+from ..classes.ordered_set import OrderedSet
 from ..classes.production_rule import ProductionRule
 from ..classes.symbol import NonTerminal, Symbol, Terminal
-from ..classes.unique_list import UniqueList
-from ..classes.unique_tuple import UniqueTuple
 
+from .symbol_table import SymbolTable
 from .table import Table
 
 
@@ -14,9 +14,20 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
         super().__init__(value_type = list)
 
         self._array: List[ProductionRule] = list()
+        self._declared_array: Tuple[ProductionRule] = tuple()
+        self._origins: List[Tuple[int]] = list()
+        self._sources: List[Optional[Tuple[str, str]]] = list()
+        self._indexes: Dict[ProductionRule, int] = dict()
+        self._lhs_indexes: Dict[NonTerminal, Tuple[int]] = dict()
 
-        self._terminals: Optional[UniqueList[Terminal]] = None
-        self._nonterminals: Optional[UniqueList[NonTerminal]] = None
+        # Syntax tree annotations (list non-terminals built as flat nodes and pass-through non-terminals elided)
+        self._flatten: FrozenSet[NonTerminal] = frozenset()
+        self._elide: FrozenSet[NonTerminal] = frozenset()
+
+        self._symbol_table: SymbolTable = SymbolTable()
+
+        self._terminals: OrderedSet[Terminal] = OrderedSet()
+        self._nonterminals: OrderedSet[NonTerminal] = OrderedSet()
 
         self._start_symbol: NonTerminal = None
         self._aug_start_symbol: Optional[NonTerminal] = None
@@ -35,16 +46,43 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
         return self._array
 
     @property
-    def terminals(self) -> UniqueTuple[Terminal]:
-        return UniqueTuple(self._terminals)
+    def declared_array(self) -> Tuple[ProductionRule]:
+        # Production rules as declared (the same as the array when the grammar isn't optimized)
+        return self._declared_array
+
+    @property
+    def origins(self) -> Tuple[Tuple[int]]:
+        # Declared production rules of each production rule (from the outermost unit rule to the innermost rule)
+        return tuple(self._origins)
+
+    @property
+    def sources(self) -> Tuple[Optional[Tuple[str, str]]]:
+        # Declared (LHS, RHS) of each declared production rule (None for the augmented rule)
+        return tuple(self._sources)
+
+    @property
+    def flatten(self) -> FrozenSet[NonTerminal]:
+        return self._flatten
+
+    @property
+    def elide(self) -> FrozenSet[NonTerminal]:
+        return self._elide
 
     @property
-    def nonterminals(self) -> UniqueTuple[Terminal]:
-        return UniqueTuple(self._nonterminals)
+    def symbol_table(self) -> SymbolTable:
+        return self._symbol_table
 
     @property
-    def symbols(self) -> UniqueTuple[Symbol]:
-        return UniqueTuple(self.terminals + self.nonterminals)
+    def terminals(self) -> OrderedSet[Terminal]:
+        return self._terminals
+
+    @property
+    def nonterminals(self) -> OrderedSet[NonTerminal]:
+        return self._nonterminals
+
+    @property
+    def symbols(self) -> OrderedSet[Symbol]:
+        return self._terminals | self._nonterminals
 
     @property
     def start_symbol(self) -> NonTerminal:
@@ -66,19 +104,28 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
             self,
             rules: Optional[Iterable[Tuple[str, str]]] = None,
             string_sep: str = DEFAULT_PARSER_STRING_SEP, 
-            string_marker: str = DEFAULT_PARSER_STRING_MARKER
+            string_marker: str = DEFAULT_PARSER_STRING_MARKER,
+            optimize: bool = False
         ) -> None:
         rules = list(rules)
 
-        self._terminals = UniqueList()
-        self._nonterminals = UniqueList([NonTerminal(p[0]) for p in rules])
+        # Every symbol is created once by the symbol table (the same object is shared by all rules)
+        self._symbol_table.build((self._end_symbol, self._epsilon_symbol))
+        self._end_symbol = self._symbol_table.intern(self._end_symbol)
+        self._epsilon_symbol = self._symbol_table.intern(self._epsilon_symbol)
+
+        self._terminals = OrderedSet()
+        self._nonterminals = OrderedSet([self._symbol_table.nonterminal(p[0]) for p in rules])
+        nonterminals_values = {nonterminal.value for nonterminal in self._nonterminals}
 
-        self._start_symbol: NonTerminal = NonTerminal(self._start_symbol or next(iter(rules))[0])
-        self._aug_start_symbol: NonTerminal = NonTerminal(f"{self._start_symbol}\'")
+        self._start_symbol: NonTerminal = self._symbol_table.nonterminal(str(self._start_symbol or next(iter(rules))[0]))
+        self._aug_start_symbol: NonTerminal = self._symbol_table.nonterminal(f"{self._start_symbol}\'")
 
         if self._aug_start_symbol in self.symbols:
             raise ValueError("Incapable of creating augmented start symbol")
 
+        declared_rules = tuple(rules)
+
         # Convert empty RHS to epsilon marker
         for i in range(len(rules)):
             if rules[i][1] == "":
@@ -87,9 +134,9 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
         # Build production rules
         self._array = [
             ProductionRule(
-                NonTerminal(RulesTable._parse_rule_side(lhs, string_marker, string_sep)[0][0]),
+                self._symbol_table.nonterminal(RulesTable._parse_rule_side(lhs, string_marker, string_sep)[0][0]),
                 tuple(
-                    Terminal(x, escape_value=(not is_regex)) if not NonTerminal(x) in self._nonterminals else NonTerminal(x)
+                    self._symbol_table.terminal(x, escape_value=(not is_regex)) if not x in nonterminals_values else self._symbol_table.nonterminal(x)
                     for x, is_regex in RulesTable._parse_rule_side(rhs, string_marker, string_sep)
                 )
             )
@@ -97,6 +144,8 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
             if lhs and rhs # Garantee existing LHS and RHS
         ]
 
+        self._sources = [None, *(declared_rules[i] for i, (lhs, rhs) in enumerate(rules) if lhs and rhs)]
+
         # Add augmented rule
         self._array.insert(0,
             ProductionRule(
@@ -105,12 +154,27 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
             )
         )
 
+        # Remove redundant epsilon rules and unit rules (each production rule keeps its declared rules)
+        self._declared_array = tuple(self._array)
+        self._origins = [(i, ) for i in range(len(self._array))]
+        if optimize:
+            self._array, self._origins = RulesTable._optimize(self._array, self._origins, self._epsilon_symbol, self._aug_start_symbol)
+            lhs_symbols = {rule.lhs for rule in self._array}
+            self._nonterminals = OrderedSet([nonterminal for nonterminal in self._nonterminals if nonterminal in lhs_symbols])
+
         # Build table based on array
         for rule in self._array:
             self._table[rule.lhs].append(rule)
+        self._indexes = dict()
+        for i, rule in enumerate(self._array):
+            self._indexes.setdefault(rule, i)
+        self._lhs_indexes = {
+            lhs: tuple(OrderedSet(self._indexes[rule] for rule in rules))
+            for lhs, rules in self._table.items()
+        }
 
         # Identify the terminal symbols based on non-terminals
-        self._terminals = UniqueList([
+        self._terminals = OrderedSet([
             symbol for production in self._array for symbol in production.rhs
             if symbol.is_terminal()
         ])
@@ -120,11 +184,95 @@ class RulesTable(Table[NonTerminal, List[ProductionRule]]):
             raise ValueError("End marker already in terminals")
         self._terminals.append(self._end_symbol)
 
+    def annotate(self, flatten: Iterable[str] = tuple(), elide: Iterable[str] = tuple()) -> None:
+        # Mark the left-recursive list non-terminals (one n-ary node with all the elements)
+        # and the pass-through non-terminals (the single child takes the place of the node)
+        nonterminals_values = {rule.lhs.value: rule.lhs for rule in self._declared_array}
+        for value in (*flatten, *elide):
+            if not value in nonterminals_values:
+                raise ValueError(f"Invalid non-terminal \"{value}\" in annotations")
+        if set(flatten) & set(elide):
+            raise ValueError("Non-terminal both flattened and elided")
+
+        self._flatten = frozenset(nonterminals_values[value] for value in flatten)
+        self._elide = frozenset(nonterminals_values[value] for value in elide)
+
     def find(self, rule: ProductionRule) -> int:
-        for i, current_rule in enumerate(self.array):
-            if rule == current_rule:
-                return i
-        return -1
+        return self._indexes.get(rule, -1)
+
+    def indexes(self, nonterminal: NonTerminal) -> Tuple[int]:
+        # Indexes of the (distinct) production rules of the non-terminal
+        return self._lhs_indexes.get(nonterminal, tuple())
+
+    def _optimize(
+            array: List[ProductionRule],
+            origins: List[Tuple[int]],
+            epsilon_symbol: Terminal,
+            aug_start_symbol: NonTerminal
+        ) -> Tuple[List[ProductionRule], List[Tuple[int]]]:
+        rules = list(zip(array, origins))
+        epsilon_rhs = (epsilon_symbol, )
+
+        # Redundant epsilon rules: X -> ε when X is only an element of lists L -> L X with L -> ε (L derives the empty X anyway)
+        lhs_rules: Dict[NonTerminal, List[ProductionRule]] = defaultdict(list)
+        for rule, _ in rules:
+            lhs_rules[rule.lhs].append(rule)
+        redundant_rules = set()
+        for lhs, alternatives in lhs_rules.items():
+            epsilon_rule = ProductionRule(lhs, epsilon_rhs)
+            if not epsilon_rule in alternatives or len(alternatives) < 2:
+                continue
+            uses = [rule for rule, _ in rules if lhs in rule.rhs]
+            if uses and all(rule.lhs != lhs and rule.rhs == (rule.lhs, lhs) and ProductionRule(rule.lhs, epsilon_rhs) in lhs_rules[rule.lhs] for rule in uses):
+                redundant_rules.add(epsilon_rule)
+        rules = [(rule, origin) for rule, origin in rules if not rule in redundant_rules]
+
+        # Unit rules: A -> B (through chains A -> B -> C ...) take the rules of the last non-terminal that aren't unit rules
+        # Each new rule keeps the origins of the chain then of the rule it copies (its handlers rebuild the nodes of the chain)
+        # A rule already given by another chain (the same alternative reached twice) is dropped, as the first REDUCE wins a conflict
+        # The copied rules save the reductions of the chain but can add states (when its non-terminals are used elsewhere too)
+        is_unit = lambda rule: len(rule.rhs) == 1 and rule.rhs[0].is_non_terminal() and rule.lhs != aug_start_symbol
+        lhs_rules: Dict[NonTerminal, List[Tuple[ProductionRule, Tuple[int]]]] = defaultdict(list)
+        for rule, origin in rules:
+            lhs_rules[rule.lhs].append((rule, origin))
+
+        optimized_rules: List[Tuple[ProductionRule, Tuple[int]]] = []
+        added = set()
+        for rule, origin in rules:
+            if not is_unit(rule):
+                if not rule in added:
+                    optimized_rules.append((rule, origin))
+                    added.add(rule)
+                continue
+
+            # Non-unit rules reached by the chains from the unit rule (a non-terminal already in the chain ends it)
+            pending = [(rule.rhs[0], origin, (rule.lhs, ))]
+            while pending:
+                symbol, chain, path = pending.pop()
+                if symbol in path:
+                    continue
+                for other, other_origin in lhs_rules[symbol]:
+                    new_rule = ProductionRule(rule.lhs, other.rhs)
+                    if not is_unit(other) and not new_rule in added:
+                        optimized_rules.append((new_rule, chain + other_origin))
+                        added.add(new_rule)
+                pending.extend((other.rhs[0], chain + other_origin, path + (symbol, )) for other, other_origin in reversed(lhs_rules[symbol]) if is_unit(other))
+
+        # Non-terminals no longer reached from the start symbol (used only through the replaced unit rules)
+        reached = {aug_start_symbol}
+        pending = [aug_start_symbol]
+        optimized_lhs_rules = defaultdict(list)
+        for rule, _ in optimized_rules:
+            optimized_lhs_rules[rule.lhs].append(rule)
+        while pending:
+            for rule in optimized_lhs_rules[pending.pop()]:
+                for symbol in rule.rhs:
+                    if symbol.is_non_terminal() and not symbol in reached:
+                        reached.add(symbol)
+                        pending.append(symbol)
+        rules = [(rule, origin) for rule, origin in optimized_rules if rule.lhs in reached]
+
+        return [rule for rule, _ in rules], [origin for _, origin in rules]
 
     def _parse_rule_side(hs: str, marker: str, string_sep: str) -> Tuple[Tuple[str, bool]]:
         # Compile pattern to find substrings with marker
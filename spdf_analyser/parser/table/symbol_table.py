@@ -0,0 +1,37 @@
+from ... import *
+
+from ..classes.symbol import NonTerminal, Symbol, Terminal
+
+from .table import Table
+
+
+class SymbolTable(Table[Tuple[bool, str], Symbol]):
+    # Registry of the symbols of a grammar (each symbol is created once and gets a small integer id)
+    @property
+    def symbols(self) -> Tuple[Symbol]:
+        return tuple(self._table.values())
+
+    def build(self, symbols: Iterable[Symbol]) -> None:
+        self.from_keys()
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def intern(self, symbol: Symbol) -> Symbol:
+        # Registered symbol with the same kind and value (the given symbol is registered if there is none)
+        key = (symbol.is_terminal(), symbol.value)
+        if not key in self._table:
+            symbol.id = len(self._table)
+            self._table[key] = symbol
+        return self._table[key]
+
+    def terminal(self, value: str, escape_value: bool = False) -> Terminal:
+        key = (True, value)
+        if not key in self._table:
+            self._table[key] = Terminal(value, escape_value, len(self._table))
+        return self._table[key]
+
+    def nonterminal(self, value: str) -> NonTerminal:
+        key = (False, value)
+        if not key in self._table:
+            self._table[key] = NonTerminal(value, len(self._table))
+        return self._table[key]
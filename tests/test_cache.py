@@ -0,0 +1,76 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import SPDF_GRAMMAR, SPDF_GRAMMAR_MODES_CONFLICTS
+from spdf_analyser.parser.cache import DEFAULT_CACHE_MAGIC, DEFAULT_CACHE_SUFFIX, TableCache
+from spdf_analyser.parser.parser import LR1Parser
+from spdf_analyser.parser.table.automaton_table import PARSER_MODE
+
+
+def cached_parser(cache: TableCache, grammar: Iterable[Tuple[str, str]] = SPDF_GRAMMAR, mode: PARSER_MODE = PARSER_MODE.LR1) -> LR1Parser:
+    return LR1Parser(grammar, mode=mode, cache=cache, expected_conflicts=SPDF_GRAMMAR_MODES_CONFLICTS[mode.name])
+
+
+def cache_files(cache: TableCache) -> List[Path]:
+    return sorted(cache.directory.glob(f"*{DEFAULT_CACHE_SUFFIX}"))
+
+
+def test_cache_hit(tmp_path: Path) -> None:
+    # The tables stored by the first parser are loaded by the next one (with the same tables)
+    built = cached_parser(TableCache(tmp_path))
+    cache = TableCache(tmp_path)
+    loaded = cached_parser(cache)
+    assert cache.statistics == {"hits": 1, "misses": 0, "invalids": 0}
+    assert dict(loaded.action_table) == dict(built.action_table)
+    assert len(cache_files(cache)) == 1
+
+
+@pytest.mark.parametrize("grammar, mode", [
+    (SPDF_GRAMMAR[:-1] + ((SPDF_GRAMMAR[-1][0], SPDF_GRAMMAR[-1][1] + " COMMENT"), ), PARSER_MODE.LR1), # Changed rule
+    (SPDF_GRAMMAR, PARSER_MODE.LALR1), # Changed construction mode
+])
+@pytest.mark.filterwarnings("ignore") # The changed rule can change the amount of conflicts
+def test_cache_miss_on_changed_grammar(tmp_path: Path, grammar: Iterable[Tuple[str, str]], mode: PARSER_MODE) -> None:
+    cached_parser(TableCache(tmp_path))
+    cache = TableCache(tmp_path)
+    cached_parser(cache, grammar, mode)
+    assert cache.statistics == {"hits": 0, "misses": 1, "invalids": 0}
+    assert len(cache_files(cache)) == 2
+
+
+def test_cache_rejects_another_grammar_file(tmp_path: Path) -> None:
+    # A file stored for another grammar under the fingerprint of this one
+    cached_parser(TableCache(tmp_path))
+    path, = cache_files(TableCache(tmp_path))
+    lalr_cache = TableCache(tmp_path / "lalr")
+    cached_parser(lalr_cache, mode=PARSER_MODE.LALR1)
+    lalr_path, = cache_files(lalr_cache)
+    path.write_bytes(lalr_path.read_bytes())
+
+    cache = TableCache(tmp_path)
+    cached_parser(cache)
+    assert cache.statistics == {"hits": 0, "misses": 1, "invalids": 1}
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda content: content[:len(DEFAULT_CACHE_MAGIC)] + bytes([content[len(DEFAULT_CACHE_MAGIC)] + 1]) + content[len(DEFAULT_CACHE_MAGIC) + 1:], # Another version
+    lambda content: b"X" + content[1:], # Another marker
+    lambda content: content[:-1] + bytes([content[-1] ^ 0xFF]), # Changed payload
+    lambda content: content[:len(content) // 2], # Truncated
+    lambda content: b"", # Empty
+])
+def test_cache_rejects_corrupted_file(tmp_path: Path, corrupt: Callable[[bytes], bytes]) -> None:
+    # The corrupted file is rebuilt (and stored again)
+    built = cached_parser(TableCache(tmp_path))
+    path, = cache_files(TableCache(tmp_path))
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    cache = TableCache(tmp_path)
+    rebuilt = cached_parser(cache)
+    assert cache.statistics == {"hits": 0, "misses": 1, "invalids": 1}
+    assert dict(rebuilt.action_table) == dict(built.action_table)
+
+    cache = TableCache(tmp_path)
+    cached_parser(cache)
+    assert cache.statistics == {"hits": 1, "misses": 0, "invalids": 0}
@@ -0,0 +1,48 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import SPDF_GRAMMAR, SPDF_GRAMMAR_CONFLICTS, SPDF_GRAMMAR_ELIDE, SPDF_GRAMMAR_FLATTEN
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis
+from spdf_analyser.analysis.validation.syntax import _SPDF_SYNTAX_TABLES, _spdf_parser, _spdf_syntax_tables, load_syntax_tables
+from spdf_analyser.parser.generate import write_module
+
+
+EXAMPLE_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in" / "example1.spdf"
+
+
+def test_generated_module_parses_as_runtime_tables(tmp_path: Path) -> None:
+    path = tmp_path / "syntax_tables.py"
+    write_module(path, SPDF_GRAMMAR, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE, expected_conflicts=SPDF_GRAMMAR_CONFLICTS)
+    module = _spdf_syntax_tables(path)
+    assert module is not None
+    assert _spdf_syntax_tables(path) is module # Loaded once
+
+    tokens = bytes_lexicon_analysis(EXAMPLE_PATH.read_bytes())
+    assert str(module.parse_tokens(tokens)) == str(_spdf_parser().parse_tokens(tokens))
+    del _SPDF_SYNTAX_TABLES[path]
+
+
+def test_stale_generated_module_is_reported(tmp_path: Path) -> None:
+    # Generated for another grammar (warned once and ignored)
+    path = tmp_path / "syntax_tables.py"
+    write_module(path, SPDF_GRAMMAR, flatten=SPDF_GRAMMAR_FLATTEN, expected_conflicts=SPDF_GRAMMAR_CONFLICTS)
+    with pytest.warns(UserWarning, match="another grammar"):
+        assert _spdf_syntax_tables(path) is None
+    assert _spdf_syntax_tables(path) is None
+    del _SPDF_SYNTAX_TABLES[path]
+
+
+@pytest.mark.parametrize("source", [
+    "VERSION = (", # Truncated
+    "from spdf_analyser.missing import PushParser", # Invalid import
+])
+def test_invalid_generated_module_is_reported(tmp_path: Path, source: str) -> None:
+    path = tmp_path / "syntax_tables.py"
+    path.write_text(source, encoding="utf-8")
+    with pytest.warns(UserWarning, match="Ignoring the generated tables module"):
+        assert load_syntax_tables(path) is None
+
+
+def test_missing_generated_module(tmp_path: Path) -> None:
+    assert load_syntax_tables(tmp_path / "syntax_tables.py") is None
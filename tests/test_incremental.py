@@ -0,0 +1,74 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.validation.hierarchy import hierarchy_analysis
+from spdf_analyser.analysis.validation.references import references_analysis
+from spdf_analyser.analysis.validation.syntax import _full_syntax_analysis, incremental_syntax_analysis
+from spdf_analyser.analysis.validation.xref import xref_analysis
+from spdf_analyser.parser.classes.shifted_tokens import ShiftedTokens
+from spdf_analyser.parser.classes.syntax_node import SyntaxNode
+from spdf_analyser.parser.classes.token import Token
+
+
+EXAMPLE_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in" / "example1.spdf"
+
+
+def edit_lines(content: bytes, first: int, end: int, lines: List[bytes]) -> Tuple[bytes, Tuple[int, int, int]]:
+    # Content with the lines [first, end) replaced and the edit given to the incremental analysis
+    content_lines = content.split(b"\n")
+    content_lines[first:end] = lines
+    return b"\n".join(content_lines), (first, end, first + len(lines))
+
+
+def assert_same_analysis(content: bytes, tokens: Iterable[Token], syntax_tree: SyntaxNode) -> None:
+    # Same tokens (with their offsets), tree and analyses as the full analysis of the content (without falling back to it)
+    # The tree is checked before the tokens are read
+    assert isinstance(tokens, ShiftedTokens)
+    full_tokens, full_tree = _full_syntax_analysis(content)
+    assert str(syntax_tree) == str(full_tree)
+    assert xref_analysis(content, syntax_tree) == xref_analysis(content, full_tree)
+    assert references_analysis(syntax_tree) == references_analysis(full_tree)
+    assert hierarchy_analysis(syntax_tree) == hierarchy_analysis(full_tree)
+
+    tokens, full_tokens = tuple(tokens), tuple(full_tokens)
+    assert tokens == full_tokens
+    assert [token.offset for token in tokens] == [token.offset for token in full_tokens]
+
+
+@pytest.mark.parametrize("first, end, lines", [
+    (3, 4, [b"<<    /Type /Catalog"]), # Longer line
+    (3, 4, [b"<</Type /Catalog"]), # Shorter line
+    (10, 10, [b"% inserted", b"% lines"]), # More lines
+    (9, 10, []), # Less lines
+    (13, 14, [b"    /Kids [3 0 R 11 0 R]", b""]), # Longer line and more lines
+    (101, 114, [b"% replaced object", b"% with comments", b"% in more lines"]), # Object replaced
+])
+def test_incremental_analysis_matches_full_analysis(first: int, end: int, lines: List[bytes]) -> None:
+    content = EXAMPLE_PATH.read_bytes()
+    tokens, syntax_tree = _full_syntax_analysis(content)
+
+    edited_content, edit = edit_lines(content, first, end, lines)
+    tokens, syntax_tree = incremental_syntax_analysis(edited_content, tokens, syntax_tree, edit)
+    assert_same_analysis(edited_content, tokens, syntax_tree)
+
+
+def test_incremental_analysis_after_many_edits() -> None:
+    # Each edit is applied on the tokens and tree given back by the previous one
+    content = EXAMPLE_PATH.read_bytes()
+    tokens, syntax_tree = _full_syntax_analysis(content)
+    for first, end, lines in ((38, 38, [b"% first"]), (3, 4, [b"<<  /Type /Catalog"]), (101, 102, []), (9, 9, [b"", b"% last"])):
+        content, edit = edit_lines(content, first, end, lines)
+        tokens, syntax_tree = incremental_syntax_analysis(content, tokens, syntax_tree, edit)
+        assert_same_analysis(content, tokens, syntax_tree)
+
+
+def test_incremental_analysis_reports_wrong_xref() -> None:
+    # Every pointer after a longer line is wrong (as in the full analysis)
+    content = EXAMPLE_PATH.read_bytes()
+    tokens, syntax_tree = _full_syntax_analysis(content)
+    assert not xref_analysis(content, syntax_tree)
+
+    edited_content, edit = edit_lines(content, 3, 4, [b"<<    /Type /Catalog"])
+    tokens, syntax_tree = incremental_syntax_analysis(edited_content, tokens, syntax_tree, edit)
+    assert len(xref_analysis(edited_content, syntax_tree)) == len(xref_analysis(edited_content, _full_syntax_analysis(edited_content)[1])) > 1
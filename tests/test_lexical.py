@@ -0,0 +1,47 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis, bytes_lexicon_store, bytes_lexicon_stream, lexicon_analysis
+from spdf_analyser.parser.classes.token import Token
+
+
+EXAMPLES_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in"
+
+# Invalid UTF-8 in a short string, in a long string and in a stream block (and a lone undefined lexicon)
+INVALID_CONTENT = (
+    b"%SPDF-1.0\n\n1 0 obj\n<< /Title (caf\xe9) /Subject (" + b"long \xff" * 20 + b") >>\nstream\n\xc3(\xe9)\nendstream\nendobj\n\n"
+    b"2 0 obj\n<< /Type /Page \xfe >>\nendobj\n\nxref\n0 3\n0000000000 65535 f\ntrailer\n<< /Size 3 >>\nstartxref\n0\n%%EOF"
+)
+
+CONTENTS = {path.name: path.read_bytes() for path in sorted(EXAMPLES_PATH.glob("*.spdf"))} | {"invalid": INVALID_CONTENT}
+
+
+def token_values(tokens: Iterable[Token]) -> List[Tuple[Optional[str], str, int, int, Optional[int]]]:
+    return [(token.category, token.string, token.line, token.position, token.offset) for token in tokens]
+
+
+@pytest.mark.parametrize("name", CONTENTS)
+def test_bytes_lexers_agree(name: str) -> None:
+    # Same tokens (with their offsets) from the bytes lexers, decoded right away or when accessed
+    content = CONTENTS[name]
+    tokens = token_values(bytes_lexicon_analysis(content))
+    assert tokens
+    assert token_values(bytes_lexicon_analysis(content, lazy_size=0)) == tokens
+    assert token_values(bytes_lexicon_stream(content)) == tokens
+    assert token_values(bytes_lexicon_store(content)) == tokens
+
+
+@pytest.mark.parametrize("name", CONTENTS)
+def test_text_and_bytes_lexers_agree(name: str) -> None:
+    # Same categories, strings and lines from the text lexer over the decoded content (the positions are in characters there)
+    content = CONTENTS[name]
+    text_tokens = [(token.category, token.string, token.line) for token in lexicon_analysis(content.decode("utf-8", "replace"))]
+    assert [(token.category, token.string, token.line) for token in bytes_lexicon_store(content)] == text_tokens
+
+
+def test_invalid_bytes_are_replaced() -> None:
+    # A token with invalid bytes is still reported (with the replacement character)
+    strings = [token.string for token in bytes_lexicon_analysis(INVALID_CONTENT)]
+    assert "(caf�)" in strings
+    assert "�" in strings
@@ -0,0 +1,54 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import SPDF_GRAMMAR, SPDF_GRAMMAR_ELIDE, SPDF_GRAMMAR_FLATTEN, SPDF_GRAMMAR_INSERT, SPDF_GRAMMAR_MODES_CONFLICTS, SPDF_GRAMMAR_SYNC
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis
+from spdf_analyser.parser.classes.token import Token
+from spdf_analyser.parser.parser import LR1Parser
+from spdf_analyser.parser.table.automaton_table import PARSER_MODE
+
+
+EXAMPLES_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in"
+
+
+def mode_parser(mode: PARSER_MODE) -> LR1Parser:
+    # Parser of the SPDF grammar with the conflicts of the mode (any other amount raises)
+    return LR1Parser(
+        SPDF_GRAMMAR, mode=mode, expected_conflicts=SPDF_GRAMMAR_MODES_CONFLICTS[mode.name], strict=True,
+        flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE
+    )
+
+
+def recovered_parse(parser: LR1Parser, tokens: Tuple[Token]) -> Tuple[str, List[Tuple[int, str]]]:
+    push_parser = parser.push_parser(sync_categories=SPDF_GRAMMAR_SYNC, insert_categories=SPDF_GRAMMAR_INSERT)
+    push_parser.feed_many(tokens)
+    syntax_tree = push_parser.finish()
+    # The messages aren't compared (the state numbers depend on the mode)
+    return str(syntax_tree), [(token.line, token.string) for token, _ in push_parser.errors]
+
+
+@pytest.mark.parametrize("mode", PARSER_MODE)
+def test_modes_parse_valid_sample(mode: PARSER_MODE) -> None:
+    # Same tree with the tables of every mode
+    tokens = bytes_lexicon_analysis((EXAMPLES_PATH / "example1.spdf").read_bytes())
+    assert str(mode_parser(mode).parse_tokens(tokens)) == str(mode_parser(PARSER_MODE.LR1).parse_tokens(tokens))
+
+
+@pytest.mark.parametrize("mode", PARSER_MODE)
+@pytest.mark.parametrize("name", ["example2.spdf", "example3.spdf"])
+def test_modes_recover_invalid_samples(mode: PARSER_MODE, name: str) -> None:
+    # Same recovered tree and errors with the tables of every mode (the weaker modes stop at a cycle of reductions)
+    tokens = bytes_lexicon_analysis((EXAMPLES_PATH / name).read_bytes())
+    assert recovered_parse(mode_parser(mode), tokens) == recovered_parse(mode_parser(PARSER_MODE.LR1), tokens)
+
+
+@pytest.mark.parametrize("mode", PARSER_MODE)
+def test_modes_reject_misplaced_header(mode: PARSER_MODE) -> None:
+    # A second header in the body is invalid in every mode (instead of reduced forever)
+    content = (EXAMPLES_PATH / "example1.spdf").read_bytes().replace(b"\n2 0 obj", b"\n%SPDF-1.0\n2 0 obj", 1)
+    tokens = bytes_lexicon_analysis(content)
+    parser = mode_parser(mode)
+    assert not parser.parse_string(" ".join(token.category for token in tokens))
+    with pytest.raises(ValueError):
+        parser.parse_tokens(tokens)
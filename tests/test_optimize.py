@@ -0,0 +1,59 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import SPDF_GRAMMAR, SPDF_GRAMMAR_CONFLICTS, SPDF_GRAMMAR_ELIDE, SPDF_GRAMMAR_FLATTEN
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis
+from spdf_analyser.parser.classes.token import Token
+from spdf_analyser.parser.parser import LR1Parser
+from spdf_analyser.parser.table.rules_table import RulesTable
+
+
+EXAMPLE_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in" / "example1.spdf"
+
+# Chains of unit rules through non-terminals used more than once (LIST -> ITEM -> VALUE -> ATOM, ITEM and VALUE are used elsewhere)
+GRAMMAR = (
+    ("S", "LIST END"),
+    ("LIST", "LIST ITEM"),
+    ("LIST", "ITEM"),
+    ("ITEM", "VALUE"),
+    ("ITEM", "NAME EQ VALUE"),
+    ("VALUE", "ATOM"),
+    ("VALUE", "OPEN LIST CLOSE"),
+    ("ATOM", "NUMBER"),
+    ("ATOM", "STRING"),
+)
+
+CATEGORIES = "NUMBER NAME EQ OPEN STRING NUMBER CLOSE END"
+
+
+def test_unit_chains_are_eliminated() -> None:
+    # Only the augmented rule is a unit rule, each rule keeps the declared rules of its chain
+    rules_table = RulesTable()
+    rules_table.build(GRAMMAR, optimize=True)
+    units = [rule for rule in rules_table if len(rule.rhs) == 1 and rule.rhs[0].is_non_terminal()]
+    assert units == [rules_table.array[0]]
+    assert not any(rule.lhs.value == "ATOM" for rule in rules_table) # Only used through the unit rules
+    assert max(map(len, rules_table.origins)) == 4 # LIST -> ITEM -> VALUE -> ATOM -> NUMBER
+
+
+@pytest.mark.parametrize("flatten, elide", [((), ()), (("LIST", ), ("VALUE", ))])
+def test_optimized_grammar_builds_declared_trees(flatten: Tuple[str], elide: Tuple[str]) -> None:
+    tokens = [Token(category, category.lower(), 0, i, i) for i, category in enumerate(CATEGORIES.split())]
+    declared = LR1Parser(GRAMMAR, flatten=flatten, elide=elide)
+    optimized = LR1Parser(GRAMMAR, optimize=True, flatten=flatten, elide=elide)
+    assert str(optimized.parse_tokens(tokens)) == str(declared.parse_tokens(tokens))
+
+
+@pytest.mark.parametrize("start_symbol", [None, "EXPRS"])
+def test_optimized_spdf_grammar_builds_declared_trees(start_symbol: Optional[str]) -> None:
+    # Without conflicts (the declared grammar has SPDF_GRAMMAR_CONFLICTS)
+    tokens = bytes_lexicon_analysis(EXAMPLE_PATH.read_bytes())
+    declared = LR1Parser(SPDF_GRAMMAR, expected_conflicts=SPDF_GRAMMAR_CONFLICTS, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE)
+    optimized = LR1Parser(SPDF_GRAMMAR, start_symbol, optimize=True, strict=True, flatten=SPDF_GRAMMAR_FLATTEN, elide=SPDF_GRAMMAR_ELIDE)
+    if start_symbol is None:
+        assert str(optimized.parse_tokens(tokens)) == str(declared.parse_tokens(tokens))
+    else:
+        # The objects of the body
+        body = tokens[1:next(i for i, token in enumerate(tokens) if token.category == "KEYWORD__XREF")]
+        assert str(optimized.parse_tokens(body)) == str(declared.parse_tokens(tokens).children[1])
@@ -0,0 +1,34 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis, bytes_lexicon_store
+from spdf_analyser.analysis.validation.syntax import parallel_syntax_analysis, syntax_analysis
+
+
+EXAMPLE_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in" / "example1.spdf"
+
+
+def repeated_content(times: int) -> bytes:
+    # The example with its objects repeated (many chunks of objects for the workers)
+    content = EXAMPLE_PATH.read_bytes()
+    body_start, body_end = content.index(b"\n") + 1, content.index(b"xref")
+    return content[:body_start] + content[body_start:body_end] * times + content[body_end:]
+
+
+@pytest.mark.parametrize("processes", [2, 3])
+@pytest.mark.parametrize("store", [False, True])
+def test_parallel_analysis_matches_serial_analysis(processes: int, store: bool) -> None:
+    # Called directly (the syntax analysis only parses in parallel with enough CPUs)
+    content = repeated_content(20)
+    lexicon_analysis = bytes_lexicon_store if store else bytes_lexicon_analysis
+    assert str(parallel_syntax_analysis(lexicon_analysis(content), processes)) == str(syntax_analysis(lexicon_analysis(content)))
+
+
+def test_parallel_analysis_raises_invalid_chunk() -> None:
+    # As the serial parsing
+    content = repeated_content(20).replace(b"endobj", b"endobj endobj", 1)
+    with pytest.raises(ValueError):
+        syntax_analysis(bytes_lexicon_analysis(content))
+    with pytest.raises(ValueError):
+        parallel_syntax_analysis(bytes_lexicon_analysis(content), 2)
@@ -0,0 +1,36 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis
+from spdf_analyser.analysis.validation.syntax import recovering_syntax_analysis, syntax_analysis
+
+
+EXAMPLES_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in"
+
+# Every syntax error of the invalid samples (line and string of the invalid token)
+EXPECTED_ERRORS = {
+    "example2.spdf": [(0, "%PDF-1.0"), (42, "-Roman"), (101, "-Roman")],
+    "example3.spdf": [(0, "%PDF-1.0"), (70, "/ca"), (176, "-Bold"), (224, "-Bold")],
+}
+
+
+@pytest.mark.parametrize("name", EXPECTED_ERRORS)
+def test_recovery_reports_every_error(name: str) -> None:
+    tokens = bytes_lexicon_analysis((EXAMPLES_PATH / name).read_bytes())
+    syntax_tree, errors = recovering_syntax_analysis(tokens)
+    assert [(token.line, token.string) for token, _ in errors] == EXPECTED_ERRORS[name]
+    assert all(message for _, message in errors)
+    assert syntax_tree is not None
+
+    # The serial parsing stops at the first one
+    with pytest.raises(ValueError):
+        syntax_analysis(tokens)
+
+
+def test_recovery_of_valid_sample() -> None:
+    # No errors and the same tree as the serial parsing
+    tokens = bytes_lexicon_analysis((EXAMPLES_PATH / "example1.spdf").read_bytes())
+    syntax_tree, errors = recovering_syntax_analysis(tokens)
+    assert errors == ()
+    assert str(syntax_tree) == str(syntax_analysis(tokens))
@@ -0,0 +1,56 @@
+import pytest
+
+from spdf_analyser import *
+
+from spdf_analyser.analysis.language import SPDF_GRAMMAR_INDEX
+from spdf_analyser.analysis.validation.lexical import bytes_lexicon_analysis
+from spdf_analyser.analysis.validation.syntax import recovering_syntax_analysis, syntax_analysis
+from spdf_analyser.parser.classes.syntax_node import SyntaxNode
+
+
+EXAMPLE_PATH = Path(__file__).parent.parent / "spdf_analyser" / "in" / "example1.spdf"
+
+#   A
+#   |-- B
+#   |   |-- X (1)
+#   |   `-- X (2)
+#   `-- X (3)
+#       `-- X (4)
+TREE = SyntaxNode("A", [
+    SyntaxNode("B", [SyntaxNode("X", [SyntaxNode("1")]), SyntaxNode("X", [SyntaxNode("2")])]),
+    SyntaxNode("X", [SyntaxNode("3"), SyntaxNode("X", [SyntaxNode("4")])]),
+])
+
+
+def labels(nodes: Iterable[SyntaxNode]) -> List[str]:
+    return [node.children[0].value for node in nodes]
+
+
+def test_find_nodes_order() -> None:
+    # Reverse order of a breadth-first search (as it always was)
+    found, = TREE.find_nodes(lambda node: node.value == "X")
+    assert labels(found) == ["4", "2", "1", "3"]
+
+
+@pytest.mark.parametrize("index_values", [None, ("X", )])
+def test_find_order(index_values: Optional[Tuple[str]]) -> None:
+    # Order of the document (searched or from the index)
+    tree = SyntaxNode(TREE.value, TREE.children)
+    tree.index_values = index_values
+    assert labels(tree.find("X")) == ["1", "2", "3", "4"]
+    assert labels(tree.find("X", tree.children[1])) == ["4"]
+    assert labels(tree.find("X", tree.children[0])) == ["1", "2"]
+    assert (tree.index is not None) == (index_values is not None)
+
+
+@pytest.mark.parametrize("value", SPDF_GRAMMAR_INDEX)
+def test_index_matches_tree_search(value: str) -> None:
+    # The index of a recovered tree (built on its first query) gives the nodes of a search of the same tree (under the root and under each object)
+    tokens = bytes_lexicon_analysis(EXAMPLE_PATH.read_bytes())
+    syntax_tree, _ = recovering_syntax_analysis(tokens)
+    assert syntax_tree.index is None
+    searched_tree = syntax_analysis(tokens)
+    assert [str(node) for node in syntax_tree.find(value)] == [str(node) for node in searched_tree.find(value)]
+    assert syntax_tree.index is not None and searched_tree.index is None
+    for node, searched_node in zip(syntax_tree.find("EXPR__OBJ"), searched_tree.find("EXPR__OBJ")):
+        assert [str(found) for found in syntax_tree.find(value, node)] == [str(found) for found in searched_tree.find(value, searched_node)]